@@ -0,0 +1,255 @@
+"""에스테리아 아이템 생성기 성능 측정 스크립트
+
+config.json을 따르는 가상 아이템 목록(1천/1만/10만/100만 개)을 만들고, 화면 없이(Qt offscreen 플랫폼)
+ItemEditor의 주요 동작 시간을 측정합니다. 크기마다 별도 프로세스에서 실행하므로 최대 메모리도 크기별로 잽니다.
+
+    python benchmark.py                              # 전체 측정 후 benchmark_baseline.json과 비교
+    python benchmark.py --sizes 1000,10000 --output result.json
+    python benchmark.py --save-baseline              # 현재 결과를 새 기준으로 저장
+
+기준보다 --tolerance 비율 이상 느려지거나 메모리를 더 쓰면 회귀로 보고 종료 코드 1을 반환합니다.
+측정값은 컴퓨터마다 다르므로 기준 파일은 비교할 컴퓨터에서 --save-baseline으로 만들어 두세요.
+"""
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+try:
+    import resource # 윈도우에는 없음
+except ImportError:
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmark_baseline.json")
+# 이보다 작은 차이(초)는 측정 오차로 보고 회귀로 판단하지 않음
+MIN_REGRESSION_SECONDS = 0.002
+# 이 개수 이상의 목록에서는 오래 걸리는 동작(불러오기, 저장 등)을 한 번만 측정
+LARGE_CATALOG = 500000
+
+def generate_items(schema, count, seed=0):
+    """스키마의 필드와 선택지를 따르는 가상 아이템 목록을 만듭니다."""
+    rng = random.Random(seed)
+    words = ["불꽃", "얼음", "바람", "대지", "빛", "어둠", "강철", "마력", "고대", "용사", "수호", "심연"]
+    items = []
+    for i in range(count):
+        item_type = schema.types[i % len(schema.types)]
+        item = {}
+        for key in schema.field_order(item_type):
+            spec = schema.form_field(item_type, key)
+            if key == "이름":
+                item[key] = f"{rng.choice(words)}의 {rng.choice(words)} {i}"
+            elif spec.options:
+                item[key] = rng.choice(spec.options)
+            elif key == "설명":
+                item[key] = " ".join(rng.choice(words) for _ in range(12))
+            else:
+                item[key] = f"{rng.choice(words)} {rng.randint(1, 100)}"
+        item["타입"] = item_type
+        items.append(item)
+    return items
+
+def peak_rss_mb():
+    """이 프로세스의 최대 메모리 사용량(MB). 측정할 수 없는 환경이면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def measure(fn, repeat, setup=None):
+    """fn을 repeat번 실행한 시간(초)의 중앙값과 최솟값을 반환합니다. setup은 측정에서 제외됩니다."""
+    times = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return {"median": round(statistics.median(times), 6), "min": round(min(times), 6), "repeat": repeat}
+
+def run_size(size, repeat, storage_mode, config_path):
+    """아이템 size개로 ItemEditor를 띄워 각 동작의 시간을 측정한 결과 dict를 반환합니다. (하위 프로세스에서 실행)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["ESTERIA_STORAGE"] = storage_mode
+    sys.path.insert(0, BASE_DIR)
+    import main
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    # 모달 대화상자가 뜨면 offscreen에서는 끝나지 않으므로 확인은 항상 '예'로, 경고는 오류로 처리
+    def fail(parent, title, text, *args, **kwargs):
+        raise RuntimeError(f"{title}: {text}")
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    QMessageBox.warning = QMessageBox.critical = QMessageBox.information = staticmethod(fail)
+
+    work_dir = tempfile.mkdtemp(prefix="esteria-bench-")
+    try:
+        shutil.copy(config_path, os.path.join(work_dir, main.CONFIG_FILE))
+        os.chdir(work_dir)
+        with open(main.CONFIG_FILE, encoding="utf-8") as f:
+            schema = main.ConfigSchema(json.load(f))
+        started = time.perf_counter()
+        items = generate_items(schema, size)
+        main.create_storage(storage_mode).replace_all(items)
+        generate_seconds = time.perf_counter() - started
+        del items
+
+        heavy_repeat = 1 if size >= LARGE_CATALOG else repeat
+        ops = {}
+        app = QApplication(sys.argv)
+
+        # 창 생성부터 백그라운드 로딩이 끝나 리스트가 채워질 때까지
+        started = time.perf_counter()
+        editor = main.ItemEditor()
+        editor.loader.wait()
+        app.processEvents()
+        ops["startup"] = {"median": round(time.perf_counter() - started, 6), "min": None, "repeat": 1}
+        started = time.perf_counter()
+        while editor.search_index is None or not editor.search_index.ready:
+            app.processEvents()
+            time.sleep(0.005)
+        ops["search_index"] = {"median": round(time.perf_counter() - started, 6), "min": None, "repeat": 1}
+
+        ops["load_items"] = measure(editor.load_items, heavy_repeat)
+
+        # 매번 아이템 하나를 바꾼 뒤 저장 (변경분만 쓰는 저장 방식도 실제로 기록하도록)
+        def touch(i):
+            item = dict(editor.store[i], 설명=f"수정 {i}")
+            editor.store.replace(i, item)
+        ops["save_items"] = measure(editor.save_items, heavy_repeat, setup=touch)
+        ops["refresh_item_list"] = measure(editor.refresh_item_list, repeat)
+
+        types = list(schema.types)
+        pages = []
+        def build_page(i):
+            pages.append(editor.build_form_page(types[i % len(types)]))
+        ops["build_form"] = measure(lambda: build_page(len(pages)), repeat * len(types))
+        for page_widget, _ in pages:
+            page_widget.deleteLater()
+
+        row = [0]
+        tab_index = [0]
+        def next_tab(i):
+            tab_index[0] = (editor.tabs.currentIndex() + 1) % editor.tabs.count()
+        ops["on_tab_changed"] = measure(lambda: editor.tabs.setCurrentIndex(tab_index[0]), repeat * len(types),
+                                        setup=next_tab)
+
+        # 새 아이템 추가, 그리고 같은 이름을 다시 입력해 확인 후 기존 아이템을 수정하는 업서트 경로
+        def fill_name(i):
+            editor.clear_form_fields()
+            editor.widgets["이름"]["input"].setText(f"벤치마크 아이템 {i}")
+        ops["add_item"] = measure(editor.add_item, repeat, setup=fill_name)
+        ops["add_item_upsert"] = measure(editor.add_item, repeat, setup=fill_name)
+
+        # 여러 타입의 아이템을 고르므로 탭 전환과 폼 채우기가 함께 측정됨
+        rng = random.Random(1)
+        rows = [rng.randrange(len(editor.store)) for _ in range(repeat * 4)]
+        ops["on_item_selected"] = measure(lambda: editor.on_item_selected(editor.item_model.index(rows[row[0]])),
+                                          len(rows), setup=lambda i: row.__setitem__(0, i))
+
+        editor.save_scheduler.flush()
+        return {"size": size, "storage": storage_mode, "generate_seconds": round(generate_seconds, 3),
+                "ops": ops, "peak_rss_mb": peak_rss_mb()}
+    finally:
+        os.chdir(BASE_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def compare(results, baseline, tolerance):
+    """기준 결과와 같은 크기, 같은 항목끼리 비교하여 (전체 비교 목록, 회귀 목록)을 반환합니다."""
+    base_by_size = {(r["size"], r["storage"]): r for r in baseline.get("results", [])}
+    rows, regressions = [], []
+    for result in results:
+        base = base_by_size.get((result["size"], result["storage"]))
+        if base is None:
+            continue
+        pairs = [(name, base["ops"][name]["median"], op["median"]) for name, op in result["ops"].items()
+                 if name in base["ops"]]
+        if result["peak_rss_mb"] is not None and base.get("peak_rss_mb"):
+            pairs.append(("peak_rss_mb", base["peak_rss_mb"], result["peak_rss_mb"]))
+        for name, old, new in pairs:
+            ratio = new / old if old else None
+            row = {"size": result["size"], "name": name, "baseline": old, "current": new,
+                   "ratio": round(ratio, 3) if ratio is not None else None}
+            rows.append(row)
+            slack = 0 if name == "peak_rss_mb" else MIN_REGRESSION_SECONDS
+            if old and new > old * (1 + tolerance) and new - old > slack:
+                regressions.append(row)
+    return rows, regressions
+
+def environment():
+    from PyQt5.QtCore import QT_VERSION_STR
+    return {"python": platform.python_version(), "platform": platform.platform(), "qt": QT_VERSION_STR,
+            "cpu_count": os.cpu_count()}
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="ItemEditor 주요 동작의 성능을 측정합니다.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="쉼표로 구분한 아이템 개수 목록")
+    parser.add_argument("--repeat", type=int, default=5, help="동작마다 반복 측정할 횟수")
+    parser.add_argument("--storage", choices=["json", "journal", "sqlite", "sharded"], default="json", help="측정할 저장 방식")
+    parser.add_argument("--config", default=os.path.join(BASE_DIR, "config.json"), help="가상 아이템을 만들 설정 파일")
+    parser.add_argument("--output", help="결과 JSON을 저장할 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준 결과 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준 파일로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 느려진 비율 (0.2 = 20%%)")
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS) # 하위 프로세스용
+    return parser
+
+def main():
+    args = build_arg_parser().parse_args()
+    if args.run_size is not None:
+        print(json.dumps(run_size(args.run_size, args.repeat, args.storage, os.path.abspath(args.config))))
+        return 0
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"아이템 {size}개 측정 중...", file=sys.stderr)
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-size", str(size),
+                               "--repeat", str(args.repeat), "--storage", args.storage, "--config", args.config],
+                              capture_output=True, text=True, encoding="utf-8")
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            print(f"아이템 {size}개 측정에 실패했습니다.", file=sys.stderr)
+            return 2
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        for name, op in result["ops"].items():
+            print(f"  {name:<18} {op['median'] * 1000:10.2f} ms", file=sys.stderr)
+        print(f"  {'peak_rss_mb':<18} {result['peak_rss_mb']}", file=sys.stderr)
+
+    report = {"environment": environment(), "repeat": args.repeat, "results": results}
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"], regressions = compare(results, baseline, args.tolerance)
+        report["regressions"] = regressions
+        for row in regressions:
+            print(f"회귀: 아이템 {row['size']}개 {row['name']} {row['baseline']} -> {row['current']} "
+                  f"({row['ratio']}배)", file=sys.stderr)
+        if not regressions:
+            print(f"기준 대비 회귀 없음 (허용 {args.tolerance:.0%})", file=sys.stderr)
+    elif not args.save_baseline:
+        print(f"기준 파일 '{args.baseline}'이(가) 없어 비교하지 않았습니다.", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"기준 결과를 '{args.baseline}'에 저장했습니다.", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,240 @@
+import time
+_STARTED = time.perf_counter() # 시작 시간 보고서의 기준 (다른 모듈을 불러오기 전)
 import sys
 import json
 import os
 import difflib
+import codecs
+import csv
+import io
+import gzip
+import copy
+import bisect
+import argparse
+import hashlib
+import zlib
+import functools
+import re
+import sqlite3
+import threading
+import urllib.parse
+from contextlib import closing, nullcontext
+from collections import namedtuple, deque, OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from array import array
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QLineEdit, QListWidget, QListWidgetItem,
+    QComboBox, QLineEdit, QListView,
     QTabWidget, QMessageBox, QScrollArea, QFrame, QTextEdit, QDialog,
+    QProgressBar, QStackedWidget, QShortcut, QAbstractItemView, QFileDialog, QProgressDialog,
+    QTreeWidget, QTreeWidgetItem,
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QWheelEvent
+from PyQt5.QtCore import (
+    Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal,
+    QAbstractListModel, QModelIndex, QThread, QItemSelection, QItemSelectionModel,
+    QFileSystemWatcher,
+)
+from PyQt5.QtGui import QFont, QWheelEvent, QKeySequence
 
 CONFIG_FILE = "config.json"
 ITEMS_FILE = "items.json"
+JOURNAL_FILE = "items.journal.jsonl"
+SQLITE_FILE = "items.db"
+SHARDS_DIR = "items.shards"
+# config.json 오타 분석 결과 캐시 (config 파일 내용의 해시가 같으면 다시 분석하지 않음)
+CONFIG_CHECK_CACHE = ".config_check_cache.json"
+# 저장 방식: "json" (매번 items.json 전체 저장), "journal" (변경분만 로그에 추가), "sqlite" (items.db에 행 단위로 기록)
+STORAGE_MODES = ["json", "journal", "sqlite", "sharded"]
+STORAGE_MODE = os.environ.get("ESTERIA_STORAGE", "json")
+# 저널이 이 크기를 넘으면 백그라운드에서 items.json으로 병합(압축)합니다.
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+SHARD_CHUNK_ITEMS = 5000 # 샤드 파일 하나에 넣는 평균 아이템 수 (최대 네 배)
+# 샤드 전체가 이보다 작으면 프로세스를 띄우는 비용(프로세스마다 모듈을 다시 import)이 더 크므로 현재 프로세스에서 읽음
+SHARD_PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+VALIDATE_CHUNK_ITEMS = 5000 # 전체 검증을 나누는 단위 (프로세스 풀을 쓰면 작업 하나에 보내는 아이템 수)
+# 마지막 편집 후 이 시간(ms) 동안 추가 편집이 없으면 모아서 한 번에 저장합니다.
+SAVE_DELAY_MS = 500
+# 되돌리기 기록이 차지할 수 있는 최대 크기 (MB 단위, 넘으면 오래된 기록부터 버림)
+HISTORY_MAX_BYTES = int(os.environ.get("ESTERIA_HISTORY_MB", "16")) * 1024 * 1024
+# 상세 보기 HTML과 복사용 텍스트를 최근 선택한 아이템 이 개수만큼 보관합니다.
+RENDER_CACHE_SIZE = 1000
+# 시작 시 아이템을 이 개수만큼 모아서 리스트에 추가합니다.
+LOAD_BATCH_SIZE = 2000
+
+EXPORT_PROGRESS_EVERY = 1000 # 내보내기 진행률을 알리는 아이템 간격
+
+WATCH_DELAY_MS = 300 # 외부 변경 감지 후 파일 쓰기가 끝나기를 기다리는 시간
+# 유사 아이템 판정 기준: 정규화한 이름의 difflib 유사도, 설명의 단어 2-gram 자카드 유사도
+NEAR_DUP_NAME_RATIO = 0.8
+NEAR_DUP_DESC_RATIO = 0.8
+NEAR_DUP_MIN_DESC_WORDS = 4 # 설명의 단어가 이보다 적으면 설명으로는 비교하지 않음
+# 이보다 많은 아이템이 모인 LSH 버킷은 흔한 표현으로 보고 후보를 만들지 않음 (후보 쌍이 제곱으로 늘어나는 것 방지)
+NEAR_DUP_MAX_BUCKET = 200
+SIMILAR_DELAY_MS = 200 # 이름 입력이 멈춘 뒤 유사 아이템을 찾기까지 기다리는 시간
+SIMILAR_CACHE_GRAMS = 4096 # 색인을 만든 뒤 편집용으로 보관하는 gram별 MinHash 값의 최대 개수 (넘으면 비움)
+FACET_REFRESH_MS = 100 # 아이템이 바뀐 뒤 패싯 사이드바를 다시 그리기까지 기다리는 시간 (연속 편집을 모아서 한 번에)
+MERGE_PREVIEW_ITEMS = 200 # 비교/병합 대화상자에 종류별로 보여줄 최대 아이템 수
+# 서버 모드 (main.py serve): 기본 주소, 아이템 파일 변경 확인 간격(초), 요청 없는 keep-alive 연결을 닫기까지의 시간(초)
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+SERVE_POLL_SECONDS = 1.0
+SERVE_IDLE_SECONDS = 60
+SERVE_GZIP_MIN_BYTES = 1024 # 이보다 작은 응답은 압축하지 않음
+SERVE_LIST_LIMIT = 100 # 목록 조회의 기본 개수 (최대 SERVE_LIST_MAX)
+SERVE_LIST_MAX = 1000
+SERVE_CACHE_SIZE = 512 # 스냅숏마다 보관하는 조회 응답 수
+# 성능 계측: ESTERIA_PROFILE=1(또는 trace 파일 경로)이나 --profile[=경로]로 켭니다.
+PROFILE_TRACE_FILE = "esteria_trace.json"
+# 백분위수는 구간마다 최근 이 개수의 기록으로 계산합니다.
+PROFILE_WINDOW = 500
+# trace로 내보낼 구간 기록의 최대 개수 (넘으면 오래된 것부터 버림)
+PROFILE_MAX_EVENTS = 200000
+# 저장소를 읽다가 파일이 손상되었을 때 발생하는 오류들
+STORAGE_ERRORS = (json.JSONDecodeError, sqlite3.DatabaseError)
+
+class _Span:
+    """Profiler.span()이 돌려주는 구간 측정용 컨텍스트"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class Profiler:
+    """주요 동작의 소요 시간을 구간(span)별로 기록하는 계측기
+
+    꺼져 있으면 span()이 아무 일도 하지 않는 공용 컨텍스트를 돌려주므로 평소 비용은 속성 확인 한 번뿐입니다.
+    구간마다 최근 기록으로 백분위수를 계산하고, 전체 기록은 Chrome trace 형식(chrome://tracing, Perfetto)으로 내보냅니다.
+    저장처럼 작업 스레드에서 실행되는 구간도 함께 기록됩니다.
+    """
+    def __init__(self, window=PROFILE_WINDOW, max_events=PROFILE_MAX_EVENTS):
+        self.enabled = False
+        self.trace_path = None
+        self._window = window
+        self._origin = time.perf_counter_ns()
+        self._events = deque(maxlen=max_events)
+        self._durations = {}  # 구간 이름 -> 최근 소요 시간(ns)
+        self._counts = {}
+        self._threads = {}
+
+    def enable(self, trace_path=PROFILE_TRACE_FILE):
+        self.enabled = True
+        self.trace_path = trace_path
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else nullcontext()
+
+    def timed(self, name):
+        """메서드 호출 전체를 name 구간으로 기록하는 데코레이터
+
+        시그널에 연결된 메서드에 시그널 인자가 더 넘어오면 PyQt처럼 받는 개수만큼만 넘깁니다.
+        """
+        def decorate(func):
+            nargs = func.__code__.co_argcount
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if len(args) > nargs:
+                    args = args[:nargs]
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter_ns())
+            return wrapper
+        return decorate
+
+    def record(self, name, start_ns, end_ns):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, start_ns, end_ns - start_ns, tid))
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations.setdefault(name, deque(maxlen=self._window))
+        durations.append(end_ns - start_ns)
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """구간의 최근 소요 시간 백분위수(ms)를 {백분위: 값}으로 반환합니다."""
+        durations = sorted(self._durations.get(name, ()))
+        if not durations:
+            return {}
+        return {p: durations[min(len(durations) - 1, len(durations) * p // 100)] / 1e6 for p in points}
+
+    def summary(self):
+        """구간 이름 -> {"count", "p50", "p95", "p99"} (ms)"""
+        return {name: {"count": self._counts[name], **{f"p{p}": round(v, 3) for p, v in self.percentiles(name).items()}}
+                for name in list(self._durations)}
+
+    def export_chrome_trace(self, path=None):
+        """기록된 구간을 Chrome trace-event JSON 파일로 저장하고 경로를 반환합니다."""
+        path = path or self.trace_path or PROFILE_TRACE_FILE
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in list(self._threads.items())]
+        events.extend({"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                       "ts": (start - self._origin) / 1000, "dur": dur / 1000}
+                      for name, start, dur, tid in list(self._events))
+        atomic_write_json(path, {"traceEvents": events, "displayTimeUnit": "ms",
+                                 "otherData": {"summary": self.summary()}})
+        return path
+
+PROFILER = Profiler()
+
+class StartupReport:
+    """프로그램 시작의 구간별 소요 시간을 모아 두었다가 표준 오류로 출력하는 보고서
+
+    --startup-report 인자나 ESTERIA_STARTUP_REPORT=1 환경 변수로 출력을 켭니다. 꺼져 있어도 기록은 mark() 몇 번뿐입니다.
+    """
+    def __init__(self, started):
+        self.enabled = False
+        self.reported = False
+        self.phases = []    # (구간 이름, 초)
+        self._started = self._last = started
+
+    def mark(self, name):
+        """직전 mark() 이후 걸린 시간을 name 구간으로 기록합니다. 시작이 끝난 뒤(report() 이후)에는 기록하지 않습니다."""
+        if self.reported:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        if not self.enabled or sys.stderr is None: # 콘솔 없는 실행 파일이면 stderr가 없음
+            return
+        width = max(len(name) for name, _ in self.phases)
+        print("시작 시간 보고서 (구간, 소요 ms, 누적 ms)", file=sys.stderr)
+        total = 0.0
+        for name, seconds in self.phases:
+            total += seconds
+            print(f"  {name:<{width}}  {seconds * 1000:8.1f}  {total * 1000:8.1f}", file=sys.stderr)
+
+STARTUP = StartupReport(_STARTED)
 
 class CustomScrollArea(QScrollArea):
     """자식 위젯의 휠 이벤트를 처리하기 위한 커스텀 스크롤 영역"""
     def wheelEvent(self, event: QWheelEvent):
         self.verticalScrollBar().event(event)
 
-class CustomListWidget(QListWidget):
-    """휠 이벤트를 부모 스크롤 영역으로 전달하는 리스트 위젯"""
+class CustomListView(QListView):
+    """휠 이벤트를 부모 스크롤 영역으로 전달하는 리스트 뷰"""
     def wheelEvent(self, event: QWheelEvent):
         event.ignore()
         parent_scroll_area = self.window().findChild(CustomScrollArea)
@@ -30,10 +245,3133 @@ class CustomListWidget(QListWidget):
                                      event.phase(), event.inverted(), event.source())
             QApplication.sendEvent(parent_scroll_area, new_event)
         else:
-            super().wheelEvent(event)
+            super().wheelEvent(event)
+
+def item_key(item):
+    """아이템을 구분하는 고유 키 (이름, 타입)을 반환합니다."""
+    return (item.get("이름"), item.get("타입"))
+
+class ItemLayout:
+    """키 순서가 같은 아이템들이 함께 쓰는 필드 배치 (키 목록, 키 -> 위치, 값을 공유할 위치)"""
+    __slots__ = ("keys", "index", "shared_positions")
+
+    def __init__(self, keys, shared_fields=frozenset()):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.shared_positions = tuple(i for i, key in enumerate(keys) if key in shared_fields)
+
+class CompactItem(Mapping):
+    """dict 대신 메모리에 보관하는 읽기 전용 아이템
+
+    키 목록은 같은 배치의 아이템끼리 공유하고 값만 튜플로 가지므로, 아이템마다 해시 테이블을 두는 dict보다 훨씬 작습니다.
+    dict처럼 읽을 수 있고 키 순서도 그대로 유지되어, to_dict()나 json_default로 원래 JSON과 똑같이 저장됩니다.
+    아이템은 수정할 때 항상 새 dict로 교체하므로 (ItemStore.replace) 제자리 수정은 지원하지 않습니다.
+    """
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout, values):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._layout.index[key]]
+
+    def get(self, key, default=None):
+        i = self._layout.index.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key):
+        return key in self._layout.index
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self):
+        return self._layout.index.keys()
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return list(zip(self._layout.keys, self._values))
+
+    def to_dict(self):
+        return dict(zip(self._layout.keys, self._values))
+
+    def __eq__(self, other):
+        if isinstance(other, CompactItem) and other._layout is self._layout:
+            return other._values == self._values
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        # 다른 프로세스로 보낼 때는 배치 객체를 아이템마다 복사하지 않도록 일반 dict로 보냄
+        return dict, (self.to_dict(),)
+
+def json_default(obj):
+    """json.dump(s)의 default 인자: CompactItem을 원래 dict로 저장합니다."""
+    if isinstance(obj, CompactItem):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ItemCodec:
+    """아이템 dict를 CompactItem으로 바꾸는 변환기
+
+    키 순서가 같은 아이템은 (실제로는 타입마다) 하나의 ItemLayout을 공유하고, 키 문자열은 sys.intern으로 하나만 둡니다.
+    등급(COMMON), 위치(메인)처럼 config에 옵션 목록이 있는 필드와 타입은, 값이 옵션(타입 이름)과 같으면 config의
+    문자열 객체 하나를 공유합니다. 공유할 값은 config로 정해져 편집이 이어져도 늘어나지 않고, 변환 중에는 읽기만 하므로
+    로더 스레드와 UI 스레드에서 함께 써도 됩니다. (새 배치를 등록할 때만 잠금)
+    config에 없는 필드가 섞인 아이템도 그 키 순서대로 배치를 하나 더 만들 뿐이라 원래 JSON 그대로 보존됩니다.
+    """
+    def __init__(self, schema=None):
+        self._lock = threading.Lock()
+        self.set_schema(schema)
+
+    def set_schema(self, schema):
+        """값을 공유할 필드와 값을 schema로 다시 정합니다. 이미 변환된 아이템은 그대로 둡니다."""
+        fields, values = frozenset(), ()
+        if schema is not None:
+            fields = schema.exact_fields() | {"타입"}
+            values = schema.option_values() | set(schema.types)
+        with self._lock:
+            self._shared_fields = fields
+            self._pool = {value: value for value in values} # 옵션 값 -> 공유할 문자열 (만든 뒤에는 읽기만 함)
+            self._layouts = {} # 키 튜플 -> ItemLayout
+
+    def layout(self, keys):
+        layout = self._layouts.get(keys)
+        if layout is None:
+            with self._lock:
+                layout = self._layouts.get(keys)
+                if layout is None:
+                    interned = tuple(sys.intern(key) if isinstance(key, str) else key for key in keys)
+                    layout = self._layouts[keys] = ItemLayout(interned, self._shared_fields)
+        return layout
+
+    def pack(self, item):
+        if type(item) is not dict:
+            return item # 이미 변환되었거나 dict가 아닌 손상된 항목은 그대로 둠
+        layout = self.layout(tuple(item))
+        values = tuple(item.values())
+        if layout.shared_positions:
+            values = list(values)
+            pool = self._pool
+            for i in layout.shared_positions:
+                value = values[i]
+                if type(value) is str:
+                    values[i] = pool.get(value, value)
+            values = tuple(values)
+        return CompactItem(layout, values)
+
+class ItemStore:
+    """아이템 목록을 소유하고 (이름, 타입) 키 및 보조 필드 인덱스를 관리하는 저장소
+
+    각 아이템에는 변하지 않는 내부 id가 부여되며, 인덱스는 행 번호 대신 id를 가리킵니다.
+    덕분에 삭제가 일어나도 인덱스를 다시 만들 필요가 없고, 행 번호는 필요할 때만 갱신합니다.
+    """
+    INDEXED_FIELDS = ("등급", "위치")
+
+    def __init__(self, items=(), codec=None):
+        self._pack = codec.pack if codec is not None else (lambda item: item)
+        self._items = {}            # id -> 아이템 (codec이 있으면 CompactItem)
+        self._order = []            # 리스트 순서대로 나열된 id
+        self._rows = {}             # id -> 행 번호 (지연 갱신)
+        self._rows_dirty_from = None  # 이 행 이후의 _rows 값은 다시 계산해야 함
+        self._key_index = {}        # (이름, 타입) -> [id, ...] (중복 키는 먼저 추가된 순서)
+        self._field_index = {field: {} for field in self.INDEXED_FIELDS}  # 필드 -> 값 -> {id}
+        self._revisions = {}        # id -> 교체된 횟수 (한 번도 교체되지 않았으면 없음)
+        self._next_id = 0
+        self._changes = []          # 아직 저장소에 기록되지 않은 변경 내역 (저널 레코드)
+        self._listeners = []
+        for item in items:
+            self._append(self._pack(item))
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return (self._items[item_id] for item_id in self._order)
+
+    def __getitem__(self, row):
+        return self._items[self._order[row]]
+
+    # --- 변경 알림 ---
+    def add_listener(self, listener):
+        """변경 알림을 받을 객체를 등록합니다.
+
+        리스너는 필요한 메서드만 구현하면 됩니다:
+        about_to_insert(row), inserted(row, item_id, item), replaced(row, item_id, old, new),
+        about_to_remove(row), removed(row, item_id, item),
+        about_to_extend(first, last), extended(first, last), about_to_clear(), cleared(),
+        about_to_bulk_update(), bulk_updated(replaced, removed, inserted)
+        (bulk_updated의 각 목록 원소는 (행, id, 이전 아이템, 새 아이템), (행, id, 아이템), (행, id, 아이템))
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        for listener in self._listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(*args)
+
+    # --- 인덱스 관리 ---
+    def _index(self, item_id, item):
+        self._key_index.setdefault(item_key(item), []).append(item_id)
+        for field, index in self._field_index.items():
+            if field in item:
+                index.setdefault(item[field], set()).add(item_id)
+
+    def _unindex(self, item_id, item):
+        key = item_key(item)
+        ids = self._key_index.get(key)
+        if ids:
+            ids.remove(item_id)
+            if not ids:
+                del self._key_index[key]
+        for field, index in self._field_index.items():
+            if field in item:
+                ids = index.get(item[field])
+                if ids:
+                    ids.discard(item_id)
+                    if not ids:
+                        del index[item[field]]
+
+    # --- 조회 ---
+    def id_at(self, row):
+        return self._order[row]
+
+    def item(self, item_id):
+        return self._items[item_id]
+
+    def revision(self, item_id):
+        """아이템이 교체될 때마다 1씩 늘어나는 수정 번호"""
+        return self._revisions.get(item_id, 0)
+
+    def row_of(self, item_id):
+        """아이템 id의 현재 행 번호를 반환합니다. 삭제로 밀린 행 번호는 이때 한 번에 갱신합니다."""
+        row = self._rows.get(item_id)
+        if self._rows_dirty_from is None or (row is not None and row < self._rows_dirty_from):
+            return row
+        for i in range(self._rows_dirty_from, len(self._order)):
+            self._rows[self._order[i]] = i
+        self._rows_dirty_from = None
+        return self._rows.get(item_id)
+
+    def find(self, name, item_type):
+        """(이름, 타입)이 일치하는 첫 번째 아이템의 행 번호를 반환합니다. 없으면 None."""
+        ids = self._key_index.get((name, item_type))
+        return self.row_of(ids[0]) if ids else None
+
+    def lookup(self, name, item_type):
+        ids = self._key_index.get((name, item_type))
+        return self._items[ids[0]] if ids else None
+
+    def rows_by(self, field, value):
+        """보조 인덱스(등급, 위치)에서 값이 일치하는 아이템들의 행 번호를 순서대로 반환합니다."""
+        ids = self._field_index[field].get(value, ())
+        return sorted(self.row_of(item_id) for item_id in ids)
+
+    def values_of(self, field):
+        """보조 인덱스에 등록된 필드 값 목록을 반환합니다."""
+        return list(self._field_index[field].keys())
+
+    def last(self):
+        return self._items[self._order[-1]] if self._order else None
+
+    def to_list(self):
+        return [self._items[item_id] for item_id in self._order]
+
+    def drain_changes(self):
+        """기록되지 않은 변경 내역을 꺼내고 비웁니다."""
+        changes, self._changes = self._changes, []
+        return changes
+
+    def requeue_changes(self, changes):
+        """drain_changes()로 꺼낸 변경 내역을 아직 기록되지 않은 내역의 앞에 되돌려 놓습니다."""
+        self._changes[:0] = changes
+
+    # --- 변경 ---
+    def append(self, item):
+        """아이템을 맨 뒤에 추가하고 행 번호를 반환합니다."""
+        item = self._pack(item)
+        self._changes.append({"op": "put", "key": None, "item": item})
+        row = len(self._order)
+        self._notify("about_to_insert", row)
+        item_id = self._append(item)
+        self._notify("inserted", row, item_id, item)
+        return row
+
+    def extend(self, items, record=True):
+        """여러 아이템을 한 번에 뒤에 추가합니다. 리스너에는 범위 단위로 한 번만 알립니다.
+
+        record=False이면 변경 내역을 남기지 않습니다. (파일에서 불러오는 경우처럼 이미 저장된 아이템)
+        """
+        if not items:
+            return
+        items = [self._pack(item) for item in items]
+        first = len(self._order)
+        self._notify("about_to_extend", first, first + len(items) - 1)
+        for item in items:
+            if record:
+                self._changes.append({"op": "put", "key": None, "item": item})
+            self._append(item)
+        self._notify("extended", first, first + len(items) - 1)
+
+    def clear(self):
+        """모든 아이템과 인덱스를 비웁니다. 변경 내역은 남기지 않습니다."""
+        self._notify("about_to_clear")
+        self._items.clear()
+        self._order.clear()
+        self._rows.clear()
+        self._rows_dirty_from = None
+        self._revisions.clear()
+        self._key_index.clear()
+        for index in self._field_index.values():
+            index.clear()
+        self._changes.clear()
+        self._notify("cleared")
+
+    def _append(self, item):
+        item_id = self._register(item)
+        self._order.append(item_id)
+        if self._rows_dirty_from is None:
+            self._rows[item_id] = len(self._order) - 1
+        return item_id
+
+    def _register(self, item):
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = item
+        self._index(item_id, item)
+        return item_id
+
+    def _mark_rows_dirty(self, row):
+        if self._rows_dirty_from is None or row < self._rows_dirty_from:
+            self._rows_dirty_from = row
+
+    def insert(self, row, item):
+        """아이템을 row 위치에 끼워 넣습니다. (되돌리기로 삭제를 취소할 때 원래 자리로 복원)"""
+        if row >= len(self._order):
+            return self.append(item)
+        item = self._pack(item)
+        self._changes.append({"op": "put", "key": None, "item": item})
+        self._notify("about_to_insert", row)
+        item_id = self._register(item)
+        self._order.insert(row, item_id)
+        self._mark_rows_dirty(row)
+        self._notify("inserted", row, item_id, item)
+        return row
+
+    def insert_rows(self, entries):
+        """[(행, 아이템), ...]을 한 번에 끼워 넣습니다. 행 번호는 모두 끼워 넣은 뒤의 위치입니다."""
+        entries = sorted(entries, key=lambda entry: entry[0])
+        if not entries:
+            return
+        self._notify("about_to_bulk_update")
+        inserted, order, start = [], [], 0
+        for row, item in entries:
+            item = self._pack(item)
+            self._changes.append({"op": "put", "key": None, "item": item})
+            item_id = self._register(item)
+            take = row - len(order)
+            order.extend(self._order[start:start + take])
+            start += take
+            order.append(item_id)
+            inserted.append((len(order) - 1, item_id, item))
+        order.extend(self._order[start:])
+        self._order[:] = order
+        self._mark_rows_dirty(inserted[0][0])
+        self._notify("bulk_updated", [], [], inserted)
+
+    def replace(self, row, item):
+        """행의 아이템을 교체하고 이전 아이템을 반환합니다."""
+        item = self._pack(item)
+        item_id, old = self._replace(row, item)
+        self._notify("replaced", row, item_id, old, item)
+        return old
+
+    def _replace(self, row, item):
+        item_id = self._order[row]
+        old = self._items[item_id]
+        self._changes.append({"op": "put", "key": list(item_key(old)), "item": item})
+        self._unindex(item_id, old)
+        self._items[item_id] = item
+        self._revisions[item_id] = self._revisions.get(item_id, 0) + 1
+        self._index(item_id, item)
+        return item_id, old
+
+    def replace_rows(self, updates):
+        """[(행, 새 아이템), ...]을 한 번에 교체합니다. 리스너에는 bulk_updated로 한 번만 알립니다."""
+        updates = list(updates)
+        if not updates:
+            return
+        self._notify("about_to_bulk_update")
+        replaced = []
+        for row, item in updates:
+            item = self._pack(item)
+            item_id, old = self._replace(row, item)
+            replaced.append((row, item_id, old, item))
+        self._notify("bulk_updated", replaced, [], [])
+
+    def remove_rows(self, rows):
+        """여러 행을 한 번에 삭제하고 삭제된 아이템 목록을 반환합니다. 리스너에는 bulk_updated로 한 번만 알립니다.
+
+        행마다 list.pop을 하면 삭제할 때마다 뒤쪽 행이 당겨지므로, 남길 id만 골라 순서 목록을 한 번에 다시 만듭니다.
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return []
+        self._notify("about_to_bulk_update")
+        removed = []
+        for row in rows:
+            item_id = self._order[row]
+            item = self._items.pop(item_id)
+            self._rows.pop(item_id, None)
+            self._revisions.pop(item_id, None)
+            self._unindex(item_id, item)
+            self._changes.append({"op": "del", "key": list(item_key(item))})
+            removed.append((row, item_id, item))
+        self._order[:] = [item_id for item_id in self._order if item_id in self._items]
+        self._mark_rows_dirty(rows[0])
+        self._notify("bulk_updated", [], removed, [])
+        return [item for _, _, item in removed]
+
+    def apply_diff(self, added, removed, changed):
+        """keyed_diff(self, 새 목록)의 결과를 적용해 새 목록과 같게 만듭니다. (삭제, 수정, 추가를 각각 한 번에 알림)"""
+        self.remove_rows([self.find(*key) for key in removed])
+        self.replace_rows([(self.find(*key), item) for key, _, item in changed])
+        self.insert_rows(added)
+
+    def upsert(self, item):
+        """(이름, 타입)이 같은 아이템이 있으면 교체하고, 없으면 추가합니다. (행 번호, 추가 여부)를 반환합니다."""
+        row = self.find(*item_key(item))
+        if row is None:
+            return self.append(item), True
+        self.replace(row, item)
+        return row, False
+
+    def remove(self, row):
+        """행의 아이템을 삭제하고 반환합니다."""
+        self._notify("about_to_remove", row)
+        item_id = self._order.pop(row)
+        item = self._items.pop(item_id)
+        self._rows.pop(item_id, None)
+        self._revisions.pop(item_id, None)
+        self._unindex(item_id, item)
+        self._mark_rows_dirty(row)
+        self._changes.append({"op": "del", "key": list(item_key(item))})
+        self._notify("removed", row, item_id, item)
+        return item
+
+    def apply_change(self, change):
+        """저널 레코드 하나를 적용합니다. 같은 레코드를 다시 적용해도 결과가 같도록 키 기준으로 동작합니다."""
+        if change["op"] == "put":
+            item = change["item"]
+            row = self.find(*change["key"]) if change.get("key") else None
+            if row is None:
+                row = self.find(*item_key(item))
+            if row is None:
+                self.append(item)
+            else:
+                self.replace(row, item)
+        elif change["op"] == "del":
+            row = self.find(*change["key"])
+            if row is not None:
+                self.remove(row)
+
+class ItemListModel(QAbstractListModel):
+    """ItemStore를 리스트 뷰에 보여주는 모델
+
+    store의 변경 알림을 받아 바뀐 행에 대해서만 rowsInserted/rowsRemoved/dataChanged 신호를 보냅니다.
+    set_view()로 보여줄 아이템 id 목록을 지정하면 (검색 결과 등) 그 아이템만 그 순서대로 보여줍니다.
+    QSortFilterProxyModel은 행마다 파이썬 filterAcceptsRow를 호출하여 10만 행에서 수 초가 걸리므로,
+    거르기는 색인에서 얻은 id 목록을 통째로 바꾸는 방식으로 처리합니다. 정렬과 묶기도 arrange_ids()로 만든 목록을
+    넘기는 방식이며, 목록에 섞인 문자열(GroupHeader)은 선택할 수 없는 묶음 제목 행으로 표시됩니다.
+    거르지 않고 정렬·묶기만 한 목록은 그 설정을 기억해 두고, 아이템 하나가 추가·수정·삭제되면 목록을 다시 만들지 않고
+    이진 탐색으로 찾은 자리에 넣거나 옮깁니다. (행 단위 신호라 스크롤 위치와 선택이 유지됨)
+    """
+    # 거른 목록이 적용된 상태에서 아이템이 추가/수정되어 목록을 다시 계산해야 할 때
+    view_stale = pyqtSignal()
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._ids = None    # None이면 store 전체를 순서대로 보여줌
+        self._grouped = False # _ids에 묶음 제목 행이 있는지
+        self._arrangement = None # 전체 목록을 정렬·묶기만 한 경우 (정렬 필드, 내림차순, 묶음 필드)
+        self._header_rows = [] # _ids에서 묶음 제목 행의 위치 (오름차순)
+        self._view_stale = False
+        self.validator = None # 지정되면 행마다 검증 결과 표시를 붙임 (ItemValidator)
+        store.add_listener(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self._ids is None else len(self._ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._ids is not None and isinstance(self._ids[index.row()], str): # 묶음 제목 행
+            if role == Qt.DisplayRole:
+                return str(self._ids[index.row()])
+            if role == Qt.FontRole:
+                font = QFont()
+                font.setBold(True)
+                return font
+            return None
+        if role == Qt.DisplayRole:
+            item = self.item_at(index.row())
+            text = f"{item.get('이름','(이름 없음)')} [{item.get('타입','?')}]"
+            if self.validator is not None:
+                badge = problem_badge(self.validator.problems_of(self.id_at(index.row())))
+                if badge:
+                    text = f"{text}  {badge}"
+            return text
+        if role == Qt.ToolTipRole and self.validator is not None:
+            problems = self.validator.problems_of(self.id_at(index.row()))
+            return "\n".join(f"{'오류' if level == 'error' else '경고'} - {field}: {message}"
+                             for level, field, message in problems) or None
+        return None
+
+    def flags(self, index):
+        if index.isValid() and self._ids is not None and isinstance(self._ids[index.row()], str):
+            return Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def id_at(self, view_row):
+        """뷰 행의 아이템 id. 묶음 제목 행이면 None"""
+        if self._ids is None:
+            return self.store.id_at(view_row)
+        item_id = self._ids[view_row]
+        return None if isinstance(item_id, str) else item_id
+
+    def item_at(self, view_row):
+        return self.store[view_row] if self._ids is None else self.store.item(self._ids[view_row])
+
+    def source_row(self, view_row):
+        """뷰의 행 번호를 store의 행 번호로 바꿉니다. 묶음 제목 행이면 None."""
+        if self._ids is None:
+            return view_row
+        item_id = self._ids[view_row]
+        return None if isinstance(item_id, str) else self.store.row_of(item_id)
+
+    def view_row(self, source_row):
+        """store의 행 번호를 뷰의 행 번호로 바꿉니다. 뷰에 없으면 None."""
+        if self._ids is None:
+            return source_row
+        try:
+            return self._ids.index(self.store.id_at(source_row))
+        except (ValueError, IndexError):
+            return None
+
+    def is_filtered(self):
+        return self._ids is not None
+
+    def visible_items(self):
+        """지금 보이는 아이템 목록 (거른 상태면 그 결과만). 아이템은 제자리에서 바뀌지 않으므로 다른 스레드에 넘겨도 됩니다."""
+        if self._ids is None:
+            return self.store.to_list()
+        return [self.store.item(item_id) for item_id in self._ids if not isinstance(item_id, str)]
+
+    def set_view(self, ids, arrangement=None):
+        """보여줄 아이템 id 목록을 지정합니다. None이면 전체 목록으로 돌아갑니다.
+
+        ids가 store 전체를 arrange_ids()로 늘어놓은 목록이면 그 인자 (정렬 필드, 내림차순, 묶음 필드)를 arrangement로
+        넘깁니다. 그러면 이후 편집은 목록을 다시 계산하지 않고 제자리에서 반영합니다.
+        """
+        self.beginResetModel()
+        self._ids = None if ids is None else list(ids)
+        self._header_rows = [row for row, entry in enumerate(self._ids or ()) if isinstance(entry, str)]
+        self._grouped = bool(self._header_rows)
+        self._arrangement = arrangement if self._ids is not None else None
+        self._view_stale = False
+        self.endResetModel()
+
+    def reset(self):
+        """store 전체가 바뀌었을 때 뷰를 다시 그리게 합니다."""
+        self.beginResetModel()
+        self.endResetModel()
+
+    def refresh_badges(self):
+        """전체 검증이 끝났을 때 보이는 행의 검증 표시를 다시 그리게 합니다."""
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [Qt.DisplayRole, Qt.ToolTipRole])
+
+    def _mark_stale(self):
+        if not self._view_stale:
+            self._view_stale = True
+            self.view_stale.emit()
+
+    # --- 정렬·묶기만 한 목록의 제자리 갱신 ---
+    def _insert_entry(self, row, entry):
+        self._ids.insert(row, entry)
+        self._header_rows = [r + 1 if r >= row else r for r in self._header_rows]
+        if isinstance(entry, str):
+            bisect.insort(self._header_rows, row)
+
+    def _remove_entry(self, row):
+        if isinstance(self._ids.pop(row), str):
+            self._header_rows.remove(row)
+        self._header_rows = [r - 1 if r > row else r for r in self._header_rows]
+
+    def _precedes(self, a, b):
+        """arrange_ids()의 순서에서 아이템 a가 b보다 앞인지 (값이 없으면 뒤, 같은 값이면 등록순)"""
+        sort_field, descending, _ = self._arrangement
+        if sort_field is not None:
+            value_a, value_b = self.store.item(a).get(sort_field, ""), self.store.item(b).get(sort_field, "")
+            if (value_a == "") != (value_b == ""):
+                return value_b == ""
+            if value_a != "":
+                key_a, key_b = sort_key(value_a), sort_key(value_b)
+                if key_a != key_b:
+                    return key_a > key_b if descending else key_a < key_b
+        return self.store.row_of(a) < self.store.row_of(b)
+
+    def _group_value(self, item):
+        value = item.get(self._arrangement[2], "")
+        return facet_value(value) if value != "" else None
+
+    def _group_span(self, value):
+        """묶음 value의 (제목 행, 묶음 끝 행). 그런 묶음이 없으면 (None, 제목을 넣을 행)"""
+        headers = self._header_rows
+        order = group_sort_key(value)
+        for n, row in enumerate(headers):
+            if self._ids[row].value == value:
+                return row, headers[n + 1] if n + 1 < len(headers) else len(self._ids)
+            if group_sort_key(self._ids[row].value) > order:
+                return None, row
+        return None, len(self._ids)
+
+    def _span_for(self, item, exclude=None):
+        """item이 들어갈 구간 (시작, 끝). 묶었는데 그 묶음이 없으면 제목 행을 먼저 넣습니다."""
+        if self._arrangement[2] is None:
+            return 0, len(self._ids)
+        value = self._group_value(item)
+        header, end = self._group_span(value)
+        if header is None:
+            header = end
+            self.beginInsertRows(QModelIndex(), header, header)
+            self._insert_entry(header, group_header(self._arrangement[2], value, 0))
+            self.endInsertRows()
+            end = header + 1
+        return header + 1, end
+
+    def _position(self, item_id, start, end):
+        """구간 [start, end)에서 item_id를 넣을 자리"""
+        lo, hi = start, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._precedes(item_id, self._ids[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _refresh_header(self, value):
+        """묶음 value의 제목 행 개수를 고치고, 빈 묶음이면 제목 행을 뺍니다."""
+        header, end = self._group_span(value)
+        if header is None:
+            return
+        if end - header == 1:
+            self.beginRemoveRows(QModelIndex(), header, header)
+            self._remove_entry(header)
+            self.endRemoveRows()
+        else:
+            self._ids[header] = group_header(self._arrangement[2], value, end - header - 1)
+            index = self.index(header)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def _insert_arranged(self, item_id):
+        item = self.store.item(item_id)
+        start, end = self._span_for(item)
+        row = self._position(item_id, start, end)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._insert_entry(row, item_id)
+        self.endInsertRows()
+        if self._arrangement[2] is not None:
+            self._refresh_header(self._group_value(item))
+
+    def _move_arranged(self, item_id, old, new):
+        sort_field, _, group_field = self._arrangement
+        src = self._ids.index(item_id)
+        if all(old.get(field, "") == new.get(field, "") for field in (sort_field, group_field) if field is not None):
+            index = self.index(src)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+            return
+        old_group = self._group_value(old) if group_field is not None else None
+        start, end = self._span_for(new)
+        src = self._ids.index(item_id) # 제목 행이 들어갔으면 밀렸을 수 있음
+        # 자리는 이 아이템을 뺀 목록에서 찾음 (신호 없이 잠시 뺐다가 되돌림)
+        del self._ids[src]
+        row = self._position(item_id, start - (src < start), end - (src < end))
+        self._ids.insert(src, item_id)
+        if row != src:
+            self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), row if row < src else row + 1)
+            self._remove_entry(src)
+            self._insert_entry(row, item_id)
+            self.endMoveRows()
+        index = self.index(self._ids.index(item_id))
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        if group_field is not None:
+            self._refresh_header(old_group)
+            self._refresh_header(self._group_value(new))
+
+    # --- ItemStore 리스너 ---
+    def about_to_insert(self, row):
+        if self._ids is None:
+            self.beginInsertRows(QModelIndex(), row, row)
+
+    def inserted(self, row, item_id, item):
+        if self._ids is None:
+            self.endInsertRows()
+        elif self._arrangement is not None:
+            self._insert_arranged(item_id)
+        else:
+            self._mark_stale()
+
+    def replaced(self, row, item_id, old, new):
+        if self._ids is None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        elif self._arrangement is not None:
+            self._move_arranged(item_id, old, new)
+        else:
+            self._mark_stale()
+
+    def about_to_remove(self, row):
+        if self._ids is None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            return
+        # 거른 목록에서는 삭제되는 아이템만 바로 빼서 없는 id를 참조하지 않게 함
+        try:
+            view_row = self._ids.index(self.store.id_at(row))
+        except ValueError:
+            return
+        self.beginRemoveRows(QModelIndex(), view_row, view_row)
+        self._remove_entry(view_row)
+        self.endRemoveRows()
+        if self._arrangement is not None and self._arrangement[2] is not None:
+            self._refresh_header(self._group_value(self.store[row]))
+        elif self._grouped: # 묶음 제목의 개수가 달라짐
+            self._mark_stale()
+
+    def removed(self, row, item_id, item):
+        if self._ids is None:
+            self.endRemoveRows()
+
+    def about_to_extend(self, first, last):
+        if self._ids is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def extended(self, first, last):
+        if self._ids is None:
+            self.endInsertRows()
+        else:
+            self._mark_stale()
+
+    def about_to_clear(self):
+        self.beginResetModel()
+
+    def cleared(self):
+        if self._ids is not None:
+            self._ids = []
+            self._header_rows = []
+        self.endResetModel()
+
+    def about_to_bulk_update(self):
+        # 수천 행이 바뀌어도 행마다 신호를 보내지 않고 한 번에 다시 그림
+        self.beginResetModel()
+
+    def bulk_updated(self, replaced, removed, inserted):
+        if self._ids is not None:
+            if removed:
+                gone = {item_id for _, item_id, _ in removed}
+                self._ids = [item_id for item_id in self._ids if item_id not in gone]
+                self._header_rows = [row for row, entry in enumerate(self._ids) if isinstance(entry, str)]
+                if self._grouped:
+                    self._mark_stale()
+            if replaced or inserted:
+                self._mark_stale()
+        self.endResetModel()
+
+def facet_value(value):
+    """패싯과 정렬에 쓰는 값의 문자열 표현 (목록은 쉼표로 이음)"""
+    return value if isinstance(value, str) else format_value(value)
+
+def sort_key(value):
+    """숫자로 읽히는 값은 숫자 크기로, 나머지는 대소문자를 무시한 문자열로 비교하는 정렬 키"""
+    text = facet_value(value)
+    if text[:1].isdigit() or text[:1] in ("-", "+", "."): # 대부분의 문자열 값은 예외 처리 없이 바로 넘어감
+        try:
+            return (0, float(text), "")
+        except ValueError:
+            pass
+    return (1, 0.0, text.lower())
+
+class GroupHeader(str):
+    """묶은 목록의 제목 행 문자열. 묶는 값(value, 값이 없는 묶음은 None)을 함께 가집니다."""
+
+def group_header(group_field, value, count):
+    header = GroupHeader(f"{group_field}: {'(없음)' if value is None else value} ({count}개)")
+    header.value = value
+    return header
+
+def group_sort_key(value):
+    """묶음 순서: 값 순서, 값이 없는 묶음은 맨 뒤"""
+    return (value is None, sort_key(value) if value is not None else ())
+
+def arrange_ids(store, ids, sort_field=None, descending=False, group_field=None):
+    """아이템 id 목록을 정렬하고 묶어 ItemListModel.set_view()에 넘길 목록을 만듭니다.
+
+    sort_field가 없으면 주어진 순서를 유지합니다. group_field가 있으면 그 값이 같은 아이템끼리 모으고
+    각 묶음 앞에 '필드: 값 (개수)' 제목 문자열을 넣습니다. 값이 없는 아이템은 정렬과 묶음 모두 맨 뒤에 둡니다.
+    """
+    item = store.item
+    if sort_field is not None:
+        present = [item_id for item_id in ids if item(item_id).get(sort_field, "") != ""]
+        missing = [item_id for item_id in ids if item(item_id).get(sort_field, "") == ""]
+        ids = sorted(present, key=lambda item_id: sort_key(item(item_id)[sort_field]), reverse=descending) + missing
+    if group_field is None:
+        return list(ids)
+    groups = {}
+    for item_id in ids:
+        value = item(item_id).get(group_field, "")
+        groups.setdefault(facet_value(value) if value != "" else None, []).append(item_id)
+    arranged = []
+    for value in sorted(groups, key=group_sort_key):
+        members = groups[value]
+        arranged.append(group_header(group_field, value, len(members)))
+        arranged.extend(members)
+    return arranged
+
+class FacetCounter:
+    """패싯 필드의 값별 아이템 수를 store 변경에 맞춰 갱신하는 리스너
+
+    추가·수정·삭제된 아이템의 값만 더하고 빼므로, 사이드바를 다시 그릴 때 목록 전체를 훑지 않습니다.
+    """
+    def __init__(self, store, fields, on_change=None):
+        self.store = store
+        self.fields = tuple(fields)
+        self.on_change = on_change
+        self.counts = {field: {} for field in self.fields} # 필드 -> 값 -> 아이템 수
+        store.add_listener(self)
+
+    def build(self):
+        """현재 store 전체로 개수를 다시 셉니다."""
+        self.counts = {field: {} for field in self.fields}
+        for row in range(len(self.store)):
+            self._count(self.store[row], 1)
+
+    def _count(self, item, sign):
+        for field in self.fields:
+            value = item.get(field, "")
+            if value == "":
+                continue
+            counts = self.counts[field]
+            value = facet_value(value)
+            n = counts.get(value, 0) + sign
+            if n:
+                counts[value] = n
+            else:
+                del counts[value]
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
+
+    def values(self, field):
+        """[(값, 아이템 수)]. 많은 값부터, 같으면 값 순서"""
+        return sorted(self.counts.get(field, {}).items(), key=lambda entry: (-entry[1], sort_key(entry[0])))
+
+    # --- ItemStore 리스너 ---
+    def inserted(self, row, item_id, item):
+        self._count(item, 1)
+        self._notify()
+
+    def replaced(self, row, item_id, old, new):
+        self._count(old, -1)
+        self._count(new, 1)
+        self._notify()
+
+    def removed(self, row, item_id, item):
+        self._count(item, -1)
+        self._notify()
+
+    def bulk_updated(self, replaced, removed, inserted):
+        for _, _, item in removed:
+            self._count(item, -1)
+        for _, _, old, new in replaced:
+            self._count(old, -1)
+            self._count(new, 1)
+        for _, _, item in inserted:
+            self._count(item, 1)
+        self._notify()
+
+    def extended(self, first, last):
+        for row in range(first, last + 1):
+            self._count(self.store[row], 1)
+        self._notify()
+
+    def cleared(self):
+        self.counts = {field: {} for field in self.fields}
+        self._notify()
+
+def format_value(value):
+    """상세 보기와 복사용 텍스트에 쓰는 값 표현 (목록은 쉼표로 연결)"""
+    return ', '.join(value) if isinstance(value, list) else str(value)
+
+def format_item_text(item):
+    """복사용 일반 텍스트: '타입'을 뺀 필드를 순서대로, '설명'은 줄바꿈을 이스케이프하여 마지막에"""
+    lines = [f"{key}: {format_value(value)}" for key, value in item.items() if key not in ("타입", "설명")]
+    if "설명" in item:
+        lines.append(f"설명: {format_value(item['설명'])}".replace("\n", "\\n"))
+    return "\n".join(lines)
+
+EXPORT_FORMATS = {"jsonl": "JSON Lines (*.jsonl)", "csv": "CSV (*.csv)", "txt": "일반 텍스트 (*.txt)"}
+
+def export_columns(schema):
+    """CSV 열 순서: 이름, 타입, '공통' 필드, 타입별 필드 (config에 나온 순서)"""
+    columns = dict.fromkeys(["이름", "타입", *schema.common_fields])
+    for item_type in schema.types:
+        columns.update(dict.fromkeys(schema.section_fields(item_type)))
+    return list(columns)
+
+def iter_export_chunks(items, fmt, schema):
+    """아이템을 내보내기 형식의 문자열 조각으로 하나씩 바꾸는 제너레이터
+
+    CSV는 config에 정의된 필드만 열로 씁니다. (정의되지 않은 필드까지 모두 필요하면 JSONL 사용)
+    일반 텍스트는 '일반 텍스트 복사'와 같은 형식이며 아이템 사이에 빈 줄을 넣습니다.
+    """
+    if fmt == "jsonl":
+        for item in items:
+            yield json.dumps(item, ensure_ascii=False, default=json_default) + "\n"
+    elif fmt == "csv":
+        columns = export_columns(schema)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for item in items:
+            writer.writerow([format_value(item[column]) if column in item else "" for column in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue() # 아이템이 없으면 머리글만
+    elif fmt == "txt":
+        separator = ""
+        for item in items:
+            yield separator + format_item_text(item) + "\n"
+            separator = "\n"
+    else:
+        raise ValueError(f"알 수 없는 내보내기 형식: {fmt}")
+
+class ItemRenderCache:
+    """아이템별 상세 보기 HTML, 복사용 텍스트/JSON을 보관하는 LRU 캐시
+
+    (아이템 id, 수정 번호)로 구분하며, store의 교체/삭제 알림을 받아 해당 아이템의 항목만 버립니다.
+    config가 바뀌면 set_schema()로 전체를 비웁니다. 타입별 표시 순서는 스키마에 미리 계산되어 있습니다.
+    """
+    def __init__(self, store, schema, max_items=RENDER_CACHE_SIZE):
+        self.store = store
+        self.max_items = max_items
+        self._entries = OrderedDict()   # 아이템 id -> {종류: (수정 번호, 결과)} (오래 쓰지 않은 것부터)
+        self.set_schema(schema)
+        store.add_listener(self)
+
+    def set_schema(self, schema):
+        self.schema = schema
+        self._display = {}              # 타입 -> (표시 순서, 표시 순서 집합)
+        self._entries.clear()
+
+    def _display_keys(self, item_type):
+        display = self._display.get(item_type)
+        if display is None:
+            order = self.schema.display_order(item_type)
+            display = self._display[item_type] = (order, frozenset(order))
+        return display
+
+    def _get(self, item_id, kind, render):
+        revision = self.store.revision(item_id)
+        entry = self._entries.get(item_id)
+        if entry is None:
+            entry = self._entries[item_id] = {}
+            if len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(item_id)
+        cached = entry.get(kind)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        result = render(self.store.item(item_id))
+        entry[kind] = (revision, result)
+        return result
+
+    def html(self, item_id):
+        """상세 보기 HTML: '공통'(설명 제외) -> 타입 필드 -> '설명' 순서, 그 다음 config에 없는 필드"""
+        return self._get(item_id, "html", self._render_html)
+
+    def text(self, item_id):
+        """복사용 일반 텍스트: '타입'을 뺀 필드를 순서대로, '설명'은 줄바꿈을 이스케이프하여 마지막에"""
+        return self._get(item_id, "text", format_item_text)
+
+    def json(self, item_id):
+        return self._get(item_id, "json", lambda item: json.dumps(item, ensure_ascii=False, indent=2, default=json_default))
+
+    def _render_html(self, item):
+        order, keys = self._display_keys(item.get("타입"))
+        lines = [f"<b>{key}</b>: {format_value(item[key])}" for key in order if key in item]
+        # config에 정의되지 않았지만 아이템 데이터에 있는 다른 필드들 (예상치 못한 필드)
+        lines.extend(f"<b>{key}</b>: {format_value(value)}" for key, value in item.items()
+                     if key not in keys and key != "타입")
+        return "<br>".join(lines)
+
+    # --- store 변경 알림 ---
+    def replaced(self, row, item_id, old, new):
+        self._entries.pop(item_id, None)
+
+    def removed(self, row, item_id, item):
+        self._entries.pop(item_id, None)
+
+    def bulk_updated(self, replaced, removed, inserted):
+        for _, item_id, *_ in replaced + removed:
+            self._entries.pop(item_id, None)
+
+    def cleared(self):
+        self._entries.clear()
+
+def keyed_diff(old_items, new_items):
+    """두 아이템 목록을 (이름, 타입) 키로 비교합니다.
+
+    (추가 [(new_items에서의 행, 아이템)], 삭제 [키], 수정 [(키, 이전 아이템, 새 아이템)])을 반환합니다.
+    중복 키는 먼저 나온 아이템끼리만 비교합니다.
+    """
+    old_by_key = {}
+    for item in old_items:
+        old_by_key.setdefault(item_key(item), item)
+    added, changed, seen = [], [], set()
+    for row, item in enumerate(new_items):
+        key = item_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        old = old_by_key.get(key)
+        if old is None:
+            added.append((row, item))
+        elif old != item:
+            changed.append((key, old, item))
+    removed = [key for key in old_by_key if key not in seen]
+    return added, removed, changed
+
+def change_keys(changes):
+    """저널 레코드 목록이 건드리는 (이름, 타입) 키 집합"""
+    keys = set()
+    for change in changes:
+        if change.get("key"):
+            keys.add(tuple(change["key"]))
+        if change["op"] == "put":
+            keys.add(item_key(change["item"]))
+    return keys
+
+def apply_change_to_map(items_by_key, change):
+    """저널 레코드 하나를 (이름, 타입) -> 아이템 dict에 적용합니다. (ItemStore.apply_change와 같은 키 기준 규칙)"""
+    if change["op"] == "put":
+        if change.get("key"):
+            items_by_key.pop(tuple(change["key"]), None)
+        items_by_key[item_key(change["item"])] = change["item"]
+    elif change["op"] == "del":
+        items_by_key.pop(tuple(change["key"]), None)
+
+_MISSING = object()
+
+def field_changes(old, new):
+    """두 아이템의 필드별 차이 [(필드, 이전 값, 새 값)]. 한쪽에 없는 필드의 값은 _MISSING이며, 새 아이템의 필드 순서를 따릅니다."""
+    fields = list(new) + [key for key in old if key not in new]
+    return [(key, old.get(key, _MISSING), new.get(key, _MISSING)) for key in fields
+            if old.get(key, _MISSING) != new.get(key, _MISSING)]
+
+def _first_by_key(items):
+    by_key = {}
+    for item in items:
+        by_key.setdefault(item_key(item), item)
+    return by_key
+
+def merge_items(base, ours, theirs):
+    """같은 키의 아이템 세 버전을 필드 단위로 병합합니다. (병합한 아이템, 충돌 [(필드, 기준, 내 값, 다른 값)])
+
+    한쪽만 바꾼 필드는 바뀐 쪽을 따르고, 양쪽이 다르게 바꾼 필드는 내 값을 남기고 충돌로 보고합니다.
+    필드 순서는 내 아이템을 따르고, 다른 쪽에서 새로 생긴 필드는 뒤에 붙입니다.
+    """
+    merged, conflicts = {}, []
+    for key in list(ours) + [key for key in theirs if key not in ours]:
+        base_value, our_value, their_value = base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING)
+        if our_value == their_value or their_value == base_value:
+            value = our_value
+        elif our_value == base_value:
+            value = their_value
+        else:
+            value = our_value
+            conflicts.append((key, base_value, our_value, their_value))
+        if value is not _MISSING:
+            merged[key] = value
+    return merged, conflicts
+
+def merge_catalogs(base, ours, theirs):
+    """세 아이템 목록을 (이름, 타입) 키로 3-way 병합합니다. (병합한 목록, 충돌 목록, 통계 dict)를 반환합니다.
+
+    아이템은 dict 비교(필드 순서와 무관, C로 구현되어 빠름)로 같은지 확인하므로 바뀌지 않은 아이템은 바로 넘어가고,
+    양쪽에서 모두 바뀐 아이템만 merge_items()로 필드를 비교합니다. 충돌은 (키, 사유, merge_items()의 필드 충돌 목록)이며,
+    충돌한 아이템도 내용을 잃지 않도록 결과에 남깁니다. (사유별로 남기는 쪽은 MERGE_CONFLICT_RESOLUTIONS)
+    목록 순서는 내 목록을 따르고 다른 쪽에만 추가된 아이템은 뒤에 붙습니다. 한 목록 안의 중복 키는 처음 것만 병합하고
+    내 목록의 나머지 중복 아이템은 그대로 둡니다.
+    """
+    base_by_key, ours_by_key, theirs_by_key = _first_by_key(base), _first_by_key(ours), _first_by_key(theirs)
+    stats = {"unchanged": 0, "ours": 0, "theirs": 0, "merged": 0, "deleted": 0, "conflicts": 0}
+    conflicts = []
+
+    def resolve(key):
+        base_item, our_item, their_item = base_by_key.get(key), ours_by_key.get(key), theirs_by_key.get(key)
+        if our_item == their_item:
+            if our_item is None:
+                stats["deleted"] += 1 # 양쪽에서 모두 삭제
+            else:
+                stats["unchanged" if our_item == base_item else "merged"] += 1
+            return our_item
+        if their_item == base_item:
+            stats["ours"] += 1
+            return our_item
+        if our_item == base_item:
+            stats["theirs"] += 1
+            return their_item
+        if our_item is None or their_item is None:
+            # 한쪽은 삭제하고 다른 쪽은 수정함: 수정한 내용을 남기고 충돌로 보고
+            kept = their_item if our_item is None else our_item
+            conflicts.append((key, "내 쪽에서 삭제, 다른 쪽에서 수정" if our_item is None else "내 쪽에서 수정, 다른 쪽에서 삭제", []))
+            stats["conflicts"] += 1
+            return kept
+        item, fields = merge_items(base_item or {}, our_item, their_item)
+        if fields:
+            conflicts.append((key, "양쪽에서 다르게 추가" if base_item is None else "양쪽에서 같은 필드를 수정", fields))
+            stats["conflicts"] += 1
+        else:
+            stats["merged"] += 1
+        return item
+
+    merged, seen = [], set()
+    for item in ours:
+        key = item_key(item)
+        if key in seen:
+            merged.append(item)
+            continue
+        seen.add(key)
+        result = resolve(key)
+        if result is not None:
+            merged.append(result)
+    for source in (theirs, base):
+        for item in source:
+            key = item_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            result = resolve(key)
+            if result is not None:
+                merged.append(result)
+    return merged, conflicts, stats
+
+def format_field_value(value):
+    return "(없음)" if value is _MISSING else format_value(value)
+
+def diff_lines(added, removed, changed, limit):
+    """keyed_diff() 결과를 사람이 읽는 줄 목록으로 만듭니다. (+ 추가, - 삭제, ~ 수정과 필드별 이전 → 새 값)"""
+    lines = [f"+ {item.get('이름')} [{item.get('타입')}]" for _, item in added[:limit]]
+    lines += [f"- {name} [{item_type}]" for name, item_type in removed[:limit]]
+    for (name, item_type), old, new in changed[:limit]:
+        lines.append(f"~ {name} [{item_type}]")
+        lines += [f"    {field}: {format_field_value(before)} → {format_field_value(after)}"
+                  for field, before, after in field_changes(old, new)]
+    hidden = sum(max(len(entries) - limit, 0) for entries in (added, removed, changed))
+    if hidden:
+        lines.append(f"... 외 {hidden}개")
+    return lines
+
+# 충돌 사유 -> 병합 결과에 무엇을 남겼는지
+MERGE_CONFLICT_RESOLUTIONS = {
+    "내 쪽에서 삭제, 다른 쪽에서 수정": "다른 쪽에서 수정한 아이템을 남겼습니다",
+    "내 쪽에서 수정, 다른 쪽에서 삭제": "내 쪽에서 수정한 아이템을 남겼습니다",
+    "양쪽에서 다르게 추가": "충돌한 필드는 내 쪽 값을 남겼습니다",
+    "양쪽에서 같은 필드를 수정": "충돌한 필드는 내 쪽 값을 남겼습니다",
+}
+
+def merge_summary(merged, stats):
+    """merge_catalogs() 결과의 한 줄 요약"""
+    return (f"병합 결과 {len(merged)}개: 변경 없음 {stats['unchanged']}, 내 쪽 {stats['ours']}, 다른 쪽 {stats['theirs']}, "
+            f"자동 병합 {stats['merged']}, 양쪽 삭제 {stats['deleted']}, 충돌 {stats['conflicts']}")
+
+def conflict_resolution_lines(conflicts):
+    """충돌을 사유별로 세어 '사유 n건: 남긴 쪽' 줄 목록으로 만듭니다."""
+    counts = {}
+    for _, reason, _ in conflicts:
+        counts[reason] = counts.get(reason, 0) + 1
+    return [f"{reason} {count}건: {MERGE_CONFLICT_RESOLUTIONS[reason]}" for reason, count in counts.items()]
+
+def conflict_lines(conflicts, limit):
+    """merge_catalogs() 충돌 목록을 사람이 읽는 줄 목록으로 만듭니다."""
+    lines = []
+    for (name, item_type), reason, fields in conflicts[:limit]:
+        lines.append(f"! {name} [{item_type}]: {reason}")
+        lines += [f"    {field}: 기준 {format_field_value(base)} / 내 값 {format_field_value(ours)} / "
+                  f"다른 값 {format_field_value(theirs)}" for field, base, ours, theirs in fields]
+    if len(conflicts) > limit:
+        lines.append(f"... 외 {len(conflicts) - limit}개")
+    return lines
+
+def field_value_entry(**values):
+    """보고서 JSON용 dict. 없는 값(_MISSING)은 키를 빼서 null 값과 구분합니다."""
+    return {key: value for key, value in values.items() if value is not _MISSING}
+
+def item_diff(old, new):
+    """두 아이템의 바뀐 필드만 담은 되돌리기용 차이 [이전 값들, 새 값들, 이전 필드 순서, 새 필드 순서]
+
+    한쪽에만 있는 필드는 그쪽 dict에만 들어갑니다. 필드가 추가/삭제된 경우에만 필드 순서를 함께 남깁니다.
+    """
+    changed = [key for key in old.keys() | new.keys() if old.get(key, _MISSING) != new.get(key, _MISSING)]
+    same_keys = old.keys() == new.keys()
+    return [{key: old[key] for key in changed if key in old}, {key: new[key] for key in changed if key in new},
+            None if same_keys else list(old), None if same_keys else list(new)]
+
+def apply_item_diff(item, diff, forward):
+    """item_diff 결과를 item에 적용한 새 아이템을 반환합니다. forward가 False면 이전 상태로 되돌립니다."""
+    before, after, before_order, after_order = diff
+    values, order = (after, after_order) if forward else (before, before_order)
+    result = dict(item)
+    for key in before.keys() | after.keys():
+        if key in values:
+            result[key] = values[key]
+        else:
+            result.pop(key, None)
+    if order is not None:
+        result = {key: result[key] for key in order if key in result}
+    return result
+
+class EditHistory:
+    """store의 변경 알림을 받아 되돌리기/다시 실행 기록을 남기는 편집 기록
+
+    목록 전체를 복사하지 않고 작업마다 추가/삭제된 아이템과 바뀐 필드만 기록합니다.
+    기록은 JSON으로 바로 저장할 수 있는 목록 형태이며, 크기 합계가 max_bytes를 넘으면 오래된 기록부터 버립니다.
+      ["ins", 행, 아이템] / ["del", 행, 아이템] / ["upd", 행, 이름, 타입, 차이]
+      ["bulk", [[행, 이름, 타입, 차이], ...], [[행, 아이템], ...(삭제)], [[행, 아이템], ...(추가)]]
+    되돌리기는 기록을 역순으로만 적용하므로 행 번호가 항상 맞으며, 키가 다르면 기록이 목록과 어긋난 것으로 보고 모두 버립니다.
+    """
+    def __init__(self, store, path=None, max_bytes=HISTORY_MAX_BYTES):
+        self.store = store
+        self.path = path
+        self.max_bytes = max_bytes
+        self.recording = False      # 불러오기가 끝난 뒤에 켬
+        self._undo = deque()        # (기록, 크기)
+        self._redo = []
+        self._bytes = 0
+        self._applying = False
+        store.add_listener(self)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def _push(self, entry):
+        if not self.recording or self._applying:
+            return
+        self._redo.clear()
+        self._push_undo(entry)
+
+    def _push_undo(self, entry, size=None):
+        size = size or len(json.dumps(entry, ensure_ascii=False, default=json_default))
+        self._undo.append((entry, size))
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            self._bytes -= self._undo.popleft()[1]
+
+    @staticmethod
+    def describe(entry):
+        """상태 표시줄에 보여줄 기록 설명"""
+        kind = entry[0]
+        if kind == "bulk":
+            return f"아이템 {len(entry[1]) + len(entry[2]) + len(entry[3])}개 일괄 변경"
+        name = entry[2].get("이름", "(이름 없음)") if kind != "upd" else entry[2]
+        return f"'{name}' " + {"ins": "추가", "del": "삭제", "upd": "수정"}[kind]
+
+    # --- store 변경 알림 ---
+    def inserted(self, row, item_id, item):
+        self._push(["ins", row, item])
+
+    def removed(self, row, item_id, item):
+        self._push(["del", row, item])
+
+    def replaced(self, row, item_id, old, new):
+        self._push(["upd", row, *item_key(old), item_diff(old, new)])
+
+    def bulk_updated(self, replaced, removed, inserted):
+        self._push(["bulk", [[row, *item_key(old), item_diff(old, new)] for row, _, old, new in replaced],
+                    [[row, item] for row, _, item in removed], [[row, item] for row, _, item in inserted]])
+
+    def extended(self, first, last):
+        # 불러오기가 아닌 곳에서 한꺼번에 추가된 경우는 행 단위 추가 기록으로 남김
+        if self.recording and not self._applying:
+            self._push(["bulk", [], [], [[row, self.store[row]] for row in range(first, last + 1)]])
+
+    def cleared(self):
+        self.clear()
+
+    # --- 되돌리기 / 다시 실행 ---
+    def undo(self):
+        """마지막 작업을 되돌리고 그 설명을 반환합니다. 되돌릴 것이 없으면 None."""
+        if not self._undo:
+            return None
+        entry, size = self._undo.pop()
+        self._bytes -= size
+        self._apply(entry, forward=False)
+        self._redo.append((entry, size))
+        return self.describe(entry)
+
+    def redo(self):
+        """되돌린 작업을 다시 실행하고 그 설명을 반환합니다. 다시 실행할 것이 없으면 None."""
+        if not self._redo:
+            return None
+        entry, size = self._redo.pop()
+        self._apply(entry, forward=True)
+        self._push_undo(entry, size)
+        return self.describe(entry)
+
+    def _check(self, row, key):
+        if row >= len(self.store) or item_key(self.store[row]) != tuple(key):
+            self.clear()
+            raise ValueError("편집 기록이 현재 아이템 목록과 맞지 않아 기록을 모두 지웠습니다.")
+
+    def _apply(self, entry, forward):
+        store = self.store
+        kind = entry[0]
+        self._applying = True
+        try:
+            if kind in ("ins", "del"):
+                _, row, item = entry
+                if (kind == "ins") == forward:
+                    store.insert(row, item)
+                else:
+                    self._check(row, item_key(item))
+                    store.remove(row)
+            elif kind == "upd":
+                _, row, name, item_type, diff = entry
+                if forward:
+                    self._check(row, (name, item_type))
+                    store.replace(row, apply_item_diff(store[row], diff, True))
+                else:
+                    new_key = item_key(apply_item_diff({"이름": name, "타입": item_type}, diff, True))
+                    self._check(row, new_key)
+                    store.replace(row, apply_item_diff(store[row], diff, False))
+            else:
+                _, updates, removed, inserted = entry
+                # 실행 순서: 삭제 -> 추가 -> 수정, 되돌리기는 그 반대 작업을 역순으로
+                if forward:
+                    for row, item in removed:
+                        self._check(row, item_key(item))
+                    store.remove_rows([row for row, _ in removed])
+                    store.insert_rows([(row, item) for row, item in inserted])
+                    for row, name, item_type, _ in updates:
+                        self._check(row, (name, item_type))
+                    store.replace_rows([(row, apply_item_diff(store[row], diff, True)) for row, _, _, diff in updates])
+                else:
+                    for row, name, item_type, diff in updates:
+                        self._check(row, item_key(apply_item_diff({"이름": name, "타입": item_type}, diff, True)))
+                    store.replace_rows([(row, apply_item_diff(store[row], diff, False)) for row, _, _, diff in updates])
+                    for row, item in inserted:
+                        self._check(row, item_key(item))
+                    store.remove_rows([row for row, _ in inserted])
+                    store.insert_rows([(row, item) for row, item in removed])
+        finally:
+            self._applying = False
+
+    # --- 저장 ---
+    def save(self):
+        """기록을 파일에 저장합니다. 다음 실행 때 목록이 같은지 확인할 수 있도록 아이템 수를 함께 남깁니다."""
+        if not self.path:
+            return
+        atomic_write_json(self.path, {"items": len(self.store), "undo": [entry for entry, _ in self._undo],
+                                      "redo": [entry for entry, _ in self._redo]})
+
+    def load(self):
+        """저장된 기록을 읽습니다. 파일이 없거나 손상되었거나 아이템 수가 다르면 빈 기록으로 시작합니다."""
+        self.clear()
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("items") != len(self.store):
+            return
+        for entry in data.get("undo", []):
+            self._push_undo(entry)
+        self._redo = [(entry, len(json.dumps(entry, ensure_ascii=False))) for entry in data.get("redo", [])]
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+def normalize_search_text(value):
+    """검색용 텍스트 정규화: 목록은 쉼표로 잇고, 소문자로 바꿉니다."""
+    if isinstance(value, list):
+        value = ", ".join(str(v) for v in value)
+    return str(value).lower()
+
+def choseong_of(text):
+    """한글 음절을 초성으로 바꿉니다. (예: '나무 도끼' -> 'ㄴㅁ ㄷㄲ') 한글이 아닌 문자는 그대로 둡니다."""
+    return "".join(CHOSEONG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch for ch in text)
+
+def is_choseong_query(text):
+    return bool(text) and all(ch in CHOSEONG or ch == " " for ch in text)
+
+def query_grams(text):
+    """검색어가 포함되려면 반드시 있어야 하는 gram 목록 (2-gram, 한 글자 검색어는 그 글자)"""
+    if len(text) == 1:
+        return [text]
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+def build_search_docs(entries, exact_fields, first_doc=0):
+    """(아이템 id, 아이템) 목록으로 색인 자료를 만듭니다. UI와 무관하므로 작업 스레드에서 실행해도 됩니다."""
+    postings = {}
+    doc_item, doc_text, doc_cho = [], [], []
+    exact = {}
+    fields = set()
+    doc = first_doc
+    for item_id, item in entries:
+        values = []
+        for key, value in item.items():
+            text = normalize_search_text(value)
+            values.append(text)
+            if key in exact_fields:
+                exact.setdefault(key, {}).setdefault(text, set()).add(doc)
+        fields.update(item.keys())
+        text = "\x1f".join(values)
+        cho = choseong_of(normalize_search_text(item.get("이름", ""))).replace(" ", "")
+        grams = {text[i:i + 2] for i in range(len(text) - 1)}
+        grams.update(text) # 한 글자 검색어용 1-gram
+        grams.discard("\x1f")
+        grams.update(SearchIndex.CHOSEONG_PREFIX + cho[i:i + 2] for i in range(len(cho) - 1))
+        grams.update(SearchIndex.CHOSEONG_PREFIX + c for c in cho)
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array("I", (doc,))
+            else:
+                posting.append(doc)
+        doc_item.append(item_id)
+        doc_text.append(text)
+        doc_cho.append(cho)
+        doc += 1
+    return {"postings": postings, "doc_item": doc_item, "doc_text": doc_text, "doc_cho": doc_cho,
+            "exact": exact, "fields": fields}
+
+class SearchIndex:
+    """아이템의 모든 필드 값에 대한 역색인 (문자 1-gram과 2-gram)
+
+    필드 값마다 글자와 문자 2-gram을 뽑아 gram -> 문서 번호 목록(array)으로 저장합니다.
+    1~2글자 검색어는 색인 목록이 곧 결과이고, 더 긴 검색어는 가장 드문 gram 두 개로 후보를 좁힌 뒤
+    실제 포함 여부를 확인하므로 한글 음절 단위의 부분 검색('도끼' -> '나무 도끼')이 됩니다.
+    '필드:값' 검색어도 같은 gram 목록으로 후보를 좁힌 뒤 그 필드에 실제로 있는지 확인합니다.
+    이름은 초성 검색('ㄴㅁㄷㄲ' -> '나무 도끼')도 지원합니다.
+
+    검색어 문법: 공백으로 구분한 단어는 모두 포함(AND). '필드:값'은 해당 필드에서만 찾으며,
+    옵션이 있는 필드(exact_fields)는 값이 정확히 같은 것을 우선합니다. 필드 이름의 공백은 '_'로 적습니다.
+
+    아이템이 수정되면 이전 문서를 삭제 표시하고 새 문서를 추가합니다. 삭제 표시가 많아지면 색인을 다시 만듭니다.
+    build_async()로 작업 스레드에서 만드는 동안 들어온 변경은 모아 두었다가 완성된 뒤에 적용합니다.
+    """
+    CHOSEONG_PREFIX = "\x01"
+
+    def __init__(self, store, exact_fields=()):
+        self.store = store
+        self.exact_fields = frozenset(exact_fields) | {"타입"}
+        self.ready = False
+        self._pending = []
+        self._install(build_search_docs((), self.exact_fields))
+        store.add_listener(self)
+
+    def _entries(self):
+        return [(self.store.id_at(row), self.store[row]) for row in range(len(self.store))]
+
+    def build(self):
+        """현재 store 전체로 색인을 만듭니다."""
+        self._install(build_search_docs(self._entries(), self.exact_fields))
+        self._pending.clear()
+        self.ready = True
+
+    def build_async(self, on_ready=None):
+        """작업 스레드에서 색인을 만들고, 완성되면 UI 스레드에서 on_ready를 호출합니다."""
+        self.ready = False
+        self._pending.clear()
+        builder = _IndexBuilder(build_search_docs, self._entries(), self.exact_fields)
+
+        def install():
+            self._install(builder.result)
+            pending, self._pending = self._pending, []
+            self.ready = True
+            for handler, args in pending:
+                handler(*args)
+            if on_ready:
+                on_ready()
+
+        builder.finished.connect(install)
+        builder.finished.connect(builder.deleteLater)
+        builder.start()
+        self._builder = builder # 스레드 객체가 끝나기 전에 수거되지 않도록 보관
+
+    def _install(self, state):
+        self._postings = state["postings"]
+        self._doc_item = state["doc_item"]      # 문서 번호 -> 아이템 id (삭제되었으면 None)
+        self._doc_text = state["doc_text"]      # 문서 번호 -> 정규화한 값들을 \x1f로 이은 텍스트
+        self._doc_cho = state["doc_cho"]        # 문서 번호 -> 이름 초성 (공백 제외)
+        self._exact = state["exact"]            # 필드 -> 정규화 값 -> {문서 번호}
+        self.fields = state["fields"]
+        self._item_doc = {item_id: doc for doc, item_id in enumerate(self._doc_item)}
+        self._dead = 0
+
+    # --- 색인 갱신 ---
+    def _add(self, item_id, item):
+        self._add_entries([(item_id, item)])
+
+    def _add_entries(self, entries):
+        state = build_search_docs(entries, self.exact_fields, first_doc=len(self._doc_item))
+        for gram, posting in state["postings"].items():
+            existing = self._postings.get(gram)
+            if existing is None:
+                self._postings[gram] = posting
+            else:
+                existing.extend(posting)
+        for key, values in state["exact"].items():
+            for text, docs in values.items():
+                self._exact.setdefault(key, {}).setdefault(text, set()).update(docs)
+        self.fields |= state["fields"]
+        for doc, item_id in enumerate(state["doc_item"], start=len(self._doc_item)):
+            self._item_doc[item_id] = doc
+        self._doc_item.extend(state["doc_item"])
+        self._doc_text.extend(state["doc_text"])
+        self._doc_cho.extend(state["doc_cho"])
+
+    def _discard(self, item_id, item):
+        doc = self._item_doc.pop(item_id, None)
+        if doc is None:
+            return
+        self._doc_item[doc] = None
+        self._doc_text[doc] = ""
+        self._doc_cho[doc] = ""
+        self._dead += 1
+        for key in self.exact_fields & item.keys():
+            docs = self._exact.get(key, {}).get(normalize_search_text(item[key]))
+            if docs:
+                docs.discard(doc)
+
+    def _compact_if_sparse(self):
+        """삭제된 문서가 살아 있는 문서보다 많아지면 색인을 새로 만듭니다."""
+        if self._dead > 10000 and self._dead > len(self._item_doc):
+            self.build()
+
+    def _handle(self, handler, *args):
+        if self.ready:
+            handler(*args)
+        else:
+            self._pending.append((handler, args))
+
+    # --- ItemStore 리스너 ---
+    def inserted(self, row, item_id, item):
+        self._handle(self._add, item_id, item)
+
+    def replaced(self, row, item_id, old, new):
+        self._handle(self._discard, item_id, old)
+        self._handle(self._add, item_id, new)
+        self._handle(self._compact_if_sparse)
+
+    def removed(self, row, item_id, item):
+        self._handle(self._discard, item_id, item)
+        self._handle(self._compact_if_sparse)
+
+    def bulk_updated(self, replaced, removed, inserted):
+        for _, item_id, item in removed:
+            self._handle(self._discard, item_id, item)
+        for _, item_id, old, _ in replaced:
+            self._handle(self._discard, item_id, old)
+        added = [(item_id, new) for _, item_id, _, new in replaced] + [(item_id, item) for _, item_id, item in inserted]
+        if added:
+            self._handle(self._add_entries, added)
+        self._handle(self._compact_if_sparse)
+
+    def extended(self, first, last):
+        for row in range(first, last + 1):
+            self._handle(self._add, self.store.id_at(row), self.store[row])
+
+    def cleared(self):
+        self._pending.clear()
+        self._install(build_search_docs((), self.exact_fields))
+
+    # --- 검색 ---
+    def _gram_docs(self, grams):
+        """gram이 모두 들어 있을 수 있는 문서 후보 집합. 가장 드문 두 gram의 교집합으로 좁힙니다."""
+        postings = []
+        for gram in set(grams):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        docs = set(postings[0])
+        if len(postings) > 1:
+            docs.intersection_update(postings[1])
+        return docs
+
+    def _match_term(self, term, within=None):
+        """검색어 하나에 맞는 문서 번호 집합. within이 주어지면 그 안에서만 확인합니다."""
+        field = None
+        if ":" in term:
+            name, value = term.split(":", 1)
+            name = name.replace("_", " ")
+            if name in self.fields:
+                field, term = name, value
+        if not term:
+            return set(self._item_doc.values()) if within is None else within
+
+        if field is not None:
+            exact = self._exact.get(field, {}).get(term)
+            if exact:
+                return set(exact) if within is None else exact & within
+            if within is None:
+                within = self._gram_docs(query_grams(term))
+            doc_item, item = self._doc_item, self.store.item
+            return {doc for doc in within if doc_item[doc] is not None
+                    and term in normalize_search_text(item(doc_item[doc]).get(field, ""))}
+
+        if is_choseong_query(term):
+            term = term.replace(" ", "")
+            texts = self._doc_cho
+            grams = [self.CHOSEONG_PREFIX + g for g in query_grams(term)]
+        else:
+            texts = self._doc_text
+            grams = query_grams(term)
+        if len(grams) == 1:
+            # 1~2글자 검색어는 gram 목록이 곧 정확한 결과
+            posting = self._postings.get(grams[0], ())
+            return set(posting) if within is None else within.intersection(posting)
+        if within is None:
+            within = self._gram_docs(grams) if grams else range(len(texts))
+        return {doc for doc in within if term in texts[doc]}
+
+    def field_ids(self, field, value):
+        """exact_fields의 필드 값이 value와 같은 아이템 id 집합 (대소문자 무시)"""
+        docs = self._exact.get(field, {}).get(normalize_search_text(value), ())
+        doc_item = self._doc_item
+        return {doc_item[doc] for doc in docs} - {None}
+
+    def search(self, query):
+        """검색어에 맞는 아이템 id 집합을 반환합니다. 빈 검색어면 None (거르지 않음)."""
+        terms = normalize_search_text(query).split()
+        if not terms:
+            return None
+        # 후보가 적을 것 같은 (긴) 검색어부터 찾고, 나머지는 결과 집합과 교차
+        terms.sort(key=len, reverse=True)
+        docs = self._match_term(terms[0])
+        for term in terms[1:]:
+            if not docs:
+                break
+            docs = self._match_term(term, within=docs)
+        doc_item = self._doc_item
+        return {doc_item[doc] for doc in docs} - {None}
+
+class _IndexBuilder(QThread):
+    """색인 자료를 만드는 함수 build(*args)를 작업 스레드에서 실행하는 스레드"""
+    def __init__(self, build, *args):
+        super().__init__()
+        self.build = build
+        self.args = args
+        self.result = None
+
+    def run(self):
+        self.result = self.build(*self.args)
+
+# MinHash 순열 대신 쓰는 해시 함수 (a * h + b) mod p의 계수 16쌍. 이름은 2행 x 8밴드, 설명은 4행 x 4밴드로 나눠 씀
+MINHASH_PRIME = (1 << 61) - 1
+MINHASH_PERMUTATIONS = tuple(
+    (int.from_bytes(digest[:8], "big") % (MINHASH_PRIME - 1) + 1, int.from_bytes(digest[8:], "big") % MINHASH_PRIME)
+    for digest in (hashlib.blake2b(f"esteria-minhash-{i}".encode(), digest_size=16).digest() for i in range(16)))
+NAME_BAND_ROWS = 2
+DESC_BAND_ROWS = 4
+
+def near_dup_name(name):
+    """유사 아이템 비교용 이름: 소문자로 바꾸고 공백과 기호를 뺍니다. (예: '나무 도끼!' -> '나무도끼')"""
+    return re.sub(r"[\W_]+", "", normalize_search_text(name))
+
+def description_shingles(value):
+    """설명의 단어 2-gram 해시 집합. 단어가 NEAR_DUP_MIN_DESC_WORDS개보다 적으면 빈 집합입니다."""
+    words = normalize_search_text(value).split()
+    if len(words) < NEAR_DUP_MIN_DESC_WORDS:
+        return frozenset()
+    return frozenset(map(hash, zip(words, words[1:])))
+
+def minhash(grams, cache):
+    """gram 목록의 MinHash 서명. gram마다 해시 함수를 적용한 값은 cache에 보관해 다시 계산하지 않습니다."""
+    vectors = []
+    for gram in grams:
+        vector = cache.get(gram)
+        if vector is None:
+            h = hash(gram)
+            vector = cache[gram] = tuple((a * h + b) % MINHASH_PRIME for a, b in MINHASH_PERMUTATIONS)
+        vectors.append(vector)
+    return tuple(map(min, zip(*vectors)))
+
+def similarity_keys(item, cache):
+    """아이템이 들어갈 LSH 버킷 키 목록
+
+    키에는 타입을 넣어 같은 타입끼리만 만나게 하고, 이름 키에는 이름 속 숫자도 넣어
+    '강철 검 1'과 '강철 검 2'처럼 번호만 다른 아이템은 후보가 되지 않게 합니다.
+    """
+    item_type = item.get("타입")
+    keys = []
+    name = near_dup_name(item.get("이름", ""))
+    if name:
+        digits = tuple(re.findall(r"\d+", name))
+        sig = minhash([name[i:i + 2] for i in range(len(name) - 1)] or [name], cache)
+        keys.extend(hash(("이름", band, item_type, digits, sig[band:band + NAME_BAND_ROWS]))
+                    for band in range(0, len(sig), NAME_BAND_ROWS))
+    shingles = description_shingles(item.get("설명", ""))
+    if shingles:
+        sig = minhash(shingles, cache)
+        keys.extend(hash(("설명", band, item_type, sig[band:band + DESC_BAND_ROWS]))
+                    for band in range(0, len(sig), DESC_BAND_ROWS))
+    return keys
+
+def near_dup_features(item):
+    """유사도 비교에 쓰는 (타입, 정규화한 이름, 이름 속 숫자, 설명 단어 2-gram 해시)
+
+    전체 보고서를 만들 때 아이템 수만큼 보관하므로 2-gram은 집합보다 작은 튜플로 둡니다.
+    """
+    name = near_dup_name(item.get("이름", ""))
+    return item.get("타입"), name, re.findall(r"\d+", name), tuple(description_shingles(item.get("설명", "")))
+
+def near_dup_score(a, b):
+    """near_dup_features() 두 개를 비교해 비슷하면 (유사도, 근거 필드), 아니면 None을 반환합니다.
+
+    타입이 다르면 비교하지 않고, 이름은 숫자가 모두 같을 때만 비교합니다.
+    """
+    type_a, name_a, digits_a, shingles_a = a
+    type_b, name_b, digits_b, shingles_b = b
+    if type_a != type_b:
+        return None
+    best = None
+    if name_a and name_b and digits_a == digits_b:
+        if name_a == name_b:
+            best = (1.0, "이름")
+        elif 2 * min(len(name_a), len(name_b)) >= NEAR_DUP_NAME_RATIO * (len(name_a) + len(name_b)):
+            # 길이만으로 기준에 못 미치는 쌍은 SequenceMatcher를 만들지 않고 거름 (real_quick_ratio와 같은 계산)
+            matcher = difflib.SequenceMatcher(None, name_a, name_b)
+            if matcher.quick_ratio() >= NEAR_DUP_NAME_RATIO:
+                ratio = matcher.ratio()
+                if ratio >= NEAR_DUP_NAME_RATIO:
+                    best = (ratio, "이름")
+    if shingles_a and shingles_b:
+        common = len(set(shingles_a).intersection(shingles_b))
+        ratio = common / (len(shingles_a) + len(shingles_b) - common)
+        if ratio >= NEAR_DUP_DESC_RATIO and (best is None or ratio > best[0]):
+            best = (ratio, "설명")
+    return best
+
+def near_duplicate_score(a, b):
+    """두 아이템이 비슷하면 (유사도, 근거 필드), 아니면 None을 반환합니다."""
+    return near_dup_score(near_dup_features(a), near_dup_features(b))
+
+def build_similarity_buckets(entries, cache):
+    """(아이템 id, 아이템) 목록으로 버킷 키 -> 아이템 id (여럿이면 list) dict를 만듭니다. 작업 스레드에서 실행해도 됩니다."""
+    buckets = {}
+    for item_id, item in entries:
+        for key in similarity_keys(item, cache):
+            ids = buckets.get(key)
+            if ids is None:
+                buckets[key] = item_id
+            elif type(ids) is int:
+                buckets[key] = [ids, item_id]
+            else:
+                ids.append(item_id)
+    return buckets
+
+def group_near_duplicates(pairs):
+    """(id, id, 유사도, 근거) 쌍 목록을 서로 이어진 아이템 묶음(id 목록)으로 모읍니다. 큰 묶음이 먼저 옵니다."""
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    for a, b, _, _ in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    groups = {}
+    for item_id in parent.keys() | {root for root in parent.values()}:
+        groups.setdefault(find(item_id), []).append(item_id)
+    return sorted((sorted(ids) for ids in groups.values()), key=lambda ids: (-len(ids), ids[0]))
+
+class SimilarityIndex:
+    """이름과 설명이 비슷한 아이템을 찾는 MinHash-LSH 색인
+
+    이름은 공백과 기호를 뺀 문자 2-gram, 설명은 단어 2-gram으로 MinHash 서명을 만들고
+    서명을 밴드로 나눠 버킷에 넣습니다. 밴드 하나라도 같은 아이템만 후보가 되므로 전체를 훑지 않고
+    비슷한 아이템을 찾으며, 후보는 near_duplicate_score()로 실제 유사도를 확인합니다.
+
+    아이템별 서명은 보관하지 않고 삭제·수정할 때 이전 아이템으로 키를 다시 계산합니다.
+    색인을 만들 때 쓴 gram별 해시 값은 버리고, 편집에 쓰는 값은 SIMILAR_CACHE_GRAMS개까지만 보관합니다.
+    build_async()와 변경 처리 방식은 SearchIndex와 같습니다.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.ready = False
+        self._pending = []
+        self._cache = {}
+        self._buckets = {}
+        self._builder = None
+        store.add_listener(self)
+
+    def _entries(self):
+        return [(self.store.id_at(row), self.store[row]) for row in range(len(self.store))]
+
+    def build(self):
+        """현재 store 전체로 색인을 만듭니다."""
+        self._cache = {}
+        self._buckets = build_similarity_buckets(self._entries(), {})
+        self._pending.clear()
+        self.ready = True
+
+    def build_async(self, on_ready=None):
+        """작업 스레드에서 색인을 만들고, 완성되면 UI 스레드에서 on_ready를 호출합니다."""
+        self.ready = False
+        self._pending.clear()
+        builder = _IndexBuilder(build_similarity_buckets, self._entries(), {})
+
+        def install():
+            if self._builder is not builder or self.ready: # wait_ready()에서 이미 적용함
+                return
+            self._cache = {}
+            self._buckets = builder.result
+            pending, self._pending = self._pending, []
+            self.ready = True
+            for handler, args in pending:
+                handler(*args)
+            if on_ready:
+                on_ready()
+
+        builder.finished.connect(install)
+        builder.finished.connect(builder.deleteLater)
+        builder.start()
+        self._builder = builder # 스레드 객체가 끝나기 전에 수거되지 않도록 보관
+        self._install = install
+
+    def wait_ready(self):
+        """작업 스레드에서 색인을 만드는 중이면 끝날 때까지 기다렸다가 바로 적용합니다."""
+        if not self.ready and self._builder is not None:
+            self._builder.wait()
+            self._install()
+
+    # --- 색인 갱신 ---
+    def _keys(self, item):
+        if len(self._cache) > SIMILAR_CACHE_GRAMS:
+            self._cache.clear()
+        return similarity_keys(item, self._cache)
+
+    def _add(self, item_id, item):
+        buckets = self._buckets
+        for key in self._keys(item):
+            ids = buckets.get(key)
+            if ids is None:
+                buckets[key] = item_id
+            elif type(ids) is int:
+                buckets[key] = [ids, item_id]
+            else:
+                ids.append(item_id)
+
+    def _discard(self, item_id, item):
+        buckets = self._buckets
+        for key in self._keys(item):
+            ids = buckets.get(key)
+            if ids == item_id:
+                del buckets[key]
+            elif type(ids) is list and item_id in ids:
+                ids.remove(item_id)
+
+    def _handle(self, handler, *args):
+        if self.ready:
+            handler(*args)
+        else:
+            self._pending.append((handler, args))
+
+    # --- ItemStore 리스너 ---
+    def inserted(self, row, item_id, item):
+        self._handle(self._add, item_id, item)
+
+    def replaced(self, row, item_id, old, new):
+        self._handle(self._discard, item_id, old)
+        self._handle(self._add, item_id, new)
+
+    def removed(self, row, item_id, item):
+        self._handle(self._discard, item_id, item)
+
+    def bulk_updated(self, replaced, removed, inserted):
+        for _, item_id, item in removed:
+            self._handle(self._discard, item_id, item)
+        for _, item_id, old, new in replaced:
+            self._handle(self._discard, item_id, old)
+            self._handle(self._add, item_id, new)
+        for _, item_id, item in inserted:
+            self._handle(self._add, item_id, item)
+
+    def extended(self, first, last):
+        for row in range(first, last + 1):
+            self._handle(self._add, self.store.id_at(row), self.store[row])
+
+    def cleared(self):
+        self._pending.clear()
+        self._buckets = {}
+
+    # --- 조회 ---
+    def _candidates(self, keys):
+        found = set()
+        for key in keys:
+            ids = self._buckets.get(key)
+            if ids is None:
+                continue
+            if type(ids) is int:
+                found.add(ids)
+            elif len(ids) <= NEAR_DUP_MAX_BUCKET:
+                found.update(ids)
+        return found
+
+    def similar(self, item, exclude=None, limit=5):
+        """item과 비슷한 아이템을 [(유사도, 근거 필드, 아이템 id)]로 반환합니다. 유사도가 높은 것이 먼저 옵니다."""
+        results = []
+        for item_id in self._candidates(self._keys(item)):
+            if item_id == exclude:
+                continue
+            score = near_duplicate_score(item, self.store.item(item_id))
+            if score:
+                results.append((score[0], score[1], item_id))
+        results.sort(key=lambda result: (-result[0], result[2]))
+        return results[:limit]
+
+    def duplicate_pairs(self):
+        """버킷을 함께 쓰는 아이템 쌍을 한 번씩만 확인해 [(id, id, 유사도, 근거 필드)]를 반환합니다."""
+        seen = set()
+        pairs = []
+        features = {}
+        item = self.store.item
+        for ids in self._buckets.values():
+            if type(ids) is int or len(ids) > NEAR_DUP_MAX_BUCKET:
+                continue
+            for i, a in enumerate(ids):
+                feature_a = features.get(a)
+                if feature_a is None:
+                    feature_a = features[a] = near_dup_features(item(a))
+                for b in ids[i + 1:]:
+                    pair = (a, b) if a < b else (b, a)
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                    feature_b = features.get(b)
+                    if feature_b is None:
+                        feature_b = features[b] = near_dup_features(item(b))
+                    score = near_dup_score(feature_a, feature_b)
+                    if score:
+                        pairs.append(pair + score)
+        return pairs
+
+def iter_json_array(f, chunk_size=64 * 1024, progress=None):
+    """바이너리 파일에서 최상위 JSON 배열의 원소를 하나씩 읽어 반환하는 제너레이터
+
+    파일 전체가 아니라 읽기 버퍼와 현재 원소만 메모리에 올리므로 수백 MB 파일도 일정한 메모리로 읽을 수 있습니다.
+    progress가 주어지면 지금까지 읽은 바이트 수로 호출합니다. 형식이 잘못되면 json.JSONDecodeError를 발생시킵니다.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    pos = 0
+    bytes_read = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, bytes_read, eof
+        chunk = f.read(chunk_size)
+        bytes_read += len(chunk)
+        if progress:
+            progress(bytes_read)
+        if not chunk:
+            eof = True
+            buf += text_decoder.decode(b"", final=True)
+        else:
+            buf += text_decoder.decode(chunk)
+        if pos > chunk_size:
+            buf = buf[pos:]
+            pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == "]":
+        return
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # 버퍼 끝에서 끝난 숫자 등은 잘렸을 수 있으므로 더 읽은 뒤 다시 해석
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            break
+        pos = end
+        yield value
+        skip_whitespace()
+        if pos >= len(buf):
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        if buf[pos] == "]":
+            return
+        if buf[pos] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        pos += 1
+
+class ItemLoader(QThread):
+    """저장소의 아이템을 작업 스레드에서 스트리밍으로 읽어 일정 개수씩 UI 스레드로 넘기는 로더"""
+    batch_loaded = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, storage, batch_size=LOAD_BATCH_SIZE, codec=None, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.batch_size = batch_size
+        self.codec = codec  # 주어지면 UI 스레드 대신 여기서 CompactItem으로 변환
+
+    def run(self):
+        total = self.storage.size()
+        bytes_read = 0
+
+        def on_progress(n):
+            nonlocal bytes_read
+            bytes_read = n
+
+        batch = []
+        pack = self.codec.pack if self.codec is not None else (lambda item: item)
+        try:
+            with PROFILER.span("load.read"):
+                for item in self.storage.iter_load(progress=on_progress):
+                    if self.isInterruptionRequested():
+                        return
+                    batch.append(pack(item))
+                    if len(batch) >= self.batch_size:
+                        self.batch_loaded.emit(batch)
+                        self.progress.emit(bytes_read, total)
+                        batch = []
+        except STORAGE_ERRORS as e:
+            self.failed.emit(str(e))
+            return
+        if batch:
+            self.batch_loaded.emit(batch)
+        self.progress.emit(total, total)
+
+def atomic_write_text(path, text):
+    """atomic_write_json()과 같은 방식으로 이미 만든 문자열을 기록합니다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def atomic_write_json(path, data):
+    """임시 파일에 기록하고 fsync한 뒤 원자적으로 교체하여, 저장 도중 종료되어도 파일이 깨지지 않게 합니다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class JsonItemStorage:
+    """items.json 파일 하나에 전체 아이템 목록을 저장하는 기본 저장 방식
+
+    저장은 snapshot()과 write() 두 단계로 나뉩니다. snapshot()은 UI 스레드에서 store.drain_changes()로 꺼낸
+    변경 내역과 함께 store의 현재 상태를 떠 두고, write()는 그 스냅샷만 사용하므로 백그라운드 스레드에서 실행해도 됩니다.
+    (아이템은 수정 시 새 dict로 교체되고 제자리에서 바뀌지 않으므로 목록의 얕은 복사로 충분합니다.)
+    """
+    def __init__(self, path=ITEMS_FILE):
+        self.path = path
+
+    def load(self):
+        """아이템 목록을 한 번에 읽습니다. 파일이 손상되었으면 json.JSONDecodeError를 그대로 전달합니다."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def iter_load(self, progress=None):
+        """아이템을 파일 앞에서부터 하나씩 읽어 반환합니다."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            yield from iter_json_array(f, progress=progress)
+
+    def size(self):
+        """진행률 표시에 쓸 전체 크기(바이트)"""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def replay(self, store):
+        """저장소 고유의 추가 기록을 store에 적용합니다. 기본 방식에는 없습니다."""
+
+    def snapshot(self, store, changes):
+        return store.to_list()
+
+    def write(self, snapshot):
+        atomic_write_json(self.path, snapshot)
+
+    def save(self, store):
+        """현재 스레드에서 바로 저장합니다."""
+        self.write(self.snapshot(store, store.drain_changes()))
+
+    def replace_all(self, items):
+        """저장된 내용을 items 목록으로 통째로 바꿉니다. (다른 저장 방식에서 옮겨 올 때 사용)"""
+        atomic_write_json(self.path, items)
+
+class JournalItemStorage(JsonItemStorage):
+    """변경분을 JSONL 저널에 추가만 하고, 저널이 커지면 items.json으로 병합(압축)하는 저장 방식
+
+    압축 시작 시 저널을 '.old'로 이름을 바꿔 두고 새 저널에 계속 기록합니다.
+    병합 중 프로그램이 종료되더라도 다음 실행 때 '.old' 저널부터 다시 적용하므로 변경 내역이 사라지지 않습니다.
+    """
+    def __init__(self, path=ITEMS_FILE, journal_path=JOURNAL_FILE, compact_bytes=JOURNAL_COMPACT_BYTES):
+        super().__init__(path)
+        self.journal_path = journal_path
+        self.compact_bytes = compact_bytes
+
+    def replay(self, store):
+        for path in (f"{self.journal_path}.old", self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        break # 기록 도중 종료되어 잘린 마지막 줄은 무시
+                    store.apply_change(change)
+
+    def snapshot(self, store, changes):
+        """(변경 내역, 병합할 전체 목록 또는 None)을 반환합니다. 저널이 임계 크기를 넘었을 때만 전체 목록을 뜹니다."""
+        needs_compaction = os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) >= self.compact_bytes
+        return changes, store.to_list() if needs_compaction else None
+
+    def write(self, snapshot):
+        changes, items = snapshot
+        if changes:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(c, ensure_ascii=False, default=json_default) + "\n" for c in changes))
+                f.flush()
+                os.fsync(f.fileno())
+        if items is not None:
+            self._compact(items)
+
+    def compact(self, store):
+        """저널을 즉시 items.json에 병합합니다."""
+        self.write((store.drain_changes(), store.to_list()))
+
+    def _compact(self, items):
+        old_path = f"{self.journal_path}.old"
+        if os.path.exists(self.journal_path):
+            if os.path.exists(old_path):
+                # 이전 병합이 끝나지 못했다면 '.old'를 덮어쓰지 않고 현재 저널을 뒤에 이어 붙입니다.
+                # (도중에 종료되어 같은 레코드가 두 번 적용되더라도 키 기준이라 결과는 같습니다.)
+                with open(self.journal_path, encoding="utf-8") as src, open(old_path, "a", encoding="utf-8") as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, old_path)
+        atomic_write_json(self.path, items)
+        if os.path.exists(old_path):
+            os.remove(old_path)
+
+    def replace_all(self, items):
+        atomic_write_json(self.path, items)
+        for path in (self.journal_path, f"{self.journal_path}.old"):
+            if os.path.exists(path):
+                os.remove(path)
+
+class SqliteItemStorage:
+    """SQLite 데이터베이스(WAL 모드)에 아이템을 한 행씩 저장하는 방식
+
+    (이름, 타입)에 고유 색인을 두고, 아이템 전체는 필드 순서가 유지되도록 JSON 문자열로 data 열에 저장합니다.
+    저장할 때는 store의 변경 내역만 한 트랜잭션으로 행 단위 업서트/삭제합니다.
+    로더와 저장 작업이 서로 다른 스레드에서 실행되므로 작업마다 연결을 새로 엽니다.
+    """
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS items ("
+                     "seq INTEGER PRIMARY KEY, name TEXT, type TEXT, data TEXT NOT NULL)")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS items_key ON items (name, type)")
+        return conn
+
+    def load(self):
+        return list(self.iter_load())
+
+    def iter_load(self, progress=None):
+        """아이템을 추가된 순서대로 하나씩 읽어 반환합니다. progress는 지금까지 읽은 행 수로 호출합니다."""
+        if not os.path.exists(self.path):
+            return
+        with closing(self._connect()) as conn:
+            for n, (data,) in enumerate(conn.execute("SELECT data FROM items ORDER BY seq"), start=1):
+                if progress and n % LOAD_BATCH_SIZE == 0:
+                    progress(n)
+                yield json.loads(data)
+
+    def size(self):
+        """진행률 표시에 쓸 전체 크기(행 수)"""
+        if not os.path.exists(self.path):
+            return 0
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def replay(self, store):
+        """데이터베이스에 바로 기록하므로 따로 적용할 내역이 없습니다."""
+
+    def snapshot(self, store, changes):
+        return changes
+
+    def write(self, changes):
+        if not changes:
+            return
+        with closing(self._connect()) as conn, conn:
+            for change in changes:
+                if change["op"] == "put":
+                    self._put(conn, change.get("key"), change["item"])
+                elif change["op"] == "del":
+                    conn.execute("DELETE FROM items WHERE name IS ? AND type IS ?", change["key"])
+
+    def _put(self, conn, old_key, item):
+        key = item_key(item)
+        if old_key and tuple(old_key) != key:
+            # 키가 바뀐 수정: 새 키를 가진 다른 행이 있으면 store와 같아지도록 먼저 지움
+            conn.execute("DELETE FROM items WHERE name IS ? AND type IS ?", key)
+        else:
+            old_key = key
+        data = json.dumps(item, ensure_ascii=False, default=json_default)
+        cursor = conn.execute("UPDATE items SET name = ?, type = ?, data = ? WHERE name IS ? AND type IS ?",
+                              (*key, data, *old_key))
+        if not cursor.rowcount:
+            conn.execute("INSERT INTO items (name, type, data) VALUES (?, ?, ?)", (*key, data))
+
+    def save(self, store):
+        """현재 스레드에서 바로 저장합니다."""
+        self.write(self.snapshot(store, store.drain_changes()))
+
+    def replace_all(self, items):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM items")
+            conn.executemany("INSERT INTO items (name, type, data) VALUES (?, ?, ?)",
+                             ((*item_key(item), json.dumps(item, ensure_ascii=False, default=json_default)) for item in items))
+
+def read_shard(path):
+    """샤드 파일 하나를 읽습니다. (프로세스 풀에서 실행되므로 모듈 최상위 함수)"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def same_items(a, b):
+    """두 아이템 목록이 같은지 비교합니다. 바뀌지 않은 아이템은 같은 객체이므로 대부분 is 비교로 끝납니다."""
+    return a is not None and len(a) == len(b) and all(x is y or x == y for x, y in zip(a, b))
+
+class ShardedItemStorage:
+    """타입별로 나눈 뒤 다시 조각(chunk) 파일로 나눈 폴더에 저장하는 방식
+
+    폴더의 manifest.json에 읽을 파일 순서가 적혀 있습니다. 파일 안에서는 타입별 순서가 유지되지만,
+    다시 읽으면 리스트가 타입별로 (처음 나온 순서대로) 묶입니다.
+    조각의 경계는 위치가 아니라 아이템 키의 해시로 정하므로 (평균 SHARD_CHUNK_ITEMS개, 최대 네 배) 아이템을
+    추가하거나 삭제해도 그 아이템이 든 조각만 바뀌고 뒤쪽 조각은 밀리지 않습니다.
+    저장할 때는 바뀐 조각만 내용 해시가 들어간 새 이름으로 쓰고, 마지막에 manifest.json을 원자적으로 교체한 뒤
+    더 이상 쓰지 않는 파일을 지웁니다. 도중에 종료되어도 manifest는 이전 조각 묶음이나 새 묶음 중 하나만 가리킵니다.
+    파일이 많고 크면 여러 프로세스에서 나눠 읽습니다. (JSON 해석은 GIL 때문에 스레드로는 빨라지지 않음)
+    """
+    MANIFEST = "manifest.json"
+
+    def __init__(self, path=SHARDS_DIR, chunk_items=SHARD_CHUNK_ITEMS):
+        self.path = path
+        self.chunk_items = chunk_items
+        self._written = None # 조각 -> (파일 이름, 파일에 기록되어 있는 아이템 목록) (모르면 None)
+
+    @staticmethod
+    def safe_name(item_type):
+        """파일 이름에 쓸 타입 이름. 파일 이름에 쓸 수 없는 타입 이름이면 바꾼 뒤 해시를 붙여 구분합니다."""
+        text = item_type if isinstance(item_type, str) else ""
+        safe = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", text).strip(" .")
+        if safe != item_type or safe.lower() == "manifest":
+            safe = f"{safe or '_'}~{hashlib.sha1(repr(item_type).encode('utf-8')).hexdigest()[:8]}"
+        return safe
+
+    @staticmethod
+    def parse_name(name):
+        """조각 파일 이름 '타입.조각.내용해시.json'에서 (타입, 조각)을 꺼냅니다. 형식이 다르면 None."""
+        parts = name[:-len(".json")].rsplit(".", 2) if name.endswith(".json") else []
+        return (parts[0], parts[1]) if len(parts) == 3 else None
+
+    def chunks(self, items):
+        """아이템을 (타입, 조각) -> 조각 목록으로 나눕니다. 순서는 타입이 처음 나온 순서, 그 안에서는 조각 순서입니다.
+
+        키 해시가 chunk_items로 나누어떨어지는 아이템에서 조각을 끝내고, 그 키 해시를 조각 이름으로 씁니다.
+        """
+        by_type = {}
+        for item in items:
+            by_type.setdefault(item.get("타입"), []).append(item)
+        chunks = {}
+        for item_type, typed in by_type.items():
+            safe = self.safe_name(item_type)
+            current = []
+            for item in typed:
+                current.append(item)
+                key_hash = zlib.crc32(f"{item.get('이름')}\x1f{item_type}".encode("utf-8"))
+                if key_hash % self.chunk_items == 0 or len(current) >= 4 * self.chunk_items:
+                    slot, n = f"{key_hash:08x}", 1
+                    while (safe, slot) in chunks: # 키가 중복된 아이템
+                        slot, n = f"{key_hash:08x}-{n}", n + 1
+                    chunks[safe, slot] = current
+                    current = []
+            if current:
+                chunks[safe, "tail"] = current
+        return chunks
+
+    def ordered(self, items):
+        """items를 저장한 뒤 다시 읽었을 때의 순서"""
+        return [item for chunk in self.chunks(items).values() for item in chunk]
+
+    def _files(self):
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return []
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)["files"]
+
+    def load(self):
+        return list(self.iter_load())
+
+    def iter_load(self, progress=None):
+        """샤드 파일을 manifest 순서대로 읽어 아이템을 하나씩 반환합니다. progress는 다 읽은 파일의 바이트 합으로 호출합니다."""
+        paths = [os.path.join(self.path, name) for name in self._files()]
+        sizes = [os.path.getsize(path) for path in paths]
+        executor = None
+        workers = min(len(paths), os.cpu_count() or 1)
+        if workers > 1 and sum(sizes) >= SHARD_PARALLEL_MIN_BYTES:
+            # 프로그램 시작을 늦추지 않도록 필요할 때만 불러옴
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Qt 스레드가 떠 있는 프로세스를 fork하면 교착될 수 있으므로 spawn 사용
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+            results = executor.map(read_shard, paths)
+        else:
+            results = map(read_shard, paths)
+        done = 0
+        try:
+            for size, items in zip(sizes, results):
+                done += size
+                if progress:
+                    progress(done)
+                yield from items
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def size(self):
+        """진행률 표시에 쓸 전체 크기(바이트)"""
+        return sum(os.path.getsize(os.path.join(self.path, name)) for name in self._files())
+
+    def replay(self, store):
+        """불러온 내용을 파일에 기록된 상태로 기억해 두어, 다음 저장 때 바뀐 조각만 고를 수 있게 합니다.
+
+        파일 목록이 지금 방식으로 나눈 조각과 맞지 않으면 (이전 형식 등) 다음 저장 때 모두 다시 씁니다.
+        """
+        files = self._files()
+        chunks = self.chunks(store)
+        if [self.parse_name(name) for name in files] == list(chunks):
+            self._written = {slot: (name, chunk) for (slot, chunk), name in zip(chunks.items(), files)}
+        else:
+            self._written = None
+
+    def snapshot(self, store, changes):
+        """(전체 조각, 다시 써야 할 조각)을 반환합니다. 바뀐 내용이 없으면 None."""
+        if not changes and self._written is not None:
+            return None
+        chunks = self.chunks(store)
+        written = self._written or {}
+        return chunks, {slot: chunk for slot, chunk in chunks.items()
+                        if slot not in written or not same_items(written[slot][1], chunk)}
+
+    def write(self, snapshot):
+        if snapshot is None:
+            return
+        chunks, dirty = snapshot
+        written = self._written or {}
+        os.makedirs(self.path, exist_ok=True)
+        files = {}
+        for slot, chunk in chunks.items():
+            if slot not in dirty:
+                files[slot] = written[slot]
+                continue
+            # 지금 manifest가 가리키는 파일은 덮어쓰지 않도록 내용 해시를 붙인 새 이름으로 씀
+            text = json.dumps(chunk, ensure_ascii=False, indent=2, default=json_default)
+            name = f"{slot[0]}.{slot[1]}.{hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]}.json"
+            atomic_write_text(os.path.join(self.path, name), text)
+            files[slot] = (name, chunk)
+        names = [name for name, _ in files.values()]
+        if names != self._files():
+            atomic_write_json(os.path.join(self.path, self.MANIFEST), {"chunk_items": self.chunk_items, "files": names})
+        self._written = files
+        # manifest를 바꾼 뒤에 목록에서 빠진 파일 (이전 조각, 도중에 종료되어 남은 파일)을 지움
+        keep = set(names) | {self.MANIFEST}
+        for name in os.listdir(self.path):
+            if name.endswith((".json", ".tmp")) and name not in keep:
+                os.remove(os.path.join(self.path, name))
+
+    def save(self, store):
+        """현재 스레드에서 바로 저장합니다."""
+        self.write(self.snapshot(store, store.drain_changes()))
+
+    def replace_all(self, items):
+        self._written = None
+        chunks = self.chunks(items)
+        self.write((chunks, chunks))
+
+def default_storage_path(mode, items_path=ITEMS_FILE):
+    """아이템 파일 경로에 대응하는 저장 방식별 경로 (기본 items.json이면 방식별 기본 파일)"""
+    if mode == "sqlite":
+        return SQLITE_FILE if items_path == ITEMS_FILE else os.path.splitext(items_path)[0] + ".db"
+    if mode == "sharded":
+        return SHARDS_DIR if items_path == ITEMS_FILE else os.path.splitext(items_path)[0] + ".shards"
+    return items_path
+
+def create_storage(mode=None, path=ITEMS_FILE):
+    """저장 방식 이름에 맞는 저장소 객체를 만듭니다. path가 기본 items.json이면 방식별 기본 경로를, 아니면 path를 그대로 씁니다."""
+    mode = mode or STORAGE_MODE
+    if mode == "journal":
+        journal_path = JOURNAL_FILE if path == ITEMS_FILE else os.path.splitext(path)[0] + ".journal.jsonl"
+        return JournalItemStorage(path, journal_path)
+    if mode == "sqlite":
+        return SqliteItemStorage(default_storage_path(mode) if path == ITEMS_FILE else path)
+    if mode == "sharded":
+        return ShardedItemStorage(default_storage_path(mode) if path == ITEMS_FILE else path)
+    return JsonItemStorage(path)
+
+class _SaveSignals(QObject):
+    """QRunnable은 시그널을 가질 수 없으므로 저장 결과를 전달할 QObject (기록한 변경 내역을 함께 전달)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str, object)
+
+class _SaveTask(QRunnable):
+    """스냅샷을 백그라운드 스레드에서 저장소에 기록하는 작업"""
+    def __init__(self, storage, snapshot, changes, signals):
+        super().__init__()
+        self.storage = storage
+        self.snapshot = snapshot
+        self.changes = changes
+        self.signals = signals
+
+    def run(self):
+        try:
+            with PROFILER.span("save.write"):
+                self.storage.write(self.snapshot)
+        except Exception as e:
+            self.signals.failed.emit(str(e), self.changes)
+        else:
+            self.signals.finished.emit(self.changes)
+
+class SaveScheduler(QObject):
+    """짧은 간격으로 들어온 편집을 모아 백그라운드 스레드에서 한 번에 저장하는 스케줄러
+
+    기록은 한 번에 하나씩만 진행하므로 기록 순서가 편집 순서와 항상 같습니다.
+    기록에 실패하면 꺼냈던 변경 내역을 store에 되돌려 놓아, 다음 저장(또는 창을 닫을 때의 flush)에서 다시 기록합니다.
+    """
+    pending = pyqtSignal()
+    written = pyqtSignal() # 기록 한 번이 끝날 때마다 (남은 저장이 있어도)
+    saved = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, storage, store, delay_ms=SAVE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.store = store
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._on_timeout)
+        self._held = False
+        self._deferred = False # 잠겨 있거나 이전 기록이 끝나지 않아 시작하지 못한 저장이 있음
+        self._retry = False # 마지막 기록이 실패해 되돌려 놓은 변경 내역이 있음
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._in_flight = 0
+        self.stored = {} # 저장소에 마지막으로 기록한 상태 (이름, 타입) -> 아이템. 밖에서 바뀐 파일과 비교할 기준
+        self._signals = _SaveSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def has_pending(self):
+        return self._timer.isActive() or self._deferred or self._retry or self._in_flight > 0
+
+    def is_writing(self):
+        return self._in_flight > 0
+
+    def remember_stored(self, items):
+        """저장소에 기록되어 있는 아이템 목록을 기준 상태로 기억합니다. (불러온 직후, 밖에서 바뀐 파일을 적용한 직후)"""
+        self.stored = _first_by_key(items)
+
+    def schedule(self):
+        """저장을 예약합니다. 이미 예약되어 있으면 대기 시간을 다시 시작합니다."""
+        self._timer.start()
+        self.pending.emit()
+
+    def hold(self):
+        """release()를 부를 때까지 예약된 저장을 시작하지 않습니다. (외부 변경을 읽는 동안 파일을 덮어쓰지 않도록)"""
+        self._held = True
+
+    def release(self):
+        self._held = False
+        if self._deferred:
+            self._deferred = False
+            self._timer.start()
+
+    def _on_timeout(self):
+        # 앞선 기록이 실패하면 그 내역을 새 내역보다 먼저 되돌려 놓아야 하므로 기록 중에는 시작하지 않음
+        if self._held or self._in_flight:
+            self._deferred = True
+        else:
+            self._start_write()
+
+    def _start_write(self):
+        self._in_flight += 1
+        self._retry = False
+        with PROFILER.span("save.snapshot"):
+            changes = self.store.drain_changes()
+            snapshot = self.storage.snapshot(self.store, changes)
+        self._pool.start(_SaveTask(self.storage, snapshot, changes, self._signals))
+
+    def _wait(self):
+        self._pool.waitForDone()
+        # 대기 중인 완료/실패 슬롯 호출 처리 (PyQt는 메서드 연결을 별도 프록시 객체로 전달하므로 대상을 지정하지 않음)
+        QApplication.sendPostedEvents()
+
+    def flush(self):
+        """예약된 저장(실패해 되돌려 놓은 내역 포함)을 즉시 시작하고 모든 기록이 끝날 때까지 기다립니다."""
+        start = self._timer.isActive() or self._deferred
+        self._timer.stop()
+        self._deferred = False
+        self._wait()
+        if start or self._retry:
+            self._start_write()
+            self._wait()
+
+    def _resume(self):
+        if self._deferred and not self._held:
+            self._deferred = False
+            self._timer.start()
+
+    def _on_finished(self, changes):
+        self._in_flight -= 1
+        for change in changes:
+            apply_change_to_map(self.stored, change)
+        self.written.emit()
+        self._resume()
+        if not self.has_pending():
+            self.saved.emit()
+
+    def _on_failed(self, error, changes):
+        self._in_flight -= 1
+        self.store.requeue_changes(changes)
+        self._retry = True
+        self._resume()
+        self.failed.emit(error)
+
+def file_signature(path):
+    """파일 변경 여부를 판단하는 (수정 시각, 크기). 파일이 없으면 None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class ExternalChangeWatcher(QObject):
+    """편집기 밖에서 바뀐 파일을 감지해 changed(경로)로 알리는 감시자
+
+    임시 파일에 쓴 뒤 교체하는 방식으로 저장하면 감시 대상 파일이 사라지므로 폴더도 함께 감시하고,
+    파일이 다시 생기면 감시 목록에 다시 추가합니다. 알림은 WATCH_DELAY_MS 동안 모아서 한 번만 보내며,
+    (수정 시각, 크기)가 마지막으로 확인한 값과 같으면 보내지 않습니다.
+    편집기가 직접 저장한 뒤에는 remember()로 새 값을 기록해 두어 자기 저장을 외부 변경으로 착각하지 않게 합니다.
+    busy()가 True인 동안(저장 중)에는 확인을 미룹니다.
+    """
+    changed = pyqtSignal(str)
+
+    def __init__(self, paths, busy=None, delay_ms=WATCH_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.busy = busy or (lambda: False)
+        self._known = {path: file_signature(path) for path in self.paths}
+        self._timers = {}
+        for path in self.paths:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(delay_ms)
+            timer.timeout.connect(lambda path=path: self._check(path))
+            self._timers[path] = timer
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watch()
+
+    def _watch(self):
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        wanted = [path for path in self.paths if os.path.exists(path)]
+        wanted += {os.path.dirname(path) for path in self.paths}
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def remember(self, path):
+        """편집기가 직접 쓴 파일의 현재 상태를 기록합니다."""
+        path = os.path.abspath(path)
+        if path in self._known:
+            self._known[path] = file_signature(path)
+
+    def _on_file_changed(self, path):
+        self._watch()
+        if path in self._timers:
+            self._timers[path].start()
+
+    def _on_directory_changed(self, directory):
+        self._watch()
+        for path in self.paths:
+            if directory in (path, os.path.dirname(path)): # 폴더 저장소(샤드)는 폴더 자체를 감시
+                self._timers[path].start()
+
+    def _check(self, path):
+        if self.busy():
+            self._timers[path].start()
+            return
+        signature = file_signature(path)
+        if signature is None or signature == self._known[path]:
+            return
+        self._known[path] = signature
+        self.changed.emit(path)
+
+class ItemExporter(QThread):
+    """아이템 목록을 작업 스레드에서 파일로 내보냅니다.
+
+    아이템을 하나씩 문자열로 바꿔 바로 파일에 쓰므로 목록 크기와 관계없이 메모리 사용량이 일정합니다.
+    임시 파일에 쓴 뒤 교체하며, 취소하거나 실패하면 임시 파일을 지우고 원래 파일은 그대로 둡니다.
+    """
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, items, path, fmt, schema, parent=None):
+        super().__init__(parent)
+        self.items = items
+        self.path = path
+        self.fmt = fmt
+        self.schema = schema
+
+    def _counted(self):
+        """아이템을 그대로 넘기면서 진행률을 알리고, 취소되면 멈춥니다."""
+        total = len(self.items)
+        for n, item in enumerate(self.items, start=1):
+            if self.isInterruptionRequested():
+                return
+            yield item
+            if n % EXPORT_PROGRESS_EVERY == 0:
+                self.progress.emit(n, total)
+
+    def run(self):
+        tmp_path = f"{self.path}.tmp"
+        # CSV는 엑셀에서 한글이 깨지지 않도록 BOM을 붙임 (가져오기도 utf-8-sig로 읽음)
+        encoding = "utf-8-sig" if self.fmt == "csv" else "utf-8"
+        try:
+            with PROFILER.span("export"), open(tmp_path, "w", encoding=encoding, newline="") as f:
+                for chunk in iter_export_chunks(self._counted(), self.fmt, self.schema):
+                    f.write(chunk)
+            if self.isInterruptionRequested():
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.failed.emit(str(e))
+            return
+        self.progress.emit(len(self.items), len(self.items))
+        self.done.emit(len(self.items))
+
+class _StorageReader(QThread):
+    """저장소 전체를 작업 스레드에서 ItemStore로 읽습니다. (외부 변경 반영용)"""
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, storage, codec=None, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.codec = codec
+
+    def run(self):
+        try:
+            self.done.emit(read_storage(self.storage, self.codec))
+        except (OSError, *STORAGE_ERRORS) as e:
+            self.failed.emit(str(e))
+
+FieldSpec = namedtuple("FieldSpec", ["name", "options", "option_set", "tooltip"])
+
+class ConfigSchema:
+    """config.json을 한 번 해석해 둔 변경 불가능한 스키마
+
+    타입별 폼 필드 순서, 상세 보기 표시 순서('설명'은 마지막), 옵션 목록(frozenset)을 미리 계산해 두므로
+    폼을 만들거나 아이템을 선택할 때마다 '공통'과 타입 섹션을 다시 합칠 필요가 없습니다.
+    """
+    __slots__ = ("types", "common_fields", "_common", "_sections", "_field_order", "_display_order", "_fields", "_rules")
+
+    def __init__(self, config):
+        def specs(section):
+            return MappingProxyType({
+                key: FieldSpec(key, tuple(data.get("options", [])), frozenset(
+                    o for o in data.get("options", []) if isinstance(o, str)), data.get("tooltip", ""))
+                for key, data in section.items() if isinstance(data, dict)
+            })
+
+        common = specs(config.get("공통", {}))
+        types = tuple(name for name in config.keys() if name != "공통")
+        sections = {name: specs(config.get(name, {})) for name in types}
+        field_order, display_order, fields = {}, {}, {}
+        for name in types:
+            section = sections[name]
+            # 폼: '공통' 필드를 먼저, 그 다음 타입 전용 필드 ('타입'은 폼에서 사용하지 않음)
+            field_order[name] = tuple([key for key in common if key != "타입"] +
+                                      [key for key in section if key != "타입" and key not in common])
+            # 상세 보기: '공통'(설명 제외) -> 타입 필드 -> '설명'
+            order = [key for key in common if key != "설명"]
+            order += [key for key in section if key not in order]
+            if "설명" in common and "설명" not in order:
+                order.append("설명")
+            display_order[name] = tuple(order)
+            # 검증: 타입 섹션의 정의가 '공통'보다 우선
+            merged = dict(common)
+            merged.update(section)
+            fields[name] = MappingProxyType(merged)
+        # 검증 규칙: 타입 -> 필드 -> 허용 값 집합 (옵션이 없으면 None). 작업 프로세스로 보낼 수 있도록 일반 dict로 둠
+        # None 키에는 config에 없는 타입의 아이템을 검사할 '공통' 필드 규칙을 둠
+        rules = {name: {key: spec.option_set if spec.options else None for key, spec in merged.items()}
+                 for name, merged in fields.items()}
+        rules[None] = {key: spec.option_set if spec.options else None for key, spec in common.items()}
+        set_ = object.__setattr__
+        set_(self, "types", types)
+        set_(self, "common_fields", tuple(common))
+        set_(self, "_common", common)
+        set_(self, "_sections", MappingProxyType(sections))
+        set_(self, "_field_order", MappingProxyType(field_order))
+        set_(self, "_display_order", MappingProxyType(display_order))
+        set_(self, "_fields", MappingProxyType(fields))
+        set_(self, "_rules", rules)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSchema는 변경할 수 없습니다.")
+
+    def has_type(self, item_type):
+        return item_type in self._fields
+
+    def field_order(self, item_type):
+        """폼에 표시할 필드 이름 순서"""
+        return self._field_order.get(item_type, ())
+
+    def display_order(self, item_type):
+        """상세 보기에 표시할 필드 이름 순서 ('설명'이 마지막)"""
+        if item_type in self._display_order:
+            return self._display_order[item_type]
+        return tuple(key for key in self._common if key != "설명") + (("설명",) if "설명" in self._common else ())
+
+    def form_field(self, item_type, key):
+        """폼 위젯을 만들 때 쓰는 필드 정의. '공통' 필드는 '공통' 섹션의 정의를 사용합니다."""
+        if key in self._common:
+            return self._common[key]
+        return self._sections[item_type][key]
+
+    def field(self, item_type, key):
+        """검증에 쓰는 필드 정의 (타입 섹션 우선). 정의되지 않은 필드면 None."""
+        fields = self._fields.get(item_type)
+        return fields.get(key) if fields is not None else self._common.get(key)
+
+    def validation_rules(self):
+        """check_item()에 넘기는 검증 규칙. 여러 곳에서 함께 쓰므로 수정하면 안 됩니다."""
+        return self._rules
+
+    def section_fields(self, item_type):
+        """타입 섹션에만 정의된 필드 정의"""
+        return self._sections.get(item_type, MappingProxyType({}))
+
+    def option_values(self):
+        """옵션 목록에 나오는 모든 문자열 값의 집합"""
+        values = set()
+        for section in (self._common, *self._sections.values()):
+            for spec in section.values():
+                values |= spec.option_set
+        return frozenset(values)
+
+    def exact_fields(self):
+        """옵션 목록이 있는 필드 이름 집합"""
+        names = {key for key, spec in self._common.items() if spec.options}
+        for section in self._sections.values():
+            names.update(key for key, spec in section.items() if spec.options)
+        return frozenset(names)
+
+def find_config_typos(config, valid_keys=("options", "tooltip")):
+    """config에서 유효한 키와 비슷하지만 다른 키를 찾아 [(경로, 키, 제안), ...]를 반환합니다.
+
+    경로는 키가 들어 있는 dict까지의 키 목록입니다. 하위 dict를 먼저 살피는 순서는 기존 훈수 기능과 같습니다.
+    """
+    typos = []
+
+    def walk(data_dict, path):
+        for key in list(data_dict.keys()):
+            if isinstance(data_dict[key], dict):
+                walk(data_dict[key], path + [key])
+            matches = difflib.get_close_matches(key, valid_keys, n=1, cutoff=0.7)
+            if matches and key != matches[0]:
+                typos.append((path, key, matches[0]))
+
+    walk(config, [])
+    return typos
+
+def cached_config_typos(config, config_path=CONFIG_FILE, cache_path=CONFIG_CHECK_CACHE):
+    """config 파일 내용의 해시를 키로 오타 분석 결과를 디스크에 캐시합니다. 파일이 그대로면 difflib 분석을 건너뜁니다."""
+    try:
+        with open(config_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return find_config_typos(config)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("sha256") == digest:
+            return [tuple(typo) for typo in cached["typos"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    typos = find_config_typos(config)
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"sha256": digest, "typos": typos}, f, ensure_ascii=False)
+    except OSError:
+        pass # 캐시를 쓰지 못해도 분석 결과는 그대로 사용
+    return typos
+
+def check_item(item, rules):
+    """ConfigSchema.validation_rules()로 아이템 하나를 검증합니다. 반환 형식은 validate_item()과 같습니다."""
+    problems = []
+    item_type = item.get("타입")
+    if not item.get("이름"):
+        problems.append(("error", "이름", "이름은 필수 입력 항목입니다."))
+    fields = rules.get(item_type) if isinstance(item_type, str) else None
+    known_type = fields is not None
+    if not known_type:
+        problems.append(("error", "타입", f"config에 없는 타입입니다: {item_type!r}"))
+        fields = rules[None] # 타입 전용 필드는 알 수 없으므로 '공통' 필드만 검사
+    for key, value in item.items():
+        if key == "타입":
+            continue
+        if key not in fields:
+            if known_type:
+                problems.append(("error", key, "config에 정의되지 않은 필드입니다."))
+            continue
+        options = fields[key]
+        if options is not None and (not isinstance(value, str) or value not in options):
+            problems.append(("warning", key, f"옵션 목록에 없는 값입니다: {value!r}"))
+    return problems
+
+def validate_chunk(rules, items):
+    """아이템 목록을 검증해 문제가 있는 것만 [(목록 안의 순번, 문제 목록)]으로 반환합니다. (작업 프로세스에서 실행)"""
+    results = []
+    for i, item in enumerate(items):
+        problems = check_item(item, rules)
+        if problems:
+            results.append((i, problems))
+    return results
+
+def validate_catalog(items, rules, workers=1):
+    """아이템 목록 전체를 검증해 {순번: 문제 목록}을 반환합니다.
+
+    VALIDATE_CHUNK_ITEMS개씩 나눠 검증하고, workers가 2 이상이면 청크를 프로세스 풀에서 동시에 검증합니다.
+    지금 규칙은 아이템 하나를 검사하는 것보다 다른 프로세스로 보내는(pickle) 비용이 커서 기본값은 1입니다.
+    """
+    starts = range(0, len(items), VALIDATE_CHUNK_ITEMS)
+    chunks = [items[start:start + VALIDATE_CHUNK_ITEMS] for start in starts]
+    workers = min(len(chunks), workers)
+    if workers > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Qt 스레드가 떠 있는 프로세스를 fork하면 교착될 수 있으므로 spawn 사용
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(validate_chunk, [rules] * len(chunks), chunks))
+    else:
+        results = [validate_chunk(rules, chunk) for chunk in chunks]
+    problems = {}
+    for start, found in zip(starts, results):
+        for i, item_problems in found:
+            problems[start + i] = item_problems
+    return problems
+
+def problem_badge(problems):
+    """리스트에 붙일 검증 결과 표시 (예: '⛔2 ⚠1'). 문제가 없으면 빈 문자열"""
+    errors = sum(1 for level, _, _ in problems if level == "error")
+    warnings = len(problems) - errors
+    return " ".join(badge for badge in (f"⛔{errors}" if errors else "", f"⚠{warnings}" if warnings else "") if badge)
+
+class ItemValidator:
+    """store 전체의 검증 결과를 보관하고, 편집된 아이템만 다시 검증하는 리스너
+
+    처음에는 build_async()로 전체를 작업 스레드에서 검증하고, 그 뒤로는 추가·수정된 아이템만 check_item()으로 다시 검사합니다. 변경 처리 방식은 SearchIndex와 같습니다.
+    오류·경고 수는 전체와 필드별로 바로 갱신하므로 요약을 보여줄 때 목록을 다시 훑지 않습니다.
+    """
+    def __init__(self, store, rules, on_change=None):
+        self.store = store
+        self.rules = rules
+        self.on_change = on_change
+        self.ready = False
+        self._pending = []
+        self._reset()
+        store.add_listener(self)
+
+    def _reset(self):
+        self.problems = {}      # 아이템 id -> 문제 목록 (문제가 있는 아이템만)
+        self.errors = 0
+        self.warnings = 0
+        self.field_counts = {}  # 필드 -> [오류 수, 경고 수]
+
+    def build(self):
+        """현재 store 전체를 검증합니다."""
+        ids = [self.store.id_at(row) for row in range(len(self.store))]
+        self._install(ids, validate_catalog(self.store.to_list(), self.rules))
+        self._pending.clear()
+        self.ready = True
+
+    def build_async(self, on_ready=None):
+        """작업 스레드에서 전체를 검증하고, 끝나면 UI 스레드에서 on_ready를 호출합니다."""
+        self.ready = False
+        self._pending.clear()
+        ids = [self.store.id_at(row) for row in range(len(self.store))]
+        builder = _IndexBuilder(validate_catalog, self.store.to_list(), self.rules)
+
+        def install():
+            if self._builder is not builder: # 그 사이에 규칙이 바뀌어 다시 검증을 시작함
+                return
+            self._install(ids, builder.result)
+            pending, self._pending = self._pending, []
+            self.ready = True
+            for handler, args in pending:
+                handler(*args)
+            if on_ready:
+                on_ready()
+
+        builder.finished.connect(install)
+        builder.finished.connect(builder.deleteLater)
+        builder.start()
+        self._builder = builder # 스레드 객체가 끝나기 전에 수거되지 않도록 보관
+
+    def _install(self, ids, found):
+        self._reset()
+        for i, problems in found.items():
+            self._set(ids[i], problems)
+
+    def _count(self, problems, sign):
+        for level, field, _ in problems:
+            counts = self.field_counts.setdefault(field, [0, 0])
+            if level == "error":
+                self.errors += sign
+                counts[0] += sign
+            else:
+                self.warnings += sign
+                counts[1] += sign
+            if counts == [0, 0]:
+                del self.field_counts[field]
+
+    def _set(self, item_id, problems):
+        self._count(self.problems.pop(item_id, ()), -1)
+        if problems:
+            self.problems[item_id] = problems
+            self._count(problems, 1)
+
+    def _check(self, item_id, item):
+        self._set(item_id, check_item(item, self.rules))
+
+    def _discard(self, item_id):
+        self._set(item_id, ())
+
+    def _handle(self, handler, *args):
+        if self.ready:
+            handler(*args)
+        else:
+            self._pending.append((handler, args))
+
+    def _notify(self):
+        if self.ready and self.on_change:
+            self.on_change()
+
+    # --- ItemStore 리스너 ---
+    def inserted(self, row, item_id, item):
+        self._handle(self._check, item_id, item)
+        self._notify()
+
+    def replaced(self, row, item_id, old, new):
+        self._handle(self._check, item_id, new)
+        self._notify()
+
+    def removed(self, row, item_id, item):
+        self._handle(self._discard, item_id)
+        self._notify()
+
+    def bulk_updated(self, replaced, removed, inserted):
+        for _, item_id, _ in removed:
+            self._handle(self._discard, item_id)
+        for _, item_id, _, new in replaced:
+            self._handle(self._check, item_id, new)
+        for _, item_id, item in inserted:
+            self._handle(self._check, item_id, item)
+        self._notify()
+
+    def extended(self, first, last):
+        for row in range(first, last + 1):
+            self._handle(self._check, self.store.id_at(row), self.store[row])
+        self._notify()
+
+    def cleared(self):
+        self._pending.clear()
+        self._reset()
+        self._notify()
+
+    # --- 조회 ---
+    def problems_of(self, item_id):
+        return self.problems.get(item_id, ())
+
+    def summary(self):
+        """'오류 N개, 경고 M개 (아이템 K개)' 형식의 요약"""
+        if not self.problems:
+            return "문제 없음"
+        return f"오류 {self.errors}개, 경고 {self.warnings}개 (아이템 {len(self.problems)}개)"
+
+    def field_summary(self):
+        """필드별 오류·경고 수를 한 줄씩 적은 텍스트 (문제가 많은 필드부터)"""
+        rows = sorted(self.field_counts.items(), key=lambda entry: (-entry[1][0], -entry[1][1], entry[0]))
+        return "\n".join(f"{field}: 오류 {errors}, 경고 {warnings}" for field, (errors, warnings) in rows)
+
+# 테마 스타일시트는 한 번만 만들어 두고 전환할 때는 문자열만 바꿔 끼움
+DARK_STYLESHEET = """
+    QWidget { background-color: #2b2b2b; font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; font-size: 10pt; color: #e0e0e0; }
+    QTabWidget::pane { border: 1px solid #505050; border-top-left-radius: 6px; border-top-right-radius: 6px; background-color: #3c3c3c; }
+    QTabBar::tab { background: #4a4a4a; border: 1px solid #505050; border-bottom: none; border-top-left-radius: 4px; border-top-right-radius: 4px; padding: 8px 15px; margin-right: 2px; color: #cccccc; }
+    QTabBar::tab:selected { background: #3c3c3c; border-color: #505050; border-bottom-color: #3c3c3c; font-weight: bold; color: #ffffff; }
+    QLabel { padding: 2px 0; color: #e0e0e0; }
+    QLabel#status_label { font-size: 10pt; font-weight: bold; padding: 5px; color: #28a745; }
+    QLabel#profile_label { font-family: Consolas, monospace; font-size: 8pt; color: #8a8a8a; padding: 5px; }
+    QLabel#similar_label { color: #f0ad4e; padding: 2px; }
+    QLabel#validation_label { color: #aaaaaa; padding: 2px; }
+    QLineEdit, QTextEdit, QComboBox { background-color: #4a4a4a; border: 1px solid #606060; border-radius: 4px; padding: 6px 8px; color: #ffffff; selection-background-color: #6699ff; }
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus { border: 1px solid #88bbee; }
+    QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left-width: 1px; border-left-color: #606060; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }
+    QComboBox::down-arrow { image: url(data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAABAAAAAQBAMAAADt3eJSAAAAMFBMVEVHcEz///////////////////////////////////////////////////////////9EPuwCAAAAD3RSTlMAAQIDBAUGBwgJCgsMDQ4PEBESgSPQZwAAADFJREFUCNdjYHBgYGBgYhBTAwMDIxMTgwYDEwMDYxMDAyYDJgYGBiYogwYGBgAARkYECvABa/4AAAAASUVORK5CYII=); }
+    QPushButton { background-color: #5a8be0; color: white; border: none; border-radius: 5px; padding: 8px 15px; font-weight: bold; }
+    QPushButton:hover { background-color: #4a7ad0; }
+    QPushButton:pressed { background-color: #3a69c0; }
+    QPushButton#delete_btn { background-color: #cc4d4d; }
+    QPushButton#delete_btn:hover { background-color: #bb3d3d; }
+    QPushButton#delete_btn:pressed { background-color: #aa2d2d; }
+    QListView { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 4px; padding: 5px; color: #e0e0e0; }
+    QListView::item { padding: 5px; border-bottom: 1px solid #4a4a4a; }
+    QListView::item:selected { background-color: #4f6e9f; color: #ffffff; border-radius: 3px; }
+    QScrollArea { border: 1px solid #505050; border-radius: 6px; background-color: #3c3c3c; }
+    QScrollBar:vertical { border: none; background: #4a4a4a; width: 8px; margin: 0px; border-radius: 4px; }
+    QScrollBar::handle:vertical { background: #707070; min-height: 20px; border-radius: 4px; }
+"""
+LIGHT_STYLESHEET = """
+    QWidget { background-color: #f7f9fc; font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; font-size: 10pt; color: #333333; }
+    QTabWidget::pane { border: 1px solid #e0e0e0; border-top-left-radius: 6px; border-top-right-radius: 6px; background-color: #ffffff; }
+    QTabBar::tab { background: #e0e0e0; border: 1px solid #e0e0e0; border-bottom: none; border-top-left-radius: 4px; border-top-right-radius: 4px; padding: 8px 15px; margin-right: 2px; color: #555555; }
+    QTabBar::tab:selected { background: #ffffff; border-color: #e0e0e0; border-bottom-color: #ffffff; font-weight: bold; color: #333333; }
+    QLabel { padding: 2px 0; }
+    QLabel#status_label { font-size: 10pt; font-weight: bold; padding: 5px; color: #28a745; }
+    QLabel#profile_label { font-family: Consolas, monospace; font-size: 8pt; color: #8a8a8a; padding: 5px; }
+    QLabel#similar_label { color: #b36b00; padding: 2px; }
+    QLabel#validation_label { color: #555555; padding: 2px; }
+    QLineEdit, QTextEdit, QComboBox { background-color: #ffffff; border: 1px solid #d0d0d0; border-radius: 4px; padding: 6px 8px; selection-background-color: #a0c4ff; }
+    QLineEdit:focus, QTextEdit:focus, QComboBox:focus { border: 1px solid #6699ff; }
+    QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left-width: 1px; border-left-color: #d0d0d0; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }
+    QComboBox::down-arrow { image: url(data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAABAAAAAQBAMAAADt3eJSAAAAMFBMVEVHcEwzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzPdw2a6AAAAD3RSTlMAAQIDBAUGBwgJCgsMDQ4PEBESgSPQZwAAADFJREFUCNdjYHBgYGBgYhBTAwMDIxMTgwYDEwMDYxMDAyYDJgYGBiYogwYGBgAARkYECvABa/4AAAAASUVORK5CYII=); }
+    QPushButton { background-color: #6699ff; color: white; border: none; border-radius: 5px; padding: 8px 15px; font-weight: bold; }
+    QPushButton:hover { background-color: #5588ee; }
+    QPushButton:pressed { background-color: #4477dd; }
+    QPushButton#delete_btn { background-color: #dc3545; }
+    QPushButton#delete_btn:hover { background-color: #c82333; }
+    QPushButton#delete_btn:pressed { background-color: #bb2d3b; }
+    QListView { background-color: #ffffff; border: 1px solid #d0d0d0; border-radius: 4px; padding: 5px; }
+    QListView::item { padding: 5px; border-bottom: 1px solid #f0f0f0; }
+    QListView::item:selected { background-color: #e6f0ff; color: #333333; border-radius: 3px; }
+    QScrollArea { border: 1px solid #e0e0e0; border-radius: 6px; background-color: #ffffff; }
+    QScrollBar:vertical { border: none; background: #f0f0f0; width: 8px; margin: 0px; border-radius: 4px; }
+    QScrollBar::handle:vertical { background: #c0c0c0; min-height: 20px; border-radius: 4px; }
+"""
 
 class ItemEditor(QWidget):
-    def __init__(self):
+    def __init__(self, deferred=False):
+        """deferred=True이면 창을 처음 그린 뒤에 설정 오타 확인과 아이템 불러오기를 시작합니다. (프로그램 시작용)"""
         super().__init__()
         self.setWindowTitle("에스테리아 아이템 생성기")
         self.resize(800, 700)
@@ -44,18 +3382,58 @@ class ItemEditor(QWidget):
             # load_config 내부에서 이미 오류 메시지를 표시했으므로 바로 종료
             sys.exit(1)
 
-        # 2. 설정 파일의 키 값에 오타가 있는지 확인하고 수정 제안 (훈수 기능)
-        self.check_and_suggest_corrections()
+        self.schema = ConfigSchema(self.config)
+        STARTUP.mark("config")
+
+        self.storage = create_storage()
+        self.codec = ItemCodec(self.schema)
+        self.store = ItemStore(codec=self.codec) # 아이템은 창을 띄운 뒤 start_loading()에서 백그라운드로 채움
+        self.render_cache = ItemRenderCache(self.store, self.schema)
+        self.history = EditHistory(self.store, os.path.splitext(self.storage.path)[0] + ".history.json")
+        self.save_scheduler = SaveScheduler(self.storage, self.store, parent=self)
+        self.save_scheduler.saved.connect(lambda: self.status_message("저장 완료"))
+        self.save_scheduler.failed.connect(self.on_save_failed)
 
-        self.items = self.load_items()
+        # 다른 사람이나 스크립트가 바꾼 config.json / 아이템 파일을 다시 시작하지 않고 반영
+        self.watcher = ExternalChangeWatcher([CONFIG_FILE, self.storage.path],
+                                             busy=self.save_scheduler.is_writing, parent=self)
+        self.watcher.changed.connect(self.on_external_change)
+        self.save_scheduler.written.connect(lambda: self.watcher.remember(self.storage.path))
+        self.items_reader = None
+        self._items_reload_pending = False
+        self.exporter = None
+        self.loader = None
+        STARTUP.mark("store")
         
         # current_type 초기값을 config에서 가져오도록 수정
         self.current_type = next((name for name in self.config.keys() if name != "공통"), "무기")
         
         self.is_dark_mode = True
 
-        self.init_ui()
+        # 위젯을 만들기 전에 스타일시트를 적용해 두면 위젯마다 한 번만 다듬어짐(polish)
         self.apply_styles()
+        STARTUP.mark("styles")
+        self.init_ui()
+        STARTUP.mark("ui")
+        self._painted = False
+        if not deferred:
+            self.finish_startup()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            if self.loader is None:
+                STARTUP.mark("first_paint")
+                QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """첫 화면을 보여준 뒤에 해도 되는 시작 작업: 설정 파일 오타 확인(훈수 기능)과 아이템 불러오기"""
+        before = copy.deepcopy(self.config)
+        if self.check_and_suggest_corrections():
+            self.apply_config(self.config, before)
+        STARTUP.mark("config_check")
+        self.start_loading()
 
     def show_config_help_dialog(self):
         """config.json 파일의 올바른 예시를 보여주는 도움말 대화상자"""
@@ -179,35 +3557,25 @@ class ItemEditor(QWidget):
             return None
 
     def check_and_suggest_corrections(self):
-        """설정 파일의 키 값에 오타가 있는지 확인하고 수정 제안 (훈수 기능)"""
+        """설정 파일의 키 값에 오타가 있는지 확인하고 수정 제안 (훈수 기능). 수정했으면 True를 반환합니다."""
         if not self.config:
-            return
+            return False
 
-        valid_keys = {"options", "tooltip"}
         corrections_made = False
 
-        # config 딕셔너리를 재귀적으로 탐색하는 함수
-        def find_and_correct(data_dict):
-            nonlocal corrections_made
-            # "dictionary changed size during iteration" 오류 방지를 위해 키 목록 복사
-            for key in list(data_dict.keys()):
-                # 하위 딕셔너리 탐색
-                if isinstance(data_dict[key], dict):
-                    find_and_correct(data_dict[key])
-
-                # 유효한 키 목록과 비교하여 비슷한 키 찾기
-                matches = difflib.get_close_matches(key, valid_keys, n=1, cutoff=0.7)
-                if matches and key != matches[0]:
-                    reply = QMessageBox.question(self, "오타 수정 제안 (훈수)",
-                                                 f"`config.json` 파일에서 '{key}' 키를 찾았습니다.\n"
-                                                 f"혹시 '{matches[0]}'의 오타인가요? 수정하시겠습니까?",
-                                                 QMessageBox.Yes | QMessageBox.No)
-                    if reply == QMessageBox.Yes:
-                        # 키 이름을 올바른 것으로 수정
-                        data_dict[matches[0]] = data_dict.pop(key)
-                        corrections_made = True
-
-        find_and_correct(self.config)
+        # 오타 분석은 config 파일이 바뀌었을 때만 수행 (결과는 파일 해시 기준으로 캐시됨)
+        for path, key, suggestion in cached_config_typos(self.config):
+            data_dict = self.config
+            for part in path:
+                data_dict = data_dict[part]
+            reply = QMessageBox.question(self, "오타 수정 제안 (훈수)",
+                                         f"`config.json` 파일에서 '{key}' 키를 찾았습니다.\n"
+                                         f"혹시 '{suggestion}'의 오타인가요? 수정하시겠습니까?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                # 키 이름을 올바른 것으로 수정
+                data_dict[suggestion] = data_dict.pop(key)
+                corrections_made = True
 
         # 수정된 내용이 있다면 파일에 저장할지 물어봄
         if corrections_made:
@@ -219,22 +3587,107 @@ class ItemEditor(QWidget):
                 with open(CONFIG_FILE, "w", encoding="utf-8") as f:
                     json.dump(self.config, f, ensure_ascii=False, indent=2)
                 self.status_message("설정 파일이 업데이트되었습니다.")
+        return corrections_made
 
 
+    @PROFILER.timed("load")
     def load_items(self):
-        if os.path.exists(ITEMS_FILE):
-            with open(ITEMS_FILE, encoding="utf-8") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError as e:
-                    QMessageBox.warning(self, "아이템 파일 오류",
-                                        f"'{ITEMS_FILE}' 파일이 손상되었습니다.\n오류: {e}\n새 목록으로 시작합니다.")
-                    return []
-        return []
+        """저장소에서 아이템을 읽고, 저널 등 추가 기록을 적용한 ItemStore를 반환합니다."""
+        try:
+            items = self.storage.load()
+        except STORAGE_ERRORS as e:
+            QMessageBox.warning(self, "아이템 파일 오류",
+                                f"'{self.storage.path}' 파일이 손상되었습니다.\n오류: {e}\n새 목록으로 시작합니다.")
+            items = []
+        store = ItemStore(items, codec=self.codec)
+        self.storage.replay(store)
+        store.drain_changes() # 불러오면서 적용한 내역은 이미 저장되어 있으므로 버림
+        return store
 
+    def start_loading(self):
+        """아이템을 백그라운드 스레드에서 읽어 LOAD_BATCH_SIZE개씩 리스트에 추가합니다.
+
+        불러오는 동안에는 (이름, 타입) 중복 확인이 불완전하고 저장하면 일부만 기록되므로 편집 버튼을 잠가 둡니다.
+        """
+        self._load_failed = False
+        self.add_btn.setEnabled(False)
+        self.delete_btn.setEnabled(False)
+        self.bulk_bar.setEnabled(False)
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.loader = ItemLoader(self.storage, codec=self.codec, parent=self)
+        self.loader.batch_loaded.connect(lambda batch: self.store.extend(batch, record=False))
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.finished.connect(self.on_load_finished)
+        self.loader.start()
+
+    def on_load_progress(self, done, total):
+        self.load_progress.setValue(int(done * 100 / total) if total else 100)
+
+    def on_load_failed(self, error):
+        self._load_failed = True
+        self.store.clear()
+        QMessageBox.warning(self, "아이템 파일 오류",
+                            f"'{self.storage.path}' 파일이 손상되었습니다.\n오류: {error}\n새 목록으로 시작합니다.")
+
+    @PROFILER.timed("load.finish")
+    def on_load_finished(self):
+        if self.loader.isInterruptionRequested():
+            return
+        if not self._load_failed:
+            self.storage.replay(self.store)
+            self.history.load()
+        self.store.drain_changes()
+        self.save_scheduler.remember_stored(self.store)
+        self.history.recording = True
+        self.load_progress.hide()
+        self.ensure_search_index() # 사용자가 검색하기 전에 미리 색인을 만들어 둠
+        self.ensure_similarity_index() # 아이템을 추가할 때 유사 아이템 확인이 색인을 기다리지 않도록 미리 만들어 둠
+        self.start_validation()
+        self.start_facets()
+        self.add_btn.setEnabled(True)
+        self.delete_btn.setEnabled(True)
+        self.bulk_bar.setEnabled(True)
+        self.status_message(f"아이템 {len(self.store)}개를 불러왔습니다.")
+        STARTUP.mark("load")
+        STARTUP.report()
+        if self._items_reload_pending: # 불러오는 동안 파일이 바뀜
+            self.reload_items()
+
+    @PROFILER.timed("save")
     def save_items(self):
-        with open(ITEMS_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.items, f, ensure_ascii=False, indent=2)
+        """예약된 저장을 포함해 모든 변경 내용을 즉시 저장합니다."""
+        self.save_scheduler.flush()
+        self.storage.save(self.store)
+        self.watcher.remember(self.storage.path)
+
+    def schedule_save(self, msg):
+        """변경 내용을 백그라운드 저장으로 예약하고 상태 메시지를 표시합니다."""
+        self.save_scheduler.schedule()
+        self.status_message(f"{msg} (저장 대기 중...)")
+
+    def on_save_failed(self, error):
+        QMessageBox.warning(self, "저장 오류", f"'{self.storage.path}' 파일 저장 중 오류 발생: {error}\n"
+                            "저장하지 못한 변경 내용은 남겨 두었다가 다음 저장 때 다시 기록합니다.")
+
+    def closeEvent(self, event):
+        if self.loader is not None and self.loader.isRunning():
+            self.loader.requestInterruption()
+            self.loader.wait()
+        if self.items_reader is not None:
+            self.items_reader.wait()
+        if self.exporter is not None and self.exporter.isRunning():
+            self.exporter.requestInterruption()
+            self.exporter.wait()
+        self.save_scheduler.release()
+        # 창을 닫기 전에 예약된 저장을 모두 마쳐서 편집 내용이 사라지지 않도록 함
+        self.save_scheduler.flush()
+        if self.history.recording:
+            self.history.save()
+        if PROFILER.enabled:
+            PROFILER.export_chrome_trace()
+        super().closeEvent(event)
 
     def init_ui(self):
         self.main_scroll_area = CustomScrollArea()
@@ -250,31 +3703,7 @@ class ItemEditor(QWidget):
         main_layout.addWidget(self.theme_toggle_btn, alignment=Qt.AlignRight)
 
         self.tabs = QTabWidget()
-        self.tabs.clear() # 기존 탭들을 모두 지움
-
-        # config에서 "공통"을 제외한 모든 키를 탭 이름으로 추가
-        if self.config:
-            tab_names = [name for name in self.config.keys() if name != "공통"]
-            for name in tab_names:
-                self.tabs.addTab(QWidget(), name)
-            if tab_names and self.current_type in tab_names:
-                # 현재 타입으로 탭을 설정 (초기화 또는 변경된 경우 대비)
-                self.tabs.setCurrentIndex(tab_names.index(self.current_type))
-            elif tab_names:
-                # current_type이 유효하지 않으면 첫 번째 탭으로 설정
-                self.current_type = tab_names[0]
-                self.tabs.setCurrentIndex(0)
-            else:
-                # config에 "공통" 외에 아무것도 없다면 기본 "무기" 탭 추가
-                self.tabs.addTab(QWidget(), "무기")
-                self.current_type = "무기"
-        else:
-            # config 로드 실패 시 기본 탭 추가 (이 경우 sys.exit(1)로 프로그램이 종료될 것이므로 거의 실행되지 않음)
-            self.tabs.addTab(QWidget(), "무기")
-            self.tabs.addTab(QWidget(), "방어구")
-            self.current_type = "무기"
-
-
+        self.rebuild_tabs()
         self.tabs.currentChanged.connect(self.on_tab_changed)
         main_layout.addWidget(self.tabs)
 
@@ -291,27 +3720,132 @@ class ItemEditor(QWidget):
 
         self.form_scroll = CustomScrollArea()
         self.form_scroll.setWidgetResizable(True)
-        self.form_widget = QWidget()
-        self.form_layout = QVBoxLayout(self.form_widget)
-        self.form_layout.setAlignment(Qt.AlignTop)
-        self.form_layout.setContentsMargins(10, 10, 10, 10)
-        self.form_layout.setSpacing(10)
-        self.form_scroll.setWidget(self.form_widget)
+        # 타입별 폼 페이지는 처음 방문할 때 한 번만 만들어 두고 전환만 함
+        self.form_stack = QStackedWidget()
+        self.form_pages = {} # 타입 -> (페이지 위젯, 입력 위젯 dict)
+        self.widgets = {}
+        self.form_scroll.setWidget(self.form_stack)
         self.form_scroll.setMinimumWidth(380)
         self.form_scroll.setFrameShape(QFrame.NoFrame)
-        content_layout.addWidget(self.form_scroll, 3)
+        left_layout = QVBoxLayout()
+        left_layout.addWidget(self.form_scroll, 1)
+
+        # 이름이나 설명을 입력하는 동안 비슷한 기존 아이템을 알려줌
+        self.similar_label = QLabel()
+        self.similar_label.setObjectName("similar_label")
+        self.similar_label.setWordWrap(True)
+        self.similar_label.hide()
+        left_layout.addWidget(self.similar_label)
+        self.similar_timer = QTimer(self)
+        self.similar_timer.setSingleShot(True)
+        self.similar_timer.setInterval(SIMILAR_DELAY_MS)
+        self.similar_timer.timeout.connect(self.update_similar_hint)
+        self.similarity_index = None # 처음 입력할 때 만듦
+        content_layout.addLayout(left_layout, 3)
+
+        # 패싯 사이드바: 필드 값별 아이템 수. 값을 클릭하면 그 값인 아이템만 보이고, 다시 클릭하면 해제
+        self.facet_tree = QTreeWidget()
+        self.facet_tree.setHeaderLabel("분류")
+        self.facet_tree.setMinimumWidth(160)
+        self.facet_tree.itemClicked.connect(self.on_facet_clicked)
+        content_layout.addWidget(self.facet_tree, 2)
+        self.facets = None # 불러오기가 끝나면 만듦
+        self.facet_filters = {} # 필드 -> 선택한 값
+        self.facet_timer = QTimer(self)
+        self.facet_timer.setSingleShot(True)
+        self.facet_timer.setInterval(FACET_REFRESH_MS)
+        self.facet_timer.timeout.connect(self.refresh_facets)
 
         right_layout = QVBoxLayout()
         right_layout.setSpacing(10)
 
-        item_list_label = QLabel("생성된 아이템 리스트")
-        item_list_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        right_layout.addWidget(item_list_label)
+        self.item_list_label = QLabel("생성된 아이템 리스트")
+        self.item_list_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        right_layout.addWidget(self.item_list_label)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("검색 (예: 도끼, 등급:LEGENDARY, 데미지_유형:화염, ㄴㅁㄷㄲ)")
+        self.search_edit.setToolTip("공백으로 구분한 단어를 모두 포함하는 아이템을 찾습니다.\n"
+                                    "'필드:값'은 해당 필드에서만 찾고, 필드 이름의 공백은 '_'로 적습니다.\n"
+                                    "자음만 입력하면 이름의 초성으로 찾습니다.")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.apply_search)
+        right_layout.addWidget(self.search_edit)
 
-        self.item_list = CustomListWidget()
-        self.item_list.itemClicked.connect(self.on_item_selected)
+        arrange_layout = QHBoxLayout()
+        arrange_layout.setSpacing(6)
+        self.sort_combo = QComboBox()
+        self.sort_combo.setToolTip("정렬 기준 (숫자 값은 크기 순)")
+        self.sort_order_btn = QPushButton("오름차순")
+        self.sort_order_btn.setCheckable(True)
+        self.group_combo = QComboBox()
+        self.group_combo.setToolTip("값이 같은 아이템끼리 묶어서 보기")
+        self.update_arrange_fields()
+        self.sort_combo.currentIndexChanged.connect(self.apply_search)
+        self.sort_order_btn.toggled.connect(self.on_sort_order_toggled)
+        self.group_combo.currentIndexChanged.connect(self.apply_search)
+        arrange_layout.addWidget(QLabel("정렬:"))
+        arrange_layout.addWidget(self.sort_combo, 1)
+        arrange_layout.addWidget(self.sort_order_btn)
+        arrange_layout.addWidget(QLabel("묶기:"))
+        arrange_layout.addWidget(self.group_combo, 1)
+        right_layout.addLayout(arrange_layout)
+
+        # 전체 검증 결과 요약 (필드별 수는 툴팁). 리스트의 각 행에는 ⛔오류/⚠경고 수를 붙임
+        self.validation_label = QLabel()
+        self.validation_label.setObjectName("validation_label")
+        self.validation_label.hide()
+        right_layout.addWidget(self.validation_label)
+
+        self.load_progress = QProgressBar()
+        self.load_progress.setFormat("아이템 불러오는 중... %p%")
+        self.load_progress.setAlignment(Qt.AlignCenter)
+        self.load_progress.hide()
+        right_layout.addWidget(self.load_progress)
+
+        self.item_model = ItemListModel(self.store, self)
+        self.item_list = CustomListView()
+        self.item_list.setUniformItemSizes(True)
+        self.item_list.setModel(self.item_model)
+        self.item_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.item_list.clicked.connect(self.on_item_selected)
+        self.item_list.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        # 검색 결과가 표시된 상태에서 아이템이 바뀌면, 다른 리스너(검색 색인)가 갱신된 뒤에 다시 검색
+        self.item_model.view_stale.connect(self.apply_search, Qt.QueuedConnection)
+        self.search_index = None # 처음 검색할 때 만듦
+        self.validator = None # 불러오기가 끝나면 만듦
         right_layout.addWidget(self.item_list, 3)
 
+        # 여러 아이템을 선택했을 때만 보이는 일괄 편집 줄 (Ctrl/Shift+클릭, Ctrl+A로 선택)
+        self.bulk_bar = QFrame()
+        bulk_layout = QHBoxLayout(self.bulk_bar)
+        bulk_layout.setContentsMargins(0, 0, 0, 0)
+        bulk_layout.setSpacing(6)
+        self.bulk_label = QLabel()
+        self.bulk_field_combo = QComboBox()
+        self.bulk_field_combo.setEditable(True)
+        self.bulk_field_combo.setToolTip("일괄 변경할 필드")
+        self.bulk_field_combo.addItems(self.bulk_field_names())
+        self.bulk_value_combo = QComboBox()
+        self.bulk_value_combo.setEditable(True)
+        self.bulk_value_combo.setToolTip("새 값 (비워 두면 필드를 지웁니다)")
+        self.bulk_field_combo.currentTextChanged.connect(self.update_bulk_value_options)
+        self.update_bulk_value_options(self.bulk_field_combo.currentText())
+        bulk_set_btn = QPushButton("값 변경")
+        bulk_set_btn.clicked.connect(self.bulk_set_field)
+        self.bulk_type_combo = QComboBox()
+        self.bulk_type_combo.addItems(self.schema.types)
+        bulk_retype_btn = QPushButton("타입 변경")
+        bulk_retype_btn.clicked.connect(self.bulk_retype)
+        bulk_layout.addWidget(self.bulk_label)
+        bulk_layout.addWidget(self.bulk_field_combo, 1)
+        bulk_layout.addWidget(self.bulk_value_combo, 1)
+        bulk_layout.addWidget(bulk_set_btn)
+        bulk_layout.addWidget(self.bulk_type_combo)
+        bulk_layout.addWidget(bulk_retype_btn)
+        self.bulk_bar.hide()
+        right_layout.addWidget(self.bulk_bar)
+
         detail_label = QLabel("선택 아이템 상세 보기")
         detail_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
         right_layout.addWidget(detail_label)
@@ -333,6 +3867,12 @@ class ItemEditor(QWidget):
         self.copy_text_btn.clicked.connect(self.copy_selected_item_text)
         self.copy_latest_btn = QPushButton("최근 생성 아이템 복사")
         self.copy_latest_btn.clicked.connect(self.copy_latest_item)
+        self.export_btn = QPushButton("목록 내보내기")
+        self.export_btn.setToolTip("전체 목록 또는 검색 결과를 JSONL / CSV / 텍스트 파일로 저장")
+        self.export_btn.clicked.connect(self.export_items)
+        self.merge_btn = QPushButton("버전 비교/병합")
+        self.merge_btn.setToolTip("다른 아이템 파일과 비교하거나, 공통 조상 파일을 기준으로 3-way 병합")
+        self.merge_btn.clicked.connect(self.show_merge_dialog)
         self.delete_btn = QPushButton("선택 아이템 삭제")
         self.delete_btn.clicked.connect(self.delete_selected_item)
         self.delete_btn.setObjectName("delete_btn")
@@ -341,6 +3881,8 @@ class ItemEditor(QWidget):
         btn_layout_row1.addWidget(self.copy_json_btn)
         btn_layout_row1.addWidget(self.copy_text_btn)
         btn_layout_row2.addWidget(self.copy_latest_btn)
+        btn_layout_row2.addWidget(self.export_btn)
+        btn_layout_row2.addWidget(self.merge_btn)
         btn_layout_row2.addWidget(self.delete_btn)
 
         right_layout.addLayout(btn_layout_row1)
@@ -352,7 +3894,22 @@ class ItemEditor(QWidget):
         self.status_label = QLabel("")
         self.status_label.setObjectName("status_label")
         self.status_label.setAlignment(Qt.AlignCenter)
-        main_layout.addWidget(self.status_label)
+        status_layout = QHBoxLayout()
+        status_layout.addWidget(self.status_label, 1)
+        # 계측이 켜져 있으면 상태 표시 옆에 구간별 소요 시간을 보여줌 (F12로 숨기기/보이기)
+        self.profile_label = QLabel("")
+        self.profile_label.setObjectName("profile_label")
+        self.profile_label.setVisible(PROFILER.enabled)
+        status_layout.addWidget(self.profile_label)
+        main_layout.addLayout(status_layout)
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo)
+        if PROFILER.enabled:
+            self.profile_timer = QTimer(self)
+            self.profile_timer.timeout.connect(self.update_profile_overlay)
+            self.profile_timer.start(1000)
+            QShortcut(QKeySequence(Qt.Key_F12), self, self.toggle_profile_overlay)
 
         self.main_scroll_area.setWidget(self.main_widget_content)
 
@@ -361,11 +3918,13 @@ class ItemEditor(QWidget):
         layout.setContentsMargins(0,0,0,0)
 
         self.selected_index = None
+        self._filling_form = False # fill_form()이 탭을 바꾸는 중이면 리스트 선택을 지우지 않음
         self.on_tab_changed(self.tabs.currentIndex()) # 초기 폼 생성
-        self.refresh_item_list()
 
     def toggle_theme(self):
         self.is_dark_mode = not self.is_dark_mode
+        # 스타일시트를 바꾸면 숨겨진 위젯까지 모두 다시 다듬으므로, 보이지 않는 폼 페이지는 버리고 다음 방문 때 새로 만듦
+        self.invalidate_form_pages([item_type for item_type in self.form_pages if item_type != self.current_type])
         self.apply_styles()
         if self.is_dark_mode:
             self.theme_toggle_btn.setText("라이트 모드로 전환")
@@ -373,158 +3932,110 @@ class ItemEditor(QWidget):
             self.theme_toggle_btn.setText("다크 모드로 전환")
 
     def apply_styles(self):
-        dark_stylesheet = """
-            QWidget { background-color: #2b2b2b; font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; font-size: 10pt; color: #e0e0e0; }
-            QTabWidget::pane { border: 1px solid #505050; border-top-left-radius: 6px; border-top-right-radius: 6px; background-color: #3c3c3c; }
-            QTabBar::tab { background: #4a4a4a; border: 1px solid #505050; border-bottom: none; border-top-left-radius: 4px; border-top-right-radius: 4px; padding: 8px 15px; margin-right: 2px; color: #cccccc; }
-            QTabBar::tab:selected { background: #3c3c3c; border-color: #505050; border-bottom-color: #3c3c3c; font-weight: bold; color: #ffffff; }
-            QLabel { padding: 2px 0; color: #e0e0e0; }
-            QLabel#status_label { font-size: 10pt; font-weight: bold; padding: 5px; color: #28a745; }
-            QLineEdit, QTextEdit, QComboBox { background-color: #4a4a4a; border: 1px solid #606060; border-radius: 4px; padding: 6px 8px; color: #ffffff; selection-background-color: #6699ff; }
-            QLineEdit:focus, QTextEdit:focus, QComboBox:focus { border: 1px solid #88bbee; }
-            QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left-width: 1px; border-left-color: #606060; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }
-            QComboBox::down-arrow { image: url(data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAABAAAAAQBAMAAADt3eJSAAAAMFBMVEVHcEz///////////////////////////////////////////////////////////9EPuwCAAAAD3RSTlMAAQIDBAUGBwgJCgsMDQ4PEBESgSPQZwAAADFJREFUCNdjYHBgYGBgYhBTAwMDIxMTgwYDEwMDYxMDAyYDJgYGBiYogwYGBgAARkYECvABa/4AAAAASUVORK5CYII=); }
-            QPushButton { background-color: #5a8be0; color: white; border: none; border-radius: 5px; padding: 8px 15px; font-weight: bold; }
-            QPushButton:hover { background-color: #4a7ad0; }
-            QPushButton:pressed { background-color: #3a69c0; }
-            QPushButton#delete_btn { background-color: #cc4d4d; }
-            QPushButton#delete_btn:hover { background-color: #bb3d3d; }
-            QPushButton#delete_btn:pressed { background-color: #aa2d2d; }
-            QListWidget { background-color: #3c3c3c; border: 1px solid #505050; border-radius: 4px; padding: 5px; color: #e0e0e0; }
-            QListWidget::item { padding: 5px; border-bottom: 1px solid #4a4a4a; }
-            QListWidget::item:selected { background-color: #4f6e9f; color: #ffffff; border-radius: 3px; }
-            QScrollArea { border: 1px solid #505050; border-radius: 6px; background-color: #3c3c3c; }
-            QScrollBar:vertical { border: none; background: #4a4a4a; width: 8px; margin: 0px; border-radius: 4px; }
-            QScrollBar::handle:vertical { background: #707070; min-height: 20px; border-radius: 4px; }
-        """
-        light_stylesheet = """
-            QWidget { background-color: #f7f9fc; font-family: 'Segoe UI', 'Malgun Gothic', sans-serif; font-size: 10pt; color: #333333; }
-            QTabWidget::pane { border: 1px solid #e0e0e0; border-top-left-radius: 6px; border-top-right-radius: 6px; background-color: #ffffff; }
-            QTabBar::tab { background: #e0e0e0; border: 1px solid #e0e0e0; border-bottom: none; border-top-left-radius: 4px; border-top-right-radius: 4px; padding: 8px 15px; margin-right: 2px; color: #555555; }
-            QTabBar::tab:selected { background: #ffffff; border-color: #e0e0e0; border-bottom-color: #ffffff; font-weight: bold; color: #333333; }
-            QLabel { padding: 2px 0; }
-            QLabel#status_label { font-size: 10pt; font-weight: bold; padding: 5px; color: #28a745; }
-            QLineEdit, QTextEdit, QComboBox { background-color: #ffffff; border: 1px solid #d0d0d0; border-radius: 4px; padding: 6px 8px; selection-background-color: #a0c4ff; }
-            QLineEdit:focus, QTextEdit:focus, QComboBox:focus { border: 1px solid #6699ff; }
-            QComboBox::drop-down { subcontrol-origin: padding; subcontrol-position: top right; width: 20px; border-left-width: 1px; border-left-color: #d0d0d0; border-left-style: solid; border-top-right-radius: 3px; border-bottom-right-radius: 3px; }
-            QComboBox::down-arrow { image: url(data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAABAAAAAQBAMAAADt3eJSAAAAMFBMVEVHcEwzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzMzPdw2a6AAAAD3RSTlMAAQIDBAUGBwgJCgsMDQ4PEBESgSPQZwAAADFJREFUCNdjYHBgYGBgYhBTAwMDIxMTgwYDEwMDYxMDAyYDJgYGBiYogwYGBgAARkYECvABa/4AAAAASUVORK5CYII=); }
-            QPushButton { background-color: #6699ff; color: white; border: none; border-radius: 5px; padding: 8px 15px; font-weight: bold; }
-            QPushButton:hover { background-color: #5588ee; }
-            QPushButton:pressed { background-color: #4477dd; }
-            QPushButton#delete_btn { background-color: #dc3545; }
-            QPushButton#delete_btn:hover { background-color: #c82333; }
-            QPushButton#delete_btn:pressed { background-color: #bb2d3b; }
-            QListWidget { background-color: #ffffff; border: 1px solid #d0d0d0; border-radius: 4px; padding: 5px; }
-            QListWidget::item { padding: 5px; border-bottom: 1px solid #f0f0f0; }
-            QListWidget::item:selected { background-color: #e6f0ff; color: #333333; border-radius: 3px; }
-            QScrollArea { border: 1px solid #e0e0e0; border-radius: 6px; background-color: #ffffff; }
-            QScrollBar:vertical { border: none; background: #f0f0f0; width: 8px; margin: 0px; border-radius: 4px; }
-            QScrollBar::handle:vertical { background: #c0c0c0; min-height: 20px; border-radius: 4px; }
-        """
-        self.setStyleSheet(dark_stylesheet if self.is_dark_mode else light_stylesheet)
+        self.setStyleSheet(DARK_STYLESHEET if self.is_dark_mode else LIGHT_STYLESHEET)
 
 
+    def rebuild_tabs(self):
+        """config에서 "공통"을 제외한 모든 키를 탭 이름으로 추가합니다. 현재 타입이 없어졌으면 첫 번째 탭으로 바꾸고 True를 반환합니다."""
+        tab_names = [name for name in self.config.keys() if name != "공통"] or ["무기"] # "공통"뿐이면 기본 "무기" 탭
+        self.tabs.blockSignals(True)
+        self.tabs.clear() # 기존 탭들을 모두 지움
+        for name in tab_names:
+            self.tabs.addTab(QWidget(), name)
+        moved = self.current_type not in tab_names
+        if moved:
+            self.current_type = tab_names[0]
+        self.tabs.setCurrentIndex(tab_names.index(self.current_type))
+        self.tabs.blockSignals(False)
+        return moved
+
+    @PROFILER.timed("form.tab_changed")
     def on_tab_changed(self, idx):
         if idx < 0: return # 탭이 없을 경우 방지
         self.current_type = self.tabs.tabText(idx)
         self.type_label.setText(f"현재 타입: {self.current_type}")
         self.build_form()
+        if self._filling_form:
+            return
         self.selected_index = None
         self.item_list.clearSelection()
         self.detail_text.clear()
         self.clear_form_fields()
 
     def build_form(self):
-        """폼 UI를 생성하거나 탭 변경 시 새로고침합니다."""
-        while self.form_layout.count():
-            child = self.form_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        """현재 타입의 폼 페이지를 표시합니다. 처음 방문하는 타입이면 config로부터 만들어 캐시에 보관합니다."""
+        page = self.form_pages.get(self.current_type)
+        if page is None:
+            page = self.build_form_page(self.current_type)
+            self.form_pages[self.current_type] = page
+            self.form_stack.addWidget(page[0])
+        self.form_stack.setCurrentWidget(page[0])
+        self.widgets = page[1]
+
+    def invalidate_form_pages(self, types=None):
+        """config가 바뀌었을 때 캐시된 폼 페이지를 버립니다. types를 주면 해당 타입만 버립니다."""
+        for item_type in list(self.form_pages.keys()) if types is None else types:
+            page = self.form_pages.pop(item_type, None)
+            if page is not None:
+                self.form_stack.removeWidget(page[0])
+                page[0].deleteLater()
+        if self.current_type not in self.form_pages:
+            self.build_form()
+            self.clear_form_fields()
 
-        merged = {}
-        if self.config:
-            merged.update(self.config.get("공통", {}))
-            merged.update(self.config.get(self.current_type, {}))
+    @PROFILER.timed("form.build")
+    def build_form_page(self, item_type):
+        """한 타입의 폼 페이지 위젯과 입력 위젯 dict를 만듭니다."""
+        page_widget = QWidget()
+        form_layout = QVBoxLayout(page_widget)
+        form_layout.setAlignment(Qt.AlignTop)
+        form_layout.setContentsMargins(10, 10, 10, 10)
+        form_layout.setSpacing(10)
 
-        self.widgets = {}
-        # config에 정의된 순서대로 폼 필드를 생성
-        # '공통' 필드들은 config.json에 정의된 순서대로 먼저 추가
-        for key, data in self.config.get("공통", {}).items():
-            if key == "타입": continue # '타입' 필드는 폼에서 사용하지 않음
+        widgets = {}
+        # 스키마에 계산된 순서대로 폼 필드를 생성 ('공통' 필드가 먼저, '타입' 필드는 폼에서 사용하지 않음)
+        for key in self.schema.field_order(item_type):
+            data = self.schema.form_field(item_type, key)
             container = QFrame()
             container_layout = QVBoxLayout(container)
             container_layout.setContentsMargins(0, 0, 0, 0)
             container_layout.setSpacing(4)
             label = QLabel(f"{key}:")
-            label.setToolTip(data.get("tooltip", ""))
+            label.setToolTip(data.tooltip)
             label.setStyleSheet("font-weight: bold; margin-bottom: 2px;")
             container_layout.addWidget(label)
-            
-            options = data.get("options", [])
 
-            if options:
+            if data.options:
                 combo = QComboBox()
-                combo.addItems(options)
-                combo.setToolTip(data.get("tooltip", ""))
+                combo.addItems(data.options)
+                combo.setToolTip(data.tooltip)
                 container_layout.addWidget(combo)
                 
                 edit = QLineEdit()
                 edit.setPlaceholderText(f"직접 입력 (선택 사항)")
-                edit.setToolTip(data.get("tooltip", ""))
+                edit.setToolTip(data.tooltip)
                 container_layout.addWidget(edit)
 
-                self.widgets[key] = {"combobox": combo, "input": edit}
+                widgets[key] = {"combobox": combo, "input": edit}
             else:
                 edit = QLineEdit()
-                # '설명' 필드는 QTextEdit으로 변경하여 여러 줄 입력 가능하게 함
-                if key == "설명":
+                # '공통'의 '설명' 필드는 QTextEdit으로 변경하여 여러 줄 입력 가능하게 함
+                if key == "설명" and key in self.schema.common_fields:
                     edit = QTextEdit() 
                     edit.setPlaceholderText(f"{key}을(를) 입력하세요.")
                     edit.setMinimumHeight(80) # 설명 필드 높이 증가
                 else:
                     edit.setPlaceholderText(f"{key}을(를) 입력하세요.")
-                edit.setToolTip(data.get("tooltip", ""))
-                container_layout.addWidget(edit)
-                self.widgets[key] = {"input": edit}
-            
-            self.form_layout.addWidget(container)
-        
-        # 현재 타입에 해당하는 필드들을 config.json에 정의된 순서대로 추가
-        for key, data in self.config.get(self.current_type, {}).items():
-            if key == "타입" or key in self.config.get("공통", {}): continue # '타입' 중복 방지, '공통' 필드는 이미 추가됨
-            container = QFrame()
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(4)
-            label = QLabel(f"{key}:")
-            label.setToolTip(data.get("tooltip", ""))
-            label.setStyleSheet("font-weight: bold; margin-bottom: 2px;")
-            container_layout.addWidget(label)
-            
-            options = data.get("options", [])
-
-            if options:
-                combo = QComboBox()
-                combo.addItems(options)
-                combo.setToolTip(data.get("tooltip", ""))
-                container_layout.addWidget(combo)
-                
-                edit = QLineEdit()
-                edit.setPlaceholderText(f"직접 입력 (선택 사항)")
-                edit.setToolTip(data.get("tooltip", ""))
-                container_layout.addWidget(edit)
-
-                self.widgets[key] = {"combobox": combo, "input": edit}
-            else:
-                edit = QLineEdit()
-                edit.setPlaceholderText(f"{key}을(를) 입력하세요.")
-                edit.setToolTip(data.get("tooltip", ""))
+                edit.setToolTip(data.tooltip)
                 container_layout.addWidget(edit)
-                self.widgets[key] = {"input": edit}
+                widgets[key] = {"input": edit}
+                if key in ("이름", "설명"): # 유사 아이템을 찾는 데 쓰는 필드
+                    edit.textChanged.connect(lambda *_: self.similar_timer.start())
             
-            self.form_layout.addWidget(container)
+            form_layout.addWidget(container)
 
-        self.form_layout.addStretch(1)
+        form_layout.addStretch(1)
+        return page_widget, widgets
 
     def get_form_data(self):
         """폼에서 현재 입력된 데이터를 가져옵니다."""
@@ -550,6 +4061,7 @@ class ItemEditor(QWidget):
                     data[key] = val
         return data
 
+    @PROFILER.timed("form.fill")
     def fill_form(self, item):
         """선택된 아이템의 데이터로 폼을 채웁니다."""
         # 아이템 타입에 맞는 탭으로 먼저 전환
@@ -557,10 +4069,13 @@ class ItemEditor(QWidget):
             try:
                 tab_names = [self.tabs.tabText(i) for i in range(self.tabs.count())]
                 idx = tab_names.index(item.get("타입"))
-                self.tabs.setCurrentIndex(idx)
-                QApplication.processEvents()
             except (ValueError, IndexError):
                 return
+            self._filling_form = True
+            try:
+                self.tabs.setCurrentIndex(idx)
+            finally:
+                self._filling_form = False
 
         for key, w_dict in self.widgets.items():
             val = item.get(key, "")
@@ -593,39 +4108,41 @@ class ItemEditor(QWidget):
             QMessageBox.warning(self, "경고", "이름은 필수 입력 항목입니다.")
             return
 
-        existing_index = None
-        for i, item in enumerate(self.items):
-            if item.get("이름") == name and item.get("타입") == self.current_type:
-                existing_index = i
-                break
+        existing_index = self.store.find(name, self.current_type)
 
         if self.selected_index is not None:
-            self.items[self.selected_index] = data
-            self.status_message("아이템 수정 완료")
+            self.store.replace(self.selected_index, data)
+            msg = "아이템 수정 완료"
         elif existing_index is not None:
             reply = QMessageBox.question(self, "확인", f"'{name}' ({self.current_type}) 아이템이 이미 존재합니다. 수정하시겠습니까?", QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.items[existing_index] = data
-                self.status_message("아이템 수정 완료")
+                self.store.replace(existing_index, data)
+                msg = "아이템 수정 완료"
             else: return
         else:
-            self.items.append(data)
-            self.status_message("아이템 추가 완료")
+            similar = self.similar_items(data, wait=True) # 색인이 아직 없어도 확인을 건너뛰지 않음
+            if similar:
+                names = "\n".join(f" - {line}" for line in similar)
+                reply = QMessageBox.question(self, "확인", f"비슷한 아이템이 이미 있습니다.\n{names}\n그래도 추가하시겠습니까?",
+                                             QMessageBox.Yes | QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    return
+            self.store.append(data)
+            msg = "아이템 추가 완료"
 
-        self.save_items()
-        self.refresh_item_list()
+        self.schedule_save(msg)
         self.clear_form_fields()
         self.selected_index = None
 
+    @PROFILER.timed("list.refresh")
     def refresh_item_list(self):
-        self.item_list.clear()
+        """리스트 전체를 다시 그립니다. 일반 편집은 모델이 바뀐 행만 갱신하므로 필요하지 않습니다."""
         current_selection = self.selected_index
-        for i, item in enumerate(self.items):
-            display = f"{item.get('이름','(이름 없음)')} [{item.get('타입','?')}]"
-            list_item = QListWidgetItem(display)
-            self.item_list.addItem(list_item)
-        if current_selection is not None and current_selection < self.item_list.count():
-            self.item_list.setCurrentRow(current_selection)
+        self.item_model.reset()
+        if current_selection is not None and current_selection < len(self.store):
+            view_row = self.item_model.view_row(current_selection)
+            if view_row is not None:
+                self.item_list.setCurrentIndex(self.item_model.index(view_row))
 
     def clear_form_fields(self):
         for w_dict in self.widgets.values():
@@ -642,97 +4159,1312 @@ class ItemEditor(QWidget):
         self.item_list.clearSelection()
         self.detail_text.clear()
 
-    def on_item_selected(self, list_item: QListWidgetItem):
-        idx = self.item_list.row(list_item)
-        self.selected_index = idx
-        data = self.items[idx]
-        self.fill_form(data)
+    def ensure_search_index(self):
+        """검색 색인이 없으면 만들기 시작합니다. 완성되면 입력된 검색어로 다시 검색합니다."""
+        if self.search_index is not None:
+            return
+        self.search_index = SearchIndex(self.store, self.schema.exact_fields())
+        self.search_index.build_async(on_ready=self.apply_search)
 
-        # '설명' 필드를 마지막에 정렬하기 위한 로직 추가
-        display_keys_order = []
-        
-        # 1. '공통' 필드들을 우선적으로 추가 (설명 제외)
-        common_keys_in_config = list(self.config.get("공통", {}).keys())
-        for key in common_keys_in_config:
-            if key != "설명":
-                display_keys_order.append(key)
-
-        # 2. 현재 아이템 타입의 필드들을 추가 (config에 정의된 순서대로, 중복 방지)
-        type_keys_in_config = list(self.config.get(self.current_type, {}).keys())
-        for key in type_keys_in_config:
-            if key not in display_keys_order:
-                display_keys_order.append(key)
-
-        # 3. '설명' 필드가 있다면 가장 마지막에 추가
-        if "설명" in self.config.get("공통", {}):
-            display_keys_order.append("설명")
-
-        # 4. 아이템 데이터에서 표시할 줄 생성
+    def start_validation(self):
+        """현재 config 규칙으로 전체 아이템 검증을 시작합니다. 이후 편집된 아이템은 검증기가 바로 다시 검사합니다."""
+        if self.validator is None:
+            self.validator = ItemValidator(self.store, self.schema.validation_rules(), on_change=self.update_validation_summary)
+            self.item_model.validator = self.validator
+        self.validator.rules = self.schema.validation_rules()
+        self.validation_label.setText("검증 중...")
+        self.validation_label.show()
+        self.validator.build_async(on_ready=self.on_validation_finished)
+
+    def on_validation_finished(self):
+        self.item_model.refresh_badges()
+        self.update_validation_summary()
+
+    def update_validation_summary(self):
+        self.validation_label.setText(f"검증: {self.validator.summary()}")
+        self.validation_label.setToolTip(self.validator.field_summary())
+
+    def ensure_similarity_index(self):
+        """유사 아이템 색인이 없으면 만들기 시작합니다. 완성되면 입력 중인 아이템으로 다시 찾습니다."""
+        if self.similarity_index is not None:
+            return
+        self.similarity_index = SimilarityIndex(self.store)
+        self.similarity_index.build_async(on_ready=self.update_similar_hint)
+
+    def similar_items(self, data, exclude=None, wait=False):
+        """data와 비슷한 아이템을 '이름 [타입] (근거 유사도%)' 문자열 목록으로 반환합니다.
+
+        색인이 준비되지 않았으면 빈 목록이고, wait=True면 색인이 완성될 때까지 기다립니다.
+        """
+        self.ensure_similarity_index()
+        if not self.similarity_index.ready:
+            if not wait:
+                return []
+            self.status_message("유사 아이템 색인을 만드는 중입니다. 잠시 기다려 주세요...")
+            self.status_label.repaint() # 기다리는 동안에는 이벤트 루프가 돌지 않으므로 바로 그림
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                self.similarity_index.wait_ready()
+            finally:
+                QApplication.restoreOverrideCursor()
         lines = []
-        # config에 정의된 순서대로 정보 표시
-        for key in display_keys_order:
-            if key in data:
-                value = data[key]
-                formatted_value = ', '.join(value) if isinstance(value, list) else str(value)
-                lines.append(f"<b>{key}</b>: {formatted_value}")
-        
-        # config에 정의되지 않았지만 아이템 데이터에 있는 다른 필드들을 추가 (예상치 못한 필드)
-        for key, value in data.items():
-            if key not in display_keys_order and key != "타입":
-                formatted_value = ', '.join(value) if isinstance(value, list) else str(value)
-                lines.append(f"<b>{key}</b>: {formatted_value}")
+        for score, field, item_id in self.similarity_index.similar(data, exclude=exclude):
+            item = self.store.item(item_id)
+            lines.append(f"{item.get('이름', '(이름 없음)')} [{item.get('타입', '')}] ({field} {score:.0%})")
+        return lines
+
+    @PROFILER.timed("form.similar")
+    def update_similar_hint(self):
+        """폼에 입력 중인 아이템과 비슷한 기존 아이템을 폼 아래에 표시합니다."""
+        data = self.get_form_data()
+        if not self.history.recording or not (data.get("이름") or data.get("설명")):
+            self.similar_label.hide()
+            return
+        self.ensure_similarity_index()
+        if not self.similarity_index.ready:
+            self.similar_label.setText("유사 아이템 색인 생성 중...")
+            self.similar_label.show()
+            return
+        exclude = self.store.id_at(self.selected_index) if self.selected_index is not None else None
+        lines = self.similar_items(data, exclude=exclude)
+        self.similar_label.setText("비슷한 아이템: " + ", ".join(lines))
+        self.similar_label.setVisible(bool(lines))
+
+    @PROFILER.timed("list.search")
+    def apply_search(self):
+        """검색어와 패싯 선택으로 아이템 리스트를 거르고, 정렬·묶기 설정대로 늘어놓습니다."""
+        query = self.search_edit.text()
+        filtering = bool(query.strip() or self.facet_filters)
+        sort_field = self.sort_combo.currentData()
+        group_field = self.group_combo.currentData()
+        if not filtering and sort_field is None and group_field is None:
+            if self.item_model.is_filtered():
+                self.item_model.set_view(None)
+            self.item_list_label.setText("생성된 아이템 리스트")
+            return
+        if filtering:
+            self.ensure_search_index()
+            if not self.search_index.ready:
+                self.item_list_label.setText("생성된 아이템 리스트 (검색 색인 생성 중...)")
+                return
+            ids = self.search_index.search(query)
+            for field, value in self.facet_filters.items():
+                found = self.search_index.field_ids(field, value)
+                ids = found if ids is None else ids & found
+            ids = sorted(ids, key=self.store.row_of)
+            self.item_list_label.setText(f"생성된 아이템 리스트 (검색 결과 {len(ids)}개)")
+        else:
+            ids = [self.store.id_at(row) for row in range(len(self.store))]
+            self.item_list_label.setText("생성된 아이템 리스트")
+        arrangement = (sort_field, self.sort_order_btn.isChecked(), group_field)
+        self.item_model.set_view(arrange_ids(self.store, ids, *arrangement),
+                                 None if filtering else arrangement)
+
+    def on_sort_order_toggled(self, descending):
+        self.sort_order_btn.setText("내림차순" if descending else "오름차순")
+        self.apply_search()
+
+    def update_arrange_fields(self):
+        """정렬·묶기 선택 목록을 현재 스키마의 필드로 채웁니다. 선택은 가능하면 유지합니다."""
+        fields = list(dict.fromkeys(["이름", "타입"] + self.bulk_field_names()))
+        for combo, none_label in ((self.sort_combo, "등록순"), (self.group_combo, "묶지 않음")):
+            current = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(none_label, None)
+            for field in fields:
+                combo.addItem(field, field)
+            combo.setCurrentIndex(max(combo.findData(current), 0) if current is not None else 0)
+            combo.blockSignals(False)
+
+    def facet_fields(self):
+        """패싯 사이드바에 보여줄 필드: '타입'과 옵션 목록이 있는 폼 필드 (검색 색인에서 값으로 바로 찾을 수 있는 필드)"""
+        exact = self.schema.exact_fields()
+        return ["타입"] + [field for field in self.bulk_field_names() if field in exact]
+
+    def start_facets(self):
+        """현재 스키마의 패싯 필드로 값별 개수를 세고 사이드바를 그립니다. 이후에는 편집된 아이템만 반영합니다."""
+        if self.facets is not None:
+            self.store.remove_listener(self.facets)
+        self.facets = FacetCounter(self.store, self.facet_fields(), on_change=self.facet_timer.start)
+        self.facets.build()
+        self.facet_filters = {field: value for field, value in self.facet_filters.items() if field in self.facets.fields}
+        self.refresh_facets()
+
+    def refresh_facets(self):
+        """패싯 사이드바를 현재 개수로 다시 그립니다. 접어 둔 필드와 스크롤 위치는 유지합니다."""
+        if self.facets is None:
+            return
+        with PROFILER.span("facets.refresh"):
+            tree = self.facet_tree
+            collapsed = {tree.topLevelItem(i).data(0, Qt.UserRole) for i in range(tree.topLevelItemCount())
+                         if not tree.topLevelItem(i).isExpanded()}
+            scroll = tree.verticalScrollBar().value()
+            bold = QFont()
+            bold.setBold(True)
+            tree.setUpdatesEnabled(False)
+            tree.clear()
+            for field in self.facets.fields:
+                values = self.facets.values(field)
+                selected = self.facet_filters.get(field)
+                if selected is not None and selected not in self.facets.counts[field]:
+                    values.append((selected, 0)) # 선택한 값의 아이템이 모두 사라져도 해제할 수 있게 남겨 둠
+                top = QTreeWidgetItem([f"{field} ({len(values)})"])
+                top.setData(0, Qt.UserRole, field)
+                for value, count in values:
+                    child = QTreeWidgetItem([f"{value} ({count})"])
+                    child.setData(0, Qt.UserRole, (field, value))
+                    if value == selected:
+                        child.setText(0, f"✔ {value} ({count})")
+                        child.setFont(0, bold)
+                    top.addChild(child)
+                tree.addTopLevelItem(top)
+                top.setExpanded(field not in collapsed)
+            tree.setUpdatesEnabled(True)
+            tree.verticalScrollBar().setValue(scroll)
+
+    def on_facet_clicked(self, tree_item, column):
+        data = tree_item.data(0, Qt.UserRole)
+        if not isinstance(data, tuple): # 필드 제목 행
+            return
+        field, value = data
+        if self.facet_filters.get(field) == value:
+            del self.facet_filters[field]
+        else:
+            self.facet_filters[field] = value
+        self.refresh_facets()
+        self.apply_search()
+
+    def on_item_selected(self, index: QModelIndex):
+        idx = self.item_model.source_row(index.row())
+        if idx is None: # 묶음 제목 행
+            return
+        # Ctrl/Shift로 여러 개를 고르는 중이면 폼을 채우지 않음 (다른 타입이면 탭이 바뀌어 폼만 어긋남)
+        if self.selected_rows() != [idx]:
+            return
+        self.fill_form(self.store[idx])
+        self.selected_index = idx
 
-        self.detail_text.setHtml("<br>".join(lines))
+        # 선택할 때마다 HTML을 다시 만들지 않도록 아이템별로 캐시된 결과를 사용
+        with PROFILER.span("detail.render"):
+            self.detail_text.setHtml(self.render_cache.html(self.store.id_at(idx)))
 
     def delete_selected_item(self):
+        rows = self.selected_rows()
+        if len(rows) > 1:
+            reply = QMessageBox.question(self, "확인", f"선택한 아이템 {len(rows)}개를 정말로 삭제하시겠습니까?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.store.remove_rows(rows)
+                self.schedule_save(f"아이템 {len(rows)}개 삭제 완료")
+                self.clear_form_fields()
+            return
         if self.selected_index is None:
             QMessageBox.information(self, "정보", "삭제할 아이템을 선택하세요.")
             return
-        item_name = self.items[self.selected_index].get("이름", "(이름 없음)")
+        item_name = self.store[self.selected_index].get("이름", "(이름 없음)")
         reply = QMessageBox.question(self, "확인", f"정말로 '{item_name}' 아이템을 삭제하시겠습니까?", QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            del self.items[self.selected_index]
-            self.save_items()
+            self.store.remove(self.selected_index)
+            self.schedule_save("아이템 삭제 완료")
             self.selected_index = None
-            self.refresh_item_list()
             self.clear_form_fields()
-            self.status_message("아이템 삭제 완료")
+
+    def undo(self):
+        """마지막 편집을 되돌립니다. (Ctrl+Z)"""
+        self._step_history(self.history.undo, "되돌리기", "되돌릴 작업이 없습니다.")
+
+    def redo(self):
+        """되돌린 편집을 다시 실행합니다. (Ctrl+Y, Ctrl+Shift+Z)"""
+        self._step_history(self.history.redo, "다시 실행", "다시 실행할 작업이 없습니다.")
+
+    def _step_history(self, step, action, empty_msg):
+        if not self.history.recording: # 불러오는 중
+            return
+        try:
+            description = step()
+        except ValueError as e:
+            QMessageBox.warning(self, f"{action} 오류", str(e))
+            return
+        if description is None:
+            self.status_message(empty_msg)
+            return
+        self.clear_form_fields()
+        self.schedule_save(f"{action}: {description}")
+
+    def selected_rows(self):
+        """리스트에서 선택된 아이템들의 store 행 번호 (store 순서)"""
+        rows = (self.item_model.source_row(index.row()) for index in self.item_list.selectionModel().selectedRows())
+        return sorted(row for row in rows if row is not None) # 묶음 제목 행 제외
+
+    def select_rows(self, rows):
+        """store 행 번호 목록을 리스트에서 다시 선택합니다. 연속된 행은 한 범위로 묶어 선택합니다."""
+        view_rows = sorted(r for r in (self.item_model.view_row(row) for row in rows) if r is not None)
+        selection = QItemSelection()
+        start = prev = None
+        for view_row in view_rows + [None]:
+            if start is not None and view_row != prev + 1:
+                selection.select(self.item_model.index(start), self.item_model.index(prev))
+                start = None
+            if start is None:
+                start = view_row
+            prev = view_row
+        self.item_list.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+
+    def on_selection_changed(self, *args):
+        """선택이 비거나 여러 개가 되면 폼의 수정 대상을 해제하고, 일괄 편집 막대를 갱신합니다."""
+        selection = self.item_list.selectionModel().selection()
+        count = sum(selection_range.height() for selection_range in selection)
+        if self.selected_index is not None and (
+                count != 1 or self.item_model.source_row(selection[0].top()) != self.selected_index):
+            self.selected_index = None
+            self.detail_text.clear()
+        self.update_bulk_bar(count)
+
+    def update_bulk_bar(self, count):
+        self.bulk_label.setText(f"{count}개 선택")
+        self.bulk_bar.setVisible(count > 1)
+
+    def bulk_field_names(self):
+        """일괄 변경할 수 있는 필드 이름 (모든 타입의 폼 필드, '이름' 제외)"""
+        return list(dict.fromkeys(
+            key for item_type in self.schema.types for key in self.schema.field_order(item_type) if key != "이름"))
+
+    def update_bulk_value_options(self, field):
+        """일괄 변경할 필드에 옵션이 정의되어 있으면 값 목록으로 보여줍니다."""
+        options = next((spec.options for spec in (self.schema.field(t, field) for t in self.schema.types)
+                        if spec is not None and spec.options), ())
+        self.bulk_value_combo.clear()
+        self.bulk_value_combo.addItems(options)
+
+    def bulk_set_field(self):
+        """선택한 아이템들의 한 필드를 같은 값으로 바꿉니다. 한 번의 모델 갱신과 한 번의 저장으로 처리합니다."""
+        rows = self.selected_rows()
+        field = self.bulk_field_combo.currentText().strip()
+        value = self.bulk_value_combo.currentText().strip()
+        if not rows or not field:
+            return
+        if field in ("이름", "타입"):
+            QMessageBox.warning(self, "경고", "이름은 일괄 변경할 수 없고, 타입은 '타입 변경'으로 바꿔주세요.")
+            return
+        updates = []
+        for row in rows:
+            item = self.store[row]
+            if value and item.get(field) != value:
+                updates.append((row, {**item, field: value}))
+            elif not value and field in item:
+                updates.append((row, {k: v for k, v in item.items() if k != field}))
+        if not updates:
+            return
+        self.store.replace_rows(updates)
+        self.clear_form_fields() # 폼에 남은 이전 값으로 덮어쓰지 않도록 비우고 선택만 다시 표시
+        self.select_rows(rows)
+        self.schedule_save(f"아이템 {len(updates)}개의 '{field}' 변경 완료")
+
+    def bulk_retype(self):
+        """선택한 아이템들의 타입을 바꿉니다. 바꾼 뒤 (이름, 타입)이 다른 아이템과 겹치면 아무것도 바꾸지 않습니다."""
+        rows = self.selected_rows()
+        new_type = self.bulk_type_combo.currentText()
+        if not rows or not new_type:
+            return
+        selected, final_keys, conflicts = set(rows), set(), []
+        for row in rows:
+            key = (self.store[row].get("이름"), new_type)
+            existing = self.store.find(*key)
+            if key in final_keys or (existing is not None and existing not in selected):
+                conflicts.append(f"{key[0]} ({new_type})")
+            final_keys.add(key)
+        if conflicts:
+            more = f"\n... 외 {len(conflicts) - 10}개" if len(conflicts) > 10 else ""
+            QMessageBox.warning(self, "타입 변경 불가", "바꾸면 이미 있는 아이템과 (이름, 타입)이 겹칩니다:\n"
+                                + "\n".join(conflicts[:10]) + more)
+            return
+        updates = [(row, {**self.store[row], "타입": new_type}) for row in rows if self.store[row].get("타입") != new_type]
+        if not updates:
+            return
+        reply = QMessageBox.question(self, "확인", f"아이템 {len(updates)}개의 타입을 '{new_type}'(으)로 바꾸시겠습니까?\n"
+                                     "새 타입에 없는 필드는 그대로 남습니다.", QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self.store.replace_rows(updates)
+        self.clear_form_fields() # 폼에 남은 이전 값으로 덮어쓰지 않도록 비우고 선택만 다시 표시
+        self.select_rows(rows)
+        self.schedule_save(f"아이템 {len(updates)}개 타입 변경 완료")
 
     def copy_to_clipboard(self, text):
         QApplication.clipboard().setText(text)
 
+    @PROFILER.timed("copy.json")
     def copy_selected_item_json(self):
         if self.selected_index is None: return
-        item = self.items[self.selected_index]
-        self.copy_to_clipboard(json.dumps(item, ensure_ascii=False, indent=2))
+        self.copy_to_clipboard(self.render_cache.json(self.store.id_at(self.selected_index)))
         self.status_message("선택 아이템 JSON 복사 완료")
 
+    @PROFILER.timed("copy.text")
     def copy_selected_item_text(self):
         if self.selected_index is None: return
-        item = self.items[self.selected_index]
-        lines = [f"{k}: {', '.join(v) if isinstance(v, list) else v}" for k, v in item.items() if k != "타입"]
-        # '설명' 필드가 있다면 마지막에 추가하여 복사본에도 순서 반영
-        if "설명" in item:
-            description_text = item["설명"].replace("\n", "\\n") # 줄바꿈 문자를 이스케이프
-            lines.remove(f"설명: {description_text}") # 원래 위치에서 제거
-            lines.append(f"설명: {description_text}") # 마지막에 다시 추가
-        self.copy_to_clipboard("\n".join(lines))
+        # '설명'은 줄바꿈을 이스케이프하여 마지막 줄에 둠
+        self.copy_to_clipboard(self.render_cache.text(self.store.id_at(self.selected_index)))
         self.status_message("선택 아이템 일반 텍스트 복사 완료")
 
 
+    @PROFILER.timed("copy.latest")
     def copy_latest_item(self):
-        if not self.items: return
-        self.copy_to_clipboard(json.dumps(self.items[-1], ensure_ascii=False, indent=2))
+        if not len(self.store): return
+        self.copy_to_clipboard(self.render_cache.json(self.store.id_at(len(self.store) - 1)))
         self.status_message("최근 생성 아이템 JSON 복사 완료")
 
+    def export_items(self):
+        """보이는 목록(검색 중이면 검색 결과)을 파일로 내보냅니다. 작업 스레드에서 쓰며 진행 창에서 취소할 수 있습니다."""
+        if self.exporter is not None and self.exporter.isRunning():
+            return
+        items = self.item_model.visible_items()
+        if not items:
+            QMessageBox.information(self, "정보", "내보낼 아이템이 없습니다.")
+            return
+        path, selected = QFileDialog.getSaveFileName(self, "목록 내보내기", "items.jsonl", ";;".join(EXPORT_FORMATS.values()))
+        if not path:
+            return
+        fmt = next((fmt for fmt, label in EXPORT_FORMATS.items() if label == selected), None)
+        ext = os.path.splitext(path)[1].lower().lstrip(".")
+        if ext in EXPORT_FORMATS: # 파일 이름에 적은 확장자를 우선
+            fmt = ext
+        elif fmt is None:
+            fmt = "jsonl"
+        if not ext:
+            path += f".{fmt}"
+        progress = QProgressDialog(f"아이템 {len(items)}개를 내보내는 중...", "취소", 0, len(items), self)
+        progress.setWindowTitle("목록 내보내기")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        self.exporter = ItemExporter(items, path, fmt, self.schema, parent=self)
+        self.exporter.progress.connect(lambda done, total: progress.setValue(done))
+        self.exporter.done.connect(lambda count: self.status_message(f"아이템 {count}개를 '{os.path.basename(path)}'(으)로 내보냈습니다."))
+        self.exporter.failed.connect(lambda error: QMessageBox.warning(self, "내보내기 오류", f"'{path}' 파일 저장 중 오류 발생: {error}"))
+        self.exporter.finished.connect(progress.reset)
+        self.exporter.finished.connect(progress.deleteLater)
+        progress.canceled.connect(self.exporter.requestInterruption)
+        self.exporter.start()
+
+    def show_merge_dialog(self):
+        """현재 목록을 다른 아이템 파일과 비교하거나, 공통 조상 파일이 있으면 3-way 병합해 적용하는 대화상자"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("버전 비교 / 병합")
+        dialog.setMinimumSize(700, 500)
+        layout = QVBoxLayout(dialog)
+
+        def file_row(label_text, placeholder):
+            row = QHBoxLayout()
+            edit = QLineEdit(dialog)
+            edit.setPlaceholderText(placeholder)
+            browse_btn = QPushButton("찾아보기", dialog)
+            browse_btn.clicked.connect(lambda: edit.setText(
+                QFileDialog.getOpenFileName(dialog, label_text, edit.text(), "JSON (*.json)")[0] or edit.text()))
+            row.addWidget(QLabel(label_text, dialog))
+            row.addWidget(edit, 1)
+            row.addWidget(browse_btn)
+            layout.addLayout(row)
+            return edit
+
+        theirs_edit = file_row("다른 버전:", "비교하거나 병합할 아이템 파일")
+        base_edit = file_row("공통 조상:", "(선택) 지정하면 3-way 병합, 비우면 단순 비교")
+        result_text = QTextEdit(dialog)
+        result_text.setReadOnly(True)
+        result_text.setFont(QFont("Courier New", 10))
+        layout.addWidget(result_text, 1)
+        btn_row = QHBoxLayout()
+        compare_btn = QPushButton("비교", dialog)
+        apply_btn = QPushButton("병합 적용", dialog)
+        apply_btn.setEnabled(False)
+        close_btn = QPushButton("닫기", dialog)
+        close_btn.clicked.connect(dialog.reject)
+        btn_row.addStretch(1)
+        btn_row.addWidget(compare_btn)
+        btn_row.addWidget(apply_btn)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+        loaded = {}
+
+        def compare():
+            loaded.clear()
+            apply_btn.setEnabled(False)
+            try:
+                theirs = load_catalog_file(theirs_edit.text().strip())
+                base = load_catalog_file(base_edit.text().strip()) if base_edit.text().strip() else None
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(dialog, "파일 오류", f"아이템 파일을 읽지 못했습니다: {e}")
+                return
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                with PROFILER.span("merge.compare"):
+                    ours = self.store.to_list()
+                    if base is None:
+                        added, removed, changed = keyed_diff(ours, theirs)
+                        lines = [f"현재 목록 → 다른 버전: 추가 {len(added)}, 삭제 {len(removed)}, 수정 {len(changed)}", ""]
+                        lines += diff_lines(added, removed, changed, MERGE_PREVIEW_ITEMS)
+                    else:
+                        merged, conflicts, stats = merge_catalogs(base, ours, theirs)
+                        lines = [merge_summary(merged, stats)]
+                        if conflicts:
+                            lines += conflict_resolution_lines(conflicts) + [""]
+                            lines += conflict_lines(conflicts, MERGE_PREVIEW_ITEMS)
+                        loaded.update(base=base, theirs=theirs)
+            finally:
+                QApplication.restoreOverrideCursor()
+            result_text.setPlainText("\n".join(lines))
+            apply_btn.setEnabled(bool(loaded))
+
+        def apply_merge():
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                # 대화상자를 연 뒤 목록이 바뀌었을 수 있으므로 적용 시점의 목록으로 다시 병합
+                with PROFILER.span("merge.apply"):
+                    merged, conflicts, _ = merge_catalogs(loaded["base"], self.store.to_list(), loaded["theirs"])
+                    added, removed, changed = keyed_diff(self.store, merged)
+            finally:
+                QApplication.restoreOverrideCursor()
+            if conflicts and QMessageBox.question(
+                    dialog, "확인", "\n".join(conflict_resolution_lines(conflicts)) + "\n병합을 적용하시겠습니까?",
+                    QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+                return
+            self.store.apply_diff(added, removed, changed)
+            self.schedule_save(f"병합 적용: 추가 {len(added)}, 삭제 {len(removed)}, 수정 {len(changed)}")
+            dialog.accept()
+
+        compare_btn.clicked.connect(compare)
+        apply_btn.clicked.connect(apply_merge)
+        dialog.exec_()
+
+    def on_external_change(self, path):
+        if path == os.path.abspath(CONFIG_FILE):
+            self.reload_config()
+        else:
+            self.reload_items()
+
+    def reload_items(self):
+        """밖에서 바뀐 아이템 파일을 작업 스레드에서 읽습니다. 읽는 동안에는 예약된 저장이 파일을 덮어쓰지 않도록 멈춥니다."""
+        if not self.history.recording or (self.items_reader is not None and self.items_reader.isRunning()):
+            self._items_reload_pending = True # 불러오기나 이전 읽기가 끝난 뒤 다시 읽음
+            return
+        self._items_reload_pending = False
+        self.save_scheduler.hold()
+        self.items_reader = _StorageReader(self.storage, codec=self.codec, parent=self)
+        self.items_reader.done.connect(self.apply_external_items)
+        self.items_reader.failed.connect(self.on_external_read_failed)
+        self.items_reader.finished.connect(self.on_items_reader_finished)
+        self.items_reader.start()
+
+    def on_external_read_failed(self, error):
+        self.save_scheduler.release()
+        self.status_message(f"밖에서 바뀐 '{self.storage.path}' 파일을 읽지 못했습니다: {error}", 5000)
+
+    def on_items_reader_finished(self):
+        if self._items_reload_pending:
+            self.reload_items()
+
+    def apply_external_items(self, external):
+        """밖에서 바뀐 아이템만 store에 적용합니다.
+
+        저장하지 않은 내 편집이 바뀐 것으로 보이지 않도록, 현재 목록이 아니라 마지막으로 기록한 상태와 파일을 비교합니다.
+        같은 (이름, 타입)의 아이템을 나도 편집했고 밖에서도 다르게 바꿨을 때만 어느 쪽을 남길지 묻습니다.
+        내 편집을 남기면 다시 저장해 파일에 반영합니다.
+        """
+        try:
+            with PROFILER.span("reload.items"):
+                local = self.store.drain_changes()
+                ext_added, ext_removed, ext_changed = keyed_diff(self.save_scheduler.stored.values(), external)
+                touched = ({item_key(item) for _, item in ext_added} | set(ext_removed)
+                           | {key for key, _, _ in ext_changed})
+                external_rows = {}
+                for row, item in enumerate(external):
+                    external_rows.setdefault(item_key(item), row)
+
+                def external_item(key):
+                    row = external_rows.get(key)
+                    return None if row is None else external[row]
+
+                conflicts = {key for key in change_keys(local) & touched
+                             if self.store.lookup(*key) != external_item(key)}
+                if conflicts and not self.confirm_external_conflicts(conflicts):
+                    touched -= conflicts
+                elif conflicts:
+                    local = [change for change in local if not change_keys([change]) & conflicts]
+                added, removed, changed = [], [], []
+                for key in touched:
+                    item, current = external_item(key), self.store.lookup(*key)
+                    if item is None:
+                        if current is not None:
+                            removed.append(key)
+                    elif current is None:
+                        added.append((external_rows[key], item))
+                    elif current != item:
+                        changed.append((key, current, item))
+                self.save_scheduler.remember_stored(external)
+                if added or removed or changed:
+                    self.store.apply_diff(added, removed, changed)
+                    self.store.drain_changes() # 파일에 이미 있는 내용이므로 다시 기록하지 않음
+                    self.history.clear() # 행 번호가 달라져 이전 기록은 되돌릴 수 없음
+                    self.clear_form_fields()
+                self.store.requeue_changes(local)
+        finally:
+            self.save_scheduler.release()
+        msg = f"외부 변경 적용: 추가 {len(added)}, 수정 {len(changed)}, 삭제 {len(removed)}"
+        if local: # 밖에서 바뀐 파일에는 아직 없는 내 편집을 다시 기록
+            self.schedule_save(msg)
+        elif added or removed or changed:
+            self.status_message(msg)
+
+    def confirm_external_conflicts(self, conflicts):
+        """외부 변경을 적용할지 묻습니다. True이면 겹치는 내 편집을 버리고 외부 변경을 적용합니다."""
+        names = sorted(f"{name} ({item_type})" for name, item_type in conflicts)
+        more = f" 외 {len(names) - 5}개" if len(names) > 5 else ""
+        reply = QMessageBox.question(
+            self, "외부 변경 충돌",
+            f"저장되지 않은 편집이 있는 아이템이 파일 밖에서도 바뀌었습니다.\n{', '.join(names[:5])}{more}\n\n"
+            "예: 밖에서 바뀐 내용을 적용하고 겹치는 편집을 버립니다.\n"
+            "아니요: 내 편집을 유지하고 파일에 다시 저장합니다.",
+            QMessageBox.Yes | QMessageBox.No)
+        return reply == QMessageBox.Yes
+
+    @PROFILER.timed("reload.config")
+    def reload_config(self):
+        """밖에서 바뀐 config.json을 다시 읽고, 섹션이 바뀐 타입의 폼 페이지만 다시 만듭니다."""
+        try:
+            with open(CONFIG_FILE, encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # 잘못된 파일을 저장한 경우: 이전 설정을 유지하고 다음 저장을 기다림
+            self.status_message(f"'{CONFIG_FILE}' 파일을 다시 읽지 못했습니다: {e}", 5000)
+            return
+        if isinstance(config, dict) and config != self.config:
+            self.apply_config(config)
+
+    @PROFILER.timed("config.apply")
+    def apply_config(self, config, old_config=None):
+        """새 config를 적용합니다. 섹션이 바뀐 타입의 폼 페이지만 다시 만들고, 타입 목록이 바뀐 경우에만 탭을 다시 만듭니다."""
+        old_config = self.config if old_config is None else old_config
+        names = set(old_config) | set(config)
+        if old_config.get("공통") != config.get("공통"):
+            changed_types = names - {"공통"}
+        else:
+            changed_types = {name for name in names if old_config.get(name) != config.get(name)}
+        self.config = config
+        self.schema = ConfigSchema(config)
+        self.render_cache.set_schema(self.schema)
+        self.codec.set_schema(self.schema)
+        if self.search_index is not None and self.search_index.exact_fields != self.schema.exact_fields() | {"타입"}:
+            self.store.remove_listener(self.search_index)
+            self.search_index = None
+            self.ensure_search_index()
+        if self.validator is not None and self.validator.rules != self.schema.validation_rules():
+            self.start_validation()
+        if self.facets is not None and self.facets.fields != tuple(self.facet_fields()):
+            self.start_facets()
+            self.apply_search()
+        if [name for name in old_config if name != "공통"] != [name for name in config if name != "공통"]:
+            if self.rebuild_tabs():
+                self.on_tab_changed(self.tabs.currentIndex())
+        field = self.bulk_field_combo.currentText()
+        self.bulk_field_combo.clear()
+        self.bulk_field_combo.addItems(self.bulk_field_names())
+        self.bulk_field_combo.setCurrentText(field)
+        self.bulk_type_combo.clear()
+        self.bulk_type_combo.addItems(self.schema.types)
+        self.update_arrange_fields()
+        self.invalidate_form_pages(changed_types)
+        self.status_message(f"설정 변경 적용: 타입 {len(changed_types)}개의 폼 갱신")
+
+    def update_profile_overlay(self):
+        """최근 기록 기준으로 느린 구간 몇 개의 p50/p95를 표시합니다."""
+        if self.profile_label.isHidden():
+            return
+        summary = PROFILER.summary()
+        slowest = sorted(summary.items(), key=lambda entry: entry[1]["p95"], reverse=True)[:4]
+        self.profile_label.setText("  ".join(f"{name} {stats['p50']:.1f}/{stats['p95']:.1f}ms" for name, stats in slowest))
+        self.profile_label.setToolTip("\n".join(f"{name}: {stats['count']}회, p50 {stats['p50']:.2f} / p95 {stats['p95']:.2f} / "
+                                                f"p99 {stats['p99']:.2f} ms" for name, stats in sorted(summary.items())))
+
+    def toggle_profile_overlay(self):
+        self.profile_label.setVisible(self.profile_label.isHidden())
+        self.update_profile_overlay()
+
     def status_message(self, msg, timeout=3000):
         self.status_label.setText(msg)
         QTimer.singleShot(timeout, self.status_label.clear)
 
+# --- 명령줄 (GUI 없이 실행) ---
+
+def validate_item(item, schema):
+    """아이템을 스키마의 필드 정의와 비교하여 [(수준, 필드, 메시지), ...]를 반환합니다.
+
+    수준은 "error" (저장할 수 없음) 또는 "warning" (옵션 목록에 없는 값. GUI의 직접 입력처럼 허용됨)입니다.
+    """
+    return check_item(item, schema.validation_rules())
+
+def iter_import_rows(path, default_type=None):
+    """CSV 또는 JSONL 파일에서 (줄 번호, 아이템)을 하나씩 읽습니다. 빈 칸은 GUI처럼 필드를 생략합니다."""
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                item = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+                if default_type and "타입" not in item:
+                    item["타입"] = default_type
+                yield line_no, item
+    else:
+        with open(path, encoding="utf-8-sig") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+                    continue
+                if isinstance(item, dict) and default_type and "타입" not in item:
+                    item["타입"] = default_type
+                yield line_no, item
+
+def load_config_headless(path):
+    """GUI 없이 config.json을 읽습니다. 실패하면 오류를 출력하고 None을 반환합니다."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"'{path}' 파일을 찾을 수 없습니다.", file=sys.stderr)
+    except json.JSONDecodeError as e:
+        print(f"'{path}' 파일의 형식이 잘못되었습니다: {e}", file=sys.stderr)
+    return None
+
+def cmd_import(args):
+    """CSV/JSONL 파일의 아이템을 검증하고 (이름, 타입) 기준으로 업서트한 뒤 한 번에 저장합니다."""
+    config = load_config_headless(args.config)
+    if config is None:
+        return 2
+    schema = ConfigSchema(config)
+    storage = create_storage(args.storage, args.items)
+    started = time.perf_counter()
+    try:
+        store = ItemStore(storage.load(), codec=ItemCodec(schema))
+    except STORAGE_ERRORS as e:
+        print(f"'{storage.path}' 파일이 손상되었습니다: {e}", file=sys.stderr)
+        return 2
+    storage.replay(store)
+    store.drain_changes()
+    load_seconds = time.perf_counter() - started
+
+    report = {"rows": 0, "inserted": 0, "updated": 0, "rejected": 0, "warnings": 0, "rejections": []}
+    started = time.perf_counter()
+    for path in args.files:
+        for line_no, item in iter_import_rows(path, args.type):
+            report["rows"] += 1
+            if isinstance(item, Exception) or not isinstance(item, dict):
+                errors = [("error", None, f"JSON 형식 오류: {item}")]
+            else:
+                problems = validate_item(item, schema)
+                errors = [p for p in problems if p[0] == "error"]
+                report["warnings"] += len(problems) - len(errors)
+            if errors:
+                report["rejected"] += 1
+                report["rejections"].append({"file": path, "line": line_no,
+                                             "errors": [{"field": f, "message": m} for _, f, m in errors]})
+                continue
+            _, inserted = store.upsert(item)
+            report["inserted" if inserted else "updated"] += 1
+    import_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if not args.dry_run:
+        storage.save(store)
+    save_seconds = time.perf_counter() - started
+
+    total_seconds = load_seconds + import_seconds + save_seconds
+    report.update({
+        "catalog_size": len(store),
+        "dry_run": args.dry_run,
+        "seconds": {"load": round(load_seconds, 3), "import": round(import_seconds, 3),
+                    "save": round(save_seconds, 3), "total": round(total_seconds, 3)},
+        "rows_per_second": round(report["rows"] / total_seconds) if total_seconds else None,
+    })
+
+    print(f"처리 {report['rows']}행: 추가 {report['inserted']}, 수정 {report['updated']}, "
+          f"거부 {report['rejected']}, 경고 {report['warnings']}")
+    print(f"소요 시간 {total_seconds:.2f}초 (읽기 {load_seconds:.2f} / 적용 {import_seconds:.2f} / 저장 {save_seconds:.2f}), "
+          f"초당 {report['rows_per_second']}행, 전체 {len(store)}개")
+    for rejection in report["rejections"][:args.show_rejections]:
+        reasons = "; ".join(f"{e['field']}: {e['message']}" if e["field"] else e["message"] for e in rejection["errors"])
+        print(f"  거부 {rejection['file']}:{rejection['line']} - {reasons}")
+    if len(report["rejections"]) > args.show_rejections:
+        print(f"  ... 외 {len(report['rejections']) - args.show_rejections}행")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.dry_run:
+        print("--dry-run: 파일은 저장하지 않았습니다.")
+    return 1 if report["rejected"] and args.strict else 0
+
+def read_storage(storage, codec=None):
+    """저장소의 내용을 추가 기록까지 적용하여 ItemStore로 읽습니다."""
+    store = ItemStore(storage.load(), codec=codec)
+    storage.replay(store)
+    store.drain_changes()
+    return store
+
+def cmd_migrate(args):
+    """현재 저장소의 아이템을 다른 저장 방식으로 옮기고, 다시 읽어 내용이 같은지 확인합니다."""
+    source = create_storage(args.storage, args.items)
+    target = create_storage(args.target, args.output or default_storage_path(args.target, args.items))
+    if os.path.abspath(source.path) == os.path.abspath(target.path):
+        print("원본과 대상이 같은 저장소입니다.", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    try:
+        items = read_storage(source).to_list()
+    except STORAGE_ERRORS as e:
+        print(f"'{source.path}' 파일이 손상되었습니다: {e}", file=sys.stderr)
+        return 2
+    if isinstance(target, SqliteItemStorage):
+        # (이름, 타입)이 겹치는 아이템은 데이터베이스의 고유 색인에 함께 들어갈 수 없으므로 옮기기 전에 거부
+        seen, duplicates = set(), []
+        for item in items:
+            key = item_key(item)
+            if key in seen:
+                duplicates.append(key)
+            seen.add(key)
+        if duplicates:
+            print(f"(이름, 타입)이 중복된 아이템 {len(duplicates)}개가 있어 옮길 수 없습니다:", file=sys.stderr)
+            for name, item_type in duplicates[:20]:
+                print(f"  {name} ({item_type})", file=sys.stderr)
+            return 1
+    target.replace_all(items)
+    if isinstance(target, ShardedItemStorage):
+        items = target.ordered(items) # 샤드는 타입별로 묶어서 저장됨
+    if read_storage(target).to_list() != items:
+        print(f"'{target.path}'에서 다시 읽은 내용이 원본과 다릅니다.", file=sys.stderr)
+        return 1
+    print(f"아이템 {len(items)}개를 '{source.path}'에서 '{target.path}'(으)로 옮겼습니다. "
+          f"({time.perf_counter() - started:.2f}초)")
+    return 0
+
+def cmd_validate(args):
+    """저장된 아이템 전체를 config.json 규칙으로 검증하고 아이템별·필드별 오류와 경고를 보고합니다."""
+    config = load_config_headless(args.config)
+    if config is None:
+        return 2
+    schema = ConfigSchema(config)
+    storage = create_storage(args.storage, args.items)
+    try:
+        items = read_storage(storage).to_list()
+    except STORAGE_ERRORS as e:
+        print(f"'{storage.path}' 파일이 손상되었습니다: {e}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    found = validate_catalog(items, schema.validation_rules(), workers=args.workers)
+    seconds = time.perf_counter() - started
+
+    report = {"catalog_size": len(items), "errors": 0, "warnings": 0, "items_with_errors": 0, "fields": {},
+              "items": [], "seconds": round(seconds, 3)}
+    for row in sorted(found):
+        problems = found[row]
+        has_error = False
+        for level, field, _ in problems:
+            counts = report["fields"].setdefault(field, {"errors": 0, "warnings": 0})
+            key = "errors" if level == "error" else "warnings"
+            counts[key] += 1
+            report[key] += 1
+            has_error = has_error or level == "error"
+        report["items_with_errors"] += has_error
+        report["items"].append({"row": row, "이름": items[row].get("이름", ""), "타입": items[row].get("타입", ""),
+                                "problems": [{"level": level, "field": field, "message": message}
+                                             for level, field, message in problems]})
+
+    print(f"아이템 {len(items)}개 검증: 오류 {report['errors']}개, 경고 {report['warnings']}개 "
+          f"(문제 있는 아이템 {len(found)}개, {seconds:.2f}초)")
+    for field, counts in sorted(report["fields"].items(), key=lambda entry: (-entry[1]["errors"], -entry[1]["warnings"])):
+        print(f"  {field}: 오류 {counts['errors']}, 경고 {counts['warnings']}")
+    for entry in report["items"][:args.show]:
+        print(f"  행 {entry['row'] + 1} {entry['이름']} [{entry['타입']}]")
+        for problem in entry["problems"]:
+            print(f"    {'오류' if problem['level'] == 'error' else '경고'} - {problem['field']}: {problem['message']}")
+    if len(report["items"]) > args.show:
+        print(f"  ... 외 {len(report['items']) - args.show}개")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["errors"] and args.strict else 0
+
+def load_catalog_file(path):
+    """아이템 목록 JSON 파일(items.json 형식)을 읽습니다. 형식이 다르면 ValueError"""
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError(f"'{path}'은(는) 아이템 목록(JSON 배열)이 아닙니다.")
+    return items
+
+def cmd_diff(args):
+    """두 아이템 파일을 (이름, 타입) 키로 비교해 추가·삭제·수정된 아이템과 필드별 차이를 보고합니다."""
+    started = time.perf_counter()
+    try:
+        old, new = load_catalog_file(args.old), load_catalog_file(args.new)
+    except (OSError, ValueError) as e:
+        print(f"파일을 읽지 못했습니다: {e}", file=sys.stderr)
+        return 2
+    load_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    added, removed, changed = keyed_diff(old, new)
+    diff_seconds = time.perf_counter() - started
+    print(f"추가 {len(added)}, 삭제 {len(removed)}, 수정 {len(changed)} "
+          f"(아이템 {len(old)} → {len(new)}개, 읽기 {load_seconds:.2f}초 / 비교 {diff_seconds:.2f}초)")
+    for line in diff_lines(added, removed, changed, args.show):
+        print(f"  {line}")
+    if args.report:
+        report = {"added": [item for _, item in added], "removed": [list(key) for key in removed],
+                  "changed": [{"이름": key[0], "타입": key[1],
+                               "fields": [field_value_entry(field=field, old=before, new=after)
+                                          for field, before, after in field_changes(before_item, after_item)]}
+                              for key, before_item, after_item in changed]}
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=json_default)
+    return 1 if (added or removed or changed) and args.strict else 0
+
+def cmd_merge(args):
+    """공통 조상(BASE)에서 갈라진 두 아이템 파일(OURS, THEIRS)을 3-way 병합합니다. 충돌이 있으면 종료 코드 1
+
+    결과는 기본으로 OURS에 저장하므로 git 병합 드라이버로도 쓸 수 있습니다. (driver = python main.py merge %O %A %B)
+    """
+    started = time.perf_counter()
+    try:
+        base, ours, theirs = (load_catalog_file(path) for path in (args.base, args.ours, args.theirs))
+    except (OSError, ValueError) as e:
+        print(f"파일을 읽지 못했습니다: {e}", file=sys.stderr)
+        return 2
+    load_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    merged, conflicts, stats = merge_catalogs(base, ours, theirs)
+    merge_seconds = time.perf_counter() - started
+    output = args.output or args.ours
+    if not args.dry_run:
+        atomic_write_json(output, merged)
+    print(f"{merge_summary(merged, stats)} (읽기 {load_seconds:.2f}초 / 병합 {merge_seconds:.2f}초)")
+    for line in conflict_lines(conflicts, args.show):
+        print(f"  {line}")
+    if args.report:
+        report = dict(stats, conflicts=[{"이름": key[0], "타입": key[1], "reason": reason,
+                                         "fields": [field_value_entry(field=field, base=base_value, ours=our_value,
+                                                                      theirs=their_value)
+                                                    for field, base_value, our_value, their_value in fields]}
+                                        for key, reason, fields in conflicts])
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=json_default)
+    if args.dry_run:
+        print("--dry-run: 파일은 저장하지 않았습니다.")
+    elif conflicts:
+        for line in conflict_resolution_lines(conflicts):
+            print(line)
+        print(f"병합 결과를 '{output}'에 저장했습니다.")
+    return 1 if conflicts else 0
+
+def cmd_dedup(args):
+    """같은 타입에서 이름이나 설명이 비슷한 아이템 묶음을 찾아 보고합니다. 파일은 바꾸지 않습니다."""
+    storage = create_storage(args.storage, args.items)
+    started = time.perf_counter()
+    try:
+        store = read_storage(storage)
+    except STORAGE_ERRORS as e:
+        print(f"'{storage.path}' 파일이 손상되었습니다: {e}", file=sys.stderr)
+        return 2
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = SimilarityIndex(store)
+    index.build()
+    pairs = index.duplicate_pairs()
+    groups = group_near_duplicates(pairs)
+    search_seconds = time.perf_counter() - started
+
+    scores = {}
+    for a, b, score, field in pairs:
+        scores.setdefault(a, []).append((b, score, field))
+    report = {"catalog_size": len(store), "pairs": len(pairs), "groups": [],
+              "seconds": {"load": round(load_seconds, 3), "search": round(search_seconds, 3)}}
+    for ids in groups:
+        members = set(ids)
+        report["groups"].append({
+            "items": [{"row": store.row_of(item_id), "이름": store.item(item_id).get("이름", ""),
+                       "타입": store.item(item_id).get("타입", "")} for item_id in ids],
+            "pairs": [{"rows": [store.row_of(a), store.row_of(b)], "field": field, "score": round(score, 3)}
+                      for a in ids for b, score, field in scores.get(a, ()) if b in members],
+        })
+
+    print(f"아이템 {len(store)}개에서 비슷한 아이템 묶음 {len(groups)}개 ({len(pairs)}쌍)를 찾았습니다. "
+          f"(읽기 {load_seconds:.2f}초 / 찾기 {search_seconds:.2f}초)")
+    for group in report["groups"][:args.show]:
+        print("  " + " / ".join(f"{item['이름']} [{item['타입']}] (행 {item['row'] + 1})" for item in group["items"]))
+    if len(groups) > args.show:
+        print(f"  ... 외 {len(groups) - args.show}묶음")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if groups and args.strict else 0
+
+def storage_files(storage):
+    """저장소가 쓰는 파일 경로 목록 (변경 감지용). 샤드 저장소는 폴더 자체의 수정 시각으로 판단합니다."""
+    paths = [storage.path]
+    if isinstance(storage, JournalItemStorage):
+        paths.append(storage.journal_path)
+    elif isinstance(storage, SqliteItemStorage):
+        paths.append(storage.path + "-wal") # WAL 모드에서는 체크포인트 전까지 본 파일이 바뀌지 않음
+    return paths
+
+def content_etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(header, etag):
+    """If-None-Match 헤더 값이 etag와 맞는지 (GET이므로 W/ 접두사는 무시하는 약한 비교)"""
+    if header.strip() == "*":
+        return True
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in (tag.strip() for tag in header.split(",")))
+
+class CatalogSnapshot:
+    """서버 모드가 응답에 쓰는 아이템 목록의 한 시점 (만든 뒤에는 바뀌지 않음)
+
+    전체 목록 JSON과 gzip 압축본, ETag는 만들 때 한 번만 계산하고, 아이템·목록 조회 응답은 조건별로 캐시합니다.
+    파일이 바뀌면 새 스냅숏을 만들어 통째로 바꾸므로, 이전 스냅숏으로 처리 중인 요청은 영향을 받지 않습니다.
+    """
+    def __init__(self, store, exact_fields):
+        self.store = store
+        self.index = SearchIndex(store, exact_fields)
+        self.index.build()
+        body = json.dumps(store.to_list(), ensure_ascii=False, default=json_default, separators=(",", ":")).encode("utf-8")
+        self.catalog = (body, content_etag(body), gzip.compress(body, 6))
+        self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._cache = OrderedDict()
+
+    def render(self, data):
+        """응답 데이터를 (본문, ETag, gzip 본문 또는 None)으로 만듭니다."""
+        body = json.dumps(data, ensure_ascii=False, default=json_default).encode("utf-8")
+        return body, content_etag(body), gzip.compress(body, 6) if len(body) >= SERVE_GZIP_MIN_BYTES else None
+
+    def cached(self, key, build):
+        """key의 (본문, ETag, gzip 본문 또는 None)을 반환합니다. 없으면 build()의 결과 데이터로 만들어 캐시합니다."""
+        response = self._cache.get(key)
+        if response is None:
+            data = build()
+            if data is None:
+                return None
+            response = self._cache[key] = self.render(data)
+            if len(self._cache) > SERVE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return response
+
+    def item(self, item_type, name):
+        found = self.store.lookup(name, item_type)
+        return None if found is None else dict(found.items())
+
+    def listing(self, params):
+        """조건에 맞는 아이템 목록. q는 검색창과 같은 문법, 나머지 매개변수는 필드 값이 정확히 같은 것만 남깁니다."""
+        params = dict(params)
+        try:
+            offset = max(int(params.pop("offset", 0)), 0)
+            limit = min(max(int(params.pop("limit", SERVE_LIST_LIMIT)), 0), SERVE_LIST_MAX)
+        except ValueError:
+            raise ValueError("offset과 limit은 정수여야 합니다.")
+        ids = self.index.search(params.pop("q", ""))
+        for field, value in params.items():
+            if field in self.index.exact_fields:
+                found = self.index.field_ids(field, value)
+            else:
+                candidates = ids if ids is not None else (self.store.id_at(row) for row in range(len(self.store)))
+                found = {item_id for item_id in candidates if facet_value(self.store.item(item_id).get(field, "")) == value}
+            ids = found if ids is None else ids & found
+        if ids is None:
+            total = len(self.store)
+            page = [self.store[row] for row in range(offset, min(offset + limit, total))]
+        else:
+            total = len(ids)
+            page = [self.store.item(item_id) for item_id in sorted(ids, key=self.store.row_of)[offset:offset + limit]]
+        return {"total": total, "offset": offset, "limit": limit, "items": [dict(item.items()) for item in page]}
+
+class CatalogServer:
+    """아이템 목록을 읽기 전용으로 제공하는 asyncio HTTP/1.1 서버 (main.py serve)
+
+        GET /                      상태 (아이템 수, 전체 목록 ETag, 불러온 시각)
+        GET /catalog               전체 목록 (미리 압축해 둔 gzip)
+        GET /items?q=&필드=값&offset=&limit=   조건에 맞는 목록
+        GET /items/<타입>/<이름>     아이템 하나
+
+    모든 응답에 ETag를 붙이고 If-None-Match가 맞으면 304로 답합니다. 연결은 keep-alive로 유지하고
+    SERVE_IDLE_SECONDS 동안 요청이 없으면 닫습니다. 편집기가 저장하면 SERVE_POLL_SECONDS마다 파일을 확인해
+    작업 스레드에서 새 스냅숏을 만든 뒤 바꿔 끼우므로, 저장 중인 파일을 읽다가 깨진 내용을 내보내지 않습니다.
+    """
+    REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               431: "Request Header Fields Too Large"}
+
+    def __init__(self, storage, schema):
+        self.storage = storage
+        self.schema = schema
+        self.exact_fields = schema.exact_fields()
+        self.snapshot = None
+        self.signature = None
+        self.connections = 0
+
+    def signature_now(self):
+        return tuple(file_signature(path) for path in storage_files(self.storage))
+
+    def load(self):
+        """저장소를 읽어 새 스냅숏을 만듭니다. (작업 스레드에서 실행)"""
+        signature = self.signature_now() # 읽는 도중에 바뀌면 다음 확인 때 다시 읽도록 읽기 전에 기록
+        snapshot = CatalogSnapshot(read_storage(self.storage, codec=ItemCodec(self.schema)), self.exact_fields)
+        return signature, snapshot
+
+    def reload(self):
+        self.signature, self.snapshot = self.load()
+
+    async def watch(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(SERVE_POLL_SECONDS)
+            if self.signature_now() == self.signature:
+                continue
+            try:
+                self.signature, self.snapshot = await loop.run_in_executor(None, self.load)
+            except STORAGE_ERRORS + (OSError,) as e: # 저장 도중이면 다음 확인 때 다시 읽음
+                print(f"'{self.storage.path}'을(를) 다시 읽지 못했습니다: {e}", file=sys.stderr)
+                continue
+            print(f"아이템 {len(self.snapshot.store)}개를 다시 불러왔습니다. (ETag {self.snapshot.catalog[1]})")
+
+    async def serve(self, host, port):
+        import asyncio
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        watcher = asyncio.ensure_future(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+    def respond(self, method, target, headers):
+        """(상태 코드, 추가 헤더 dict, 본문)을 반환합니다."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        parts = urllib.parse.urlsplit(target)
+        path = [urllib.parse.unquote(part) for part in parts.path.split("/") if part]
+        params = dict(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+        snapshot = self.snapshot
+        if not path:
+            response = snapshot.render({"items": len(snapshot.store), "etag": snapshot.catalog[1],
+                                         "loaded_at": snapshot.loaded_at, "connections": self.connections})
+        elif path == ["catalog"]:
+            response = snapshot.catalog
+        elif path[0] == "items" and len(path) == 1:
+            key = ("items",) + tuple(sorted(params.items()))
+            try:
+                response = snapshot.cached(key, lambda: snapshot.listing(params))
+            except ValueError as e:
+                return self.error(400, str(e))
+        elif path[0] == "items" and len(path) == 3:
+            response = snapshot.cached(("item", path[1], path[2]), lambda: snapshot.item(path[1], path[2]))
+            if response is None:
+                return self.error(404, f"아이템이 없습니다: {path[2]} ({path[1]})")
+        else:
+            return self.error(404, "없는 경로입니다.")
+
+        body, etag, compressed = response
+        extra = {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if compressed is not None and "gzip" in headers.get("accept-encoding", ""):
+            body, etag = compressed, etag[:-1] + '-gzip"'
+            extra["Content-Encoding"] = "gzip"
+        extra["ETag"] = etag
+        if "if-none-match" in headers and etag_matches(headers["if-none-match"], etag):
+            return 304, {key: extra[key] for key in ("ETag", "Cache-Control", "Vary")}, b""
+        return 200, extra, body
+
+    def error(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+    async def handle(self, reader, writer):
+        """연결 하나에서 요청을 차례로 처리합니다. (HTTP/1.1 keep-alive, 파이프라이닝한 요청도 순서대로 응답)"""
+        import asyncio
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), SERVE_IDLE_SECONDS)
+                    headers = {}
+                    while True:
+                        line = await asyncio.wait_for(reader.readline(), SERVE_IDLE_SECONDS)
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        if len(headers) >= 100:
+                            raise ValueError("too many headers")
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError: # 한 줄이 StreamReader 한도(64KB)를 넘거나 헤더가 너무 많음
+                    await self.write(writer, "HTTP/1.1", *self.error(431, "요청 헤더가 너무 깁니다."), head_only=False,
+                                     keep_alive=False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write(writer, "HTTP/1.1", *self.error(400, "잘못된 요청입니다."), head_only=False,
+                                     keep_alive=False)
+                    break
+                if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+                    # 읽기 전용 서버이므로 본문이 있는 요청은 받지 않음 (본문을 건너뛰지 않고 연결을 닫음)
+                    await self.write(writer, version, 405, {"Allow": "GET, HEAD"}, b"", head_only=False, keep_alive=False)
+                    break
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, extra, body = self.respond(method, target, headers)
+                await self.write(writer, version, status, extra, body, head_only=method == "HEAD", keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def write(self, writer, version, status, extra, body, head_only, keep_alive):
+        lines = [f"{'HTTP/1.1' if version == 'HTTP/1.1' else 'HTTP/1.0'} {status} {self.REASONS[status]}",
+                 "Server: esteria-items", f"Content-Length: {len(body)}",
+                 "Connection: " + ("keep-alive" if keep_alive else "close")]
+        lines += [f"{key}: {value}" for key, value in extra.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+def cmd_serve(args):
+    """아이템 목록을 localhost의 HTTP 서버로 읽기 전용 제공합니다. 편집기가 저장하면 자동으로 다시 불러옵니다."""
+    import asyncio
+    config = load_config_headless(args.config)
+    if config is None:
+        return 2
+    server = CatalogServer(create_storage(args.storage, args.items), ConfigSchema(config))
+    started = time.perf_counter()
+    try:
+        server.reload()
+    except STORAGE_ERRORS as e:
+        print(f"'{server.storage.path}' 파일이 손상되었습니다: {e}", file=sys.stderr)
+        return 2
+    print(f"아이템 {len(server.snapshot.store)}개를 불러왔습니다. ({time.perf_counter() - started:.2f}초)")
+    print(f"http://{args.host}:{args.port}/ 에서 제공합니다. (Ctrl+C로 종료)")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="에스테리아 아이템 생성기 - GUI 없이 실행하는 명령")
+    parser.add_argument("--config", default=CONFIG_FILE, help="설정 파일 경로")
+    parser.add_argument("--items", default=ITEMS_FILE, help="아이템 저장소 경로 (기본값이면 저장 방식별 기본 파일)")
+    parser.add_argument("--storage", choices=STORAGE_MODES, default=None, help="저장 방식 (기본: ESTERIA_STORAGE 또는 json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import", help="CSV/JSONL 파일의 아이템을 검증 후 업서트")
+    p.add_argument("files", nargs="+", help="가져올 .csv 또는 .jsonl 파일")
+    p.add_argument("--type", help="타입 열이 없는 행에 사용할 타입")
+    p.add_argument("--dry-run", action="store_true", help="검증과 적용만 하고 저장하지 않음")
+    p.add_argument("--report", help="결과 보고서를 JSON으로 저장할 경로")
+    p.add_argument("--strict", action="store_true", help="거부된 행이 있으면 종료 코드 1 반환")
+    p.add_argument("--show-rejections", type=int, default=20, help="화면에 출력할 거부 행 수")
+    p.set_defaults(func=cmd_import)
+
+    p = commands.add_parser("migrate", help="아이템을 다른 저장 방식으로 옮김 (예: --storage json migrate sharded)")
+    p.add_argument("target", choices=STORAGE_MODES, help="옮길 저장 방식")
+    p.add_argument("--output", help="대상 경로 (기본: --items에서 저장 방식에 맞게 정함)")
+    p.set_defaults(func=cmd_migrate)
+
+    p = commands.add_parser("validate", help="저장된 아이템 전체를 config 규칙으로 검증")
+    p.add_argument("--report", help="결과 보고서를 JSON으로 저장할 경로")
+    p.add_argument("--strict", action="store_true", help="오류가 있으면 종료 코드 1 반환")
+    p.add_argument("--show", type=int, default=20, help="화면에 출력할 아이템 수")
+    p.add_argument("--workers", type=int, default=1, help="검증에 쓸 프로세스 수 (규칙이 복잡하고 목록이 클 때만 이득)")
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser("serve", help="아이템 목록을 읽기 전용 HTTP 서버로 제공 (ETag, gzip)")
+    p.add_argument("--host", default=SERVE_HOST, help="받을 주소 (기본: localhost만)")
+    p.add_argument("--port", type=int, default=SERVE_PORT, help="포트")
+    p.set_defaults(func=cmd_serve)
+
+    p = commands.add_parser("diff", help="두 아이템 파일을 (이름, 타입) 키로 비교")
+    p.add_argument("old", help="이전 아이템 파일")
+    p.add_argument("new", help="새 아이템 파일")
+    p.add_argument("--report", help="결과 보고서를 JSON으로 저장할 경로")
+    p.add_argument("--strict", action="store_true", help="차이가 있으면 종료 코드 1 반환")
+    p.add_argument("--show", type=int, default=20, help="종류별로 화면에 출력할 아이템 수")
+    p.set_defaults(func=cmd_diff)
+
+    p = commands.add_parser("merge", help="공통 조상에서 갈라진 두 아이템 파일을 3-way 병합 (충돌 시 종료 코드 1)")
+    p.add_argument("base", help="공통 조상 아이템 파일")
+    p.add_argument("ours", help="내 아이템 파일 (기본 저장 위치)")
+    p.add_argument("theirs", help="다른 사람의 아이템 파일")
+    p.add_argument("-o", "--output", help="병합 결과를 저장할 경로 (기본: ours)")
+    p.add_argument("--dry-run", action="store_true", help="병합만 하고 저장하지 않음")
+    p.add_argument("--report", help="결과 보고서를 JSON으로 저장할 경로")
+    p.add_argument("--show", type=int, default=20, help="화면에 출력할 충돌 수")
+    p.set_defaults(func=cmd_merge)
+
+    p = commands.add_parser("dedup", help="이름이나 설명이 비슷한 아이템 묶음을 보고")
+    p.add_argument("--report", help="결과 보고서를 JSON으로 저장할 경로")
+    p.add_argument("--strict", action="store_true", help="비슷한 아이템이 있으면 종료 코드 1 반환")
+    p.add_argument("--show", type=int, default=20, help="화면에 출력할 묶음 수")
+    p.set_defaults(func=cmd_dedup)
+    return parser
+
+CLI_COMMANDS = {"import", "migrate", "validate", "diff", "merge", "dedup", "serve"}
+
+def run_cli(argv):
+    args = build_arg_parser().parse_args(argv)
+    try:
+        with PROFILER.span(f"cli.{args.command}"):
+            return args.func(args)
+    finally:
+        if PROFILER.enabled:
+            print(f"계측 기록 저장: {PROFILER.export_chrome_trace()}", file=sys.stderr)
+
+def enable_profiling(argv):
+    """ESTERIA_PROFILE 환경 변수나 --profile[=경로] 인자가 있으면 계측을 켜고, 그 인자를 뺀 argv를 반환합니다."""
+    setting = os.environ.get("ESTERIA_PROFILE", "")
+    rest = []
+    for arg in argv:
+        if arg == "--profile" or arg.startswith("--profile="):
+            setting = arg.partition("=")[2] or "1"
+        else:
+            rest.append(arg)
+    if setting and setting != "0":
+        PROFILER.enable(PROFILE_TRACE_FILE if setting == "1" else setting)
+    return rest
+
+def enable_startup_report(argv):
+    """ESTERIA_STARTUP_REPORT 환경 변수나 --startup-report 인자가 있으면 시작 시간 보고서를 켜고, 그 인자를 뺀 argv를 반환합니다."""
+    STARTUP.enabled = os.environ.get("ESTERIA_STARTUP_REPORT", "0") not in ("", "0") or "--startup-report" in argv
+    return [arg for arg in argv if arg != "--startup-report"]
+
 def main():
-    app = QApplication(sys.argv)
-    editor = ItemEditor()
+    if getattr(sys, "frozen", False):
+        # 실행 파일로 묶었을 때 샤드를 읽는 작업 프로세스가 GUI를 다시 띄우지 않도록
+        import multiprocessing
+        multiprocessing.freeze_support()
+    argv = enable_startup_report(enable_profiling(sys.argv))
+    # 첫 인자가 명령 이름이거나 옵션이면 QApplication 없이 명령줄 모드로 실행
+    if len(argv) > 1 and (argv[1] in CLI_COMMANDS or argv[1].startswith("--")):
+        sys.exit(run_cli(argv[1:]))
+    STARTUP.mark("import")
+    app = QApplication(argv)
+    STARTUP.mark("qt_app")
+    editor = ItemEditor(deferred=True)
     editor.show()
+    STARTUP.mark("show")
     sys.exit(app.exec_())
 
 if __name__ == "__main__":